@@ -5,7 +5,7 @@ from .models import CustomUser
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
-    list_display = ["username", "email", "ai_usage_count", "date_joined"]
+    list_display = ["username", "email", "follower_count", "ai_usage_count", "date_joined"]
     list_filter = ["date_joined", "is_staff"]
 
     fieldsets = UserAdmin.fieldsets + (
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import AbstractUser
 
 
@@ -7,17 +9,20 @@ class CustomUser(AbstractUser):
     bio = models.TextField(max_length=500, blank=True)
     # user마다 ai 사용횟수 / default 0번
     ai_usage_count = models.IntegerField(default=0)
+    # 팔로워/팔로잉 수 (Follow 생성/삭제와 같은 트랜잭션에서 갱신, reconcile_counters 로 보정)
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.username
 
     # 팔로워 수 반환
     def get_follower_count(self):
-        return self.followers.count()
+        return self.follower_count
 
     # 팔로잉 수 반환
     def get_following_count(self):
-        return self.following.count()
+        return self.following_count
 
     # 특정 사용자를 팔로우하고 있는지 확인
     def is_following(self, user):
@@ -30,14 +35,27 @@ class CustomUser(AbstractUser):
         if user == self or not user:
             return False, 0
 
-        follow, created = Follow.objects.get_or_create(follower=self, following=user)
-        if not created:
-            # 이미 팔로우한 경우 -> 언팔로우
-            follow.delete()
-            return False, user.get_follower_count()
-        else:
-            # 새로 팔로우
-            return True, user.get_follower_count()
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=self, following=user).delete()
+            if deleted:
+                # 이미 팔로우한 경우 -> 언팔로우
+                delta = -1
+            else:
+                # 새로 팔로우 (동시 요청으로 이미 생성된 경우 카운터는 그대로)
+                try:
+                    with transaction.atomic():
+                        Follow.objects.create(follower=self, following=user)
+                    delta = 1
+                except IntegrityError:
+                    delta = 0
+
+            if delta:
+                CustomUser.objects.filter(pk=user.pk).update(follower_count=Greatest(F('follower_count') + delta, 0))
+                CustomUser.objects.filter(pk=self.pk).update(following_count=Greatest(F('following_count') + delta, 0))
+            follower_count = CustomUser.objects.filter(pk=user.pk).values_list('follower_count', flat=True).first()
+
+        user.follower_count = follower_count
+        return not deleted, follower_count
 
 
 # 사용자 팔로우 모델
@@ -1,6 +1,7 @@
 from django import forms
 from .models import CustomUser
 from blog.models import Post
+from blog.analytics import author_report
 from django.shortcuts import redirect
 from django.shortcuts import get_object_or_404
 from django.views import View
@@ -16,6 +17,7 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
+from django.conf import settings
 import os
 
 # 새로운 사용자 생성 폼
@@ -163,6 +165,10 @@ class ProfileView(LoginRequiredMixin, DetailView):
                 'total_usage': 0,
                 'recent_posts': context['user_posts'].count()
             }
+
+        # 내 글 통계 - 일별 조회수/좋아요/순방문자 (본인 프로필일 때만)
+        if profile_user == self.request.user:
+            context['analytics'] = author_report(profile_user, days=getattr(settings, 'ANALYTICS_PROFILE_DAYS', 30))
         
         # 팔로우 관련 정보
         if self.request.user.is_authenticated:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, Comment, Tag, AIUsageLog
+from .models import Post, Comment, Tag, AIUsageLog, AIResponseCache, AIInflightLock, AIJob
 
 
 @admin.register(Post)
@@ -37,6 +37,27 @@ class TagAdmin(admin.ModelAdmin):
 
 @admin.register(AIUsageLog)
 class AIUsageLogAdmin(admin.ModelAdmin):
-    list_display = ["user", "feature_type", "tokens_used", "created_at"]
-    list_filter = ["feature_type", "created_at"]
+    list_display = ["user", "feature_type", "tokens_used", "prompt_tokens", "completion_tokens", "model", "latency_ms", "cached", "created_at"]
+    list_filter = ["feature_type", "cached", "estimated", "model", "created_at"]
     readonly_fields = ["created_at"]
+
+
+@admin.register(AIResponseCache)
+class AIResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ["key", "feature_type", "created_at", "expires_at"]
+    list_filter = ["feature_type"]
+    search_fields = ["key"]
+    readonly_fields = ["created_at"]
+
+
+@admin.register(AIInflightLock)
+class AIInflightLockAdmin(admin.ModelAdmin):
+    list_display = ["key", "owner", "created_at", "expires_at"]
+    readonly_fields = ["created_at"]
+
+
+@admin.register(AIJob)
+class AIJobAdmin(admin.ModelAdmin):
+    list_display = ["post", "job_type", "status", "attempts", "run_after", "finished_at"]
+    list_filter = ["job_type", "status"]
+    readonly_fields = ["content_hash", "locked_by", "locked_at", "created_at", "started_at", "finished_at"]
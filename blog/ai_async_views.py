@@ -0,0 +1,280 @@
+import json
+import time
+import logging
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth.views import redirect_to_login
+from django.utils.decorators import method_decorator
+from django.views import View
+from .ai_service import aget_title_suggestions, aget_content_completion, aget_tag_suggestions, aget_content_summary, aget_assist_bundle
+from .ai_views import bundle_usage_entries, validate_request
+from .ai_streaming import sse_response, acompletion_event_stream
+from .ai_usage import usage_recorder
+from .ai_ratelimit import check_rate_limit
+from .ai_tags import tag_suggester
+
+logger = logging.getLogger(__name__)
+
+
+# ASGI 환경용 비동기 AI 뷰 기본 클래스
+# (login_required 는 동기 request.user 접근을 하므로 request.auser() 로 직접 인증 확인)
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAIView(View):
+    http_method_names = ['post']
+    feature_type = ''
+    feature_name = ''
+
+    async def post(self, request):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+
+        logger.info(f"{self.feature_name} 요청 - 사용자: {user.username}")
+
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            logger.error("JSON 파싱 오류")
+            return JsonResponse({
+                'success': False,
+                'error': '요청 형식이 올바르지 않습니다.'
+            })
+
+        try:
+            # 잘못된 요청과 API 호출 없이 응답할 수 있는 요청은 요청 한도에 포함하지 않음
+            response = self.validate(data) or await self.local_response(user, data)
+            if response is not None:
+                return response
+
+            limited = await sync_to_async(check_rate_limit)(user, self.feature_type)
+            if limited:
+                return limited
+
+            return await self.handle(request, user, data)
+        except Exception as e:
+            logger.error(f"{self.feature_name} API 오류: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': f'서버 오류가 발생했습니다: {str(e)}'
+            })
+
+    async def handle(self, request, user, data):
+        raise NotImplementedError
+
+    # 입력 검증 - 오류 응답 (통과하면 None, 동기 뷰와 같은 검증)
+    def validate(self, data):
+        return validate_request(self.feature_type, data)
+
+    # OpenAI 호출 전에 로컬에서 응답할 수 있는 경우의 응답 (없으면 None)
+    async def local_response(self, user, data):
+        return None
+
+    # AI 사용량 로깅 + 사용자 AI 사용량 증가 (항상 버퍼링 - 이벤트 루프에서 DB 접근 없음)
+    def log_usage(self, user, result):
+        usage_recorder.record(user, self.feature_type, result, buffered=True)
+
+
+# 제목 추천 (비동기)
+class AsyncTitleSuggestionView(AsyncAIView):
+    feature_type = 'title_suggest'
+    feature_name = '제목 추천'
+
+    async def handle(self, request, user, data):
+        content = data.get('content', '').strip()
+        regenerate = bool(data.get('regenerate', False))
+
+        logger.info(f"OpenAI API 제목 추천 요청 시작 - 내용 길이: {len(content)}자")
+        start_time = time.time()
+
+        result = await aget_title_suggestions(content, count=4, use_cache=not regenerate)
+        titles = result.value
+
+        logger.info(f"OpenAI API 제목 추천 완료 - 소요시간: {time.time() - start_time:.2f}초")
+
+        if not titles:
+            return JsonResponse({
+                'success': False,
+                'error': '제목 추천에 실패했습니다. 다시 시도해주세요.'
+            })
+
+        self.log_usage(user, result)
+        logger.info(f"제목 추천 성공 - {len(titles)}개 생성")
+
+        return JsonResponse({
+            'success': True,
+            'titles': titles,
+            'message': f'AI가 {len(titles)}개의 제목을 추천했습니다!'
+        })
+
+
+# 내용 자동완성 (비동기)
+class AsyncContentCompletionView(AsyncAIView):
+    feature_type = 'autocomplete'
+    feature_name = '자동완성'
+
+    async def handle(self, request, user, data):
+        content = data.get('content', '').strip()
+        style = data.get('style', 'friendly')
+        regenerate = bool(data.get('regenerate', False))
+
+        logger.info(f"OpenAI API 자동완성 요청 시작 - 내용 길이: {len(content)}자, 스타일: {style}")
+        start_time = time.time()
+
+        result = await aget_content_completion(content, style, use_cache=not regenerate)
+        completion = result.value
+
+        logger.info(f"OpenAI API 자동완성 완료 - 소요시간: {time.time() - start_time:.2f}초")
+
+        if not completion:
+            return JsonResponse({
+                'success': False,
+                'error': '자동완성에 실패했습니다. 다시 시도해주세요.'
+            })
+
+        self.log_usage(user, result)
+        logger.info(f"자동완성 성공 - {len(completion)}자 생성")
+
+        return JsonResponse({
+            'success': True,
+            'completion': completion,
+            'message': 'AI가 글을 이어서 작성했습니다!'
+        })
+
+
+# 내용 자동완성 스트리밍 (비동기, SSE)
+class AsyncContentCompletionStreamView(AsyncAIView):
+    feature_type = 'autocomplete'
+    feature_name = '자동완성 스트리밍'
+
+    async def handle(self, request, user, data):
+        content = data.get('content', '').strip()
+        style = data.get('style', 'friendly')
+        regenerate = bool(data.get('regenerate', False))
+
+        return sse_response(acompletion_event_stream(user, content, style, use_cache=not regenerate))
+
+
+# 태그 추천 (비동기)
+class AsyncTagSuggestionView(AsyncAIView):
+    feature_type = 'tag_suggest'
+    feature_name = '태그 추천'
+
+    # 로컬 태그 추천기가 충분히 확신하면 OpenAI 호출 없이 응답
+    async def local_response(self, user, data):
+        if data.get('regenerate') or data.get('use_ai'):
+            return None
+
+        title = data.get('title', '').strip()
+        content = data.get('content', '').strip()
+        if not title and not content:
+            return None
+
+        local = await sync_to_async(tag_suggester.suggest)(title, content, 5)
+        if not local.confident:
+            return None
+
+        logger.info(f"로컬 태그 추천 성공 - {len(local.tags)}개")
+        return JsonResponse({
+            'success': True,
+            'tags': local.tags,
+            'source': 'local',
+            'message': f'기존 글을 바탕으로 {len(local.tags)}개의 태그를 추천했습니다!'
+        })
+
+    async def handle(self, request, user, data):
+        title = data.get('title', '').strip()
+        content = data.get('content', '').strip()
+        regenerate = bool(data.get('regenerate', False))
+
+        logger.info("OpenAI API 태그 추천 요청 시작")
+        start_time = time.time()
+
+        result = await aget_tag_suggestions(title, content, max_tags=5, use_cache=not regenerate)
+        tags = result.value
+
+        logger.info(f"OpenAI API 태그 추천 완료 - 소요시간: {time.time() - start_time:.2f}초")
+
+        if not tags:
+            return JsonResponse({
+                'success': False,
+                'error': '태그 추천에 실패했습니다. 다시 시도해주세요.'
+            })
+
+        self.log_usage(user, result)
+        logger.info(f"태그 추천 성공 - {len(tags)}개 생성")
+
+        return JsonResponse({
+            'success': True,
+            'tags': tags,
+            'source': 'ai',
+            'message': f'AI가 {len(tags)}개의 태그를 추천했습니다!'
+        })
+
+
+# 요약 생성 (비동기)
+class AsyncSummaryGenerationView(AsyncAIView):
+    feature_type = 'summary'
+    feature_name = '요약 생성'
+
+    async def handle(self, request, user, data):
+        content = data.get('content', '').strip()
+        regenerate = bool(data.get('regenerate', False))
+
+        logger.info(f"OpenAI API 요약 생성 요청 시작 - 내용 길이: {len(content)}자")
+        start_time = time.time()
+
+        result = await aget_content_summary(content, max_length=200, use_cache=not regenerate)
+        summary = result.value
+
+        logger.info(f"OpenAI API 요약 생성 완료 - 소요시간: {time.time() - start_time:.2f}초")
+
+        if not summary:
+            return JsonResponse({
+                'success': False,
+                'error': '요약 생성에 실패했습니다. 다시 시도해주세요.'
+            })
+
+        self.log_usage(user, result)
+        logger.info(f"요약 생성 성공 - {len(summary)}자 생성")
+
+        return JsonResponse({
+            'success': True,
+            'summary': summary,
+            'message': 'AI가 글을 요약했습니다!'
+        })
+
+
+# 제목/태그/요약 일괄 추천 (비동기)
+class AsyncAssistBundleView(AsyncAIView):
+    feature_type = 'assist_bundle'
+    feature_name = '일괄 추천'
+
+    async def handle(self, request, user, data):
+        title = data.get('title', '').strip()
+        content = data.get('content', '').strip()
+        regenerate = bool(data.get('regenerate', False))
+
+        logger.info(f"OpenAI API 일괄 추천 요청 시작 - 내용 길이: {len(content)}자")
+        start_time = time.time()
+
+        bundle = await aget_assist_bundle(title, content, use_cache=not regenerate)
+
+        logger.info(f"OpenAI API 일괄 추천 완료 - 소요시간: {time.time() - start_time:.2f}초")
+
+        if not bundle:
+            return JsonResponse({
+                'success': False,
+                'error': '일괄 추천에 실패했습니다. 다시 시도해주세요.'
+            })
+
+        for feature, result in bundle_usage_entries(bundle):
+            usage_recorder.record(user, feature, result, buffered=True)
+
+        return JsonResponse({
+            'success': True,
+            'titles': bundle['titles'],
+            'tags': bundle['tags'],
+            'summary': bundle['summary'],
+            'message': 'AI가 제목, 태그, 요약을 추천했습니다!'
+        })
@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from os.path import commonprefix
+from typing import List
+
+from django.conf import settings
+
+from . import ai_metrics, ai_tokens
+
+logger = logging.getLogger('ai_service')
+
+# 기능별 글 내용 입력 예산 (토큰) - settings.AI_PROMPT_BUDGETS 로 덮어쓸 수 있음
+DEFAULT_INPUT_BUDGETS = {
+    'title_suggest': 600,
+    'tag_suggest': 500,
+    'summary': 3000,
+    'autocomplete': 1500,
+    'assist_bundle': 3000,
+}
+DEFAULT_INPUT_BUDGET = 1000
+
+# 모델별 컨텍스트 길이 (입력 + 출력 토큰)
+MODEL_CONTEXT_WINDOWS = {
+    'gpt-4o-mini': 128000,
+    'gpt-4o': 128000,
+    'gpt-4-turbo': 128000,
+    'gpt-4': 8192,
+    'gpt-3.5-turbo': 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# 토크나이저 오차를 고려한 여유분
+CONTEXT_MARGIN = 32
+MIN_COMPLETION_TOKENS = 16
+
+# 생략된 구간 표시
+GAP_MARKER = '(...)'
+
+# 청크 경계로 삼을 문단의 비율 (문단 해시 기준 약 1/CHUNK_ANCHOR_DIVISOR)
+CHUNK_ANCHOR_DIVISOR = 3
+
+# 마크다운 제목, "1. 소제목" 형태의 줄
+_HEADING = re.compile(r'^\s*(#{1,6}\s+\S|\d{1,2}[.)]\s+\S)')
+_WORD = re.compile(r'[0-9A-Za-z가-힣]{2,}')
+
+
+def _context_window(model: str) -> int:
+    windows = {**MODEL_CONTEXT_WINDOWS, **getattr(settings, 'AI_MODEL_CONTEXT_WINDOWS', {})}
+    # 'gpt-4o-mini-2024-07-18' 처럼 버전이 붙은 이름은 가장 긴 접두어로 찾음
+    for name in sorted(windows, key=len, reverse=True):
+        if model.startswith(name):
+            return windows[name]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+# 제목으로 볼 수 있는 짧은 줄 (마크다운 제목, 번호 소제목, 문장부호로 끝나지 않는 한 줄 문단)
+def _is_heading(block: str) -> bool:
+    if '\n' in block.strip():
+        return False
+    line = block.strip()
+    if _HEADING.match(line):
+        return True
+    return 0 < len(line) <= 40 and line[-1] not in '.?!。…"\')'
+
+
+# 문단 단위로 분리 (빈 줄이 없으면 줄 단위)
+def split_blocks(content: str) -> List[str]:
+    text = content.replace('\r\n', '\n').strip()
+    blocks = [block.strip() for block in re.split(r'\n\s*\n', text) if block.strip()]
+    if len(blocks) <= 1:
+        blocks = [line.strip() for line in text.split('\n') if line.strip()]
+    return blocks
+
+
+# 문단 내용으로 정해지는 경계 여부 (앞뒤 문단이 바뀌어도 같은 문단이면 같은 결과)
+def _is_anchor(block: str) -> bool:
+    digest = hashlib.blake2b(block.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % CHUNK_ANCHOR_DIVISOR == 0
+
+
+# 너무 긴 문단은 문장 단위로 나눔
+def _split_sentences(block: str) -> List[str]:
+    return [sentence for sentence in re.split(r'(?<=[.!?。])\s+', block) if sentence.strip()]
+
+
+# 프롬프트 예산 관리
+# - 토큰 수는 (모델, 내용 해시) 기준으로 캐싱하여 같은 글/문단을 다시 세지 않음
+# - 예산을 넘는 글은 도입부, 소제목, 핵심 문단 순으로 골라 원래 순서대로 이어 붙임
+class PromptBudget:
+    def __init__(self, cache_size=None):
+        self.input_budgets = {**DEFAULT_INPUT_BUDGETS, **getattr(settings, 'AI_PROMPT_BUDGETS', {})}
+        self.cache_size = cache_size or getattr(settings, 'AI_TOKEN_COUNT_CACHE_SIZE', 4096)
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+        ai_metrics.register_gauge('ai_budget.count_cache_size', lambda: len(self._counts))
+
+    def input_budget(self, feature: str) -> int:
+        return self.input_budgets.get(feature, DEFAULT_INPUT_BUDGET)
+
+    # 토큰 수 (내용 해시 기준 LRU 캐시)
+    def count(self, text: str, model: str) -> int:
+        if not text:
+            return 0
+
+        key = (model, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                ai_metrics.incr('ai_budget.count_hit')
+                return self._counts[key]
+
+        tokens = ai_tokens.count_tokens(text, model)
+        with self._lock:
+            self._counts[key] = tokens
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        ai_metrics.incr('ai_budget.count_miss')
+        return tokens
+
+    def count_messages(self, messages: List[dict], model: str) -> int:
+        total = ai_tokens.TOKENS_PER_REPLY
+        for message in messages:
+            total += ai_tokens.TOKENS_PER_MESSAGE + self.count(message.get('content') or '', model)
+        return total
+
+    # 기능별 예산에 맞게 글 내용 선택 (tail=True 이면 뒷부분 유지 - 이어쓰기용)
+    def fit(self, content: str, feature: str, model: str, tail: bool = False) -> str:
+        budget = self.input_budget(feature)
+        if self.count(content, model) <= budget:
+            return content
+
+        ai_metrics.incr('ai_budget.trimmed')
+        if tail:
+            return ai_tokens.truncate_tokens(content, budget, model, from_end=True).lstrip()
+        return self.select(content, budget, model)
+
+    # 도입부, 소제목, 핵심 문단 순으로 예산 안에서 문단 선택
+    def select(self, content: str, budget: int, model: str) -> str:
+        blocks = split_blocks(content)
+        if not blocks:
+            return ''
+
+        separator = self.count('\n\n', model)
+
+        # 도입부: 앞쪽 소제목들 + 첫 본문 문단
+        lead_end = 0
+        while lead_end < len(blocks) - 1 and _is_heading(blocks[lead_end]):
+            lead_end += 1
+        lead = '\n\n'.join(blocks[:lead_end + 1])
+        lead_tokens = self.count(lead, model)
+        if lead_tokens >= budget:
+            return ai_tokens.truncate_tokens(lead, budget, model)
+
+        # 글 전체에서 자주 나온 단어, 도입부/소제목의 단어를 많이 포함한 문단일수록 높은 점수 (길이로 정규화)
+        words = [_WORD.findall(block.lower()) for block in blocks]
+        frequency = Counter(word for block_words in words for word in set(block_words))
+        headings = [i for i in range(lead_end + 1, len(blocks)) if _is_heading(blocks[i])]
+        topic = set(word for i in list(range(lead_end + 1)) + headings for word in words[i])
+
+        def score(index):
+            unique = set(words[index])
+            value = sum(frequency[word] - 1 + (3 if word in topic else 0) for word in unique)
+            value /= math.sqrt(len(words[index]) + 1)
+            # 마지막 문단(결론)은 가산점
+            return value * 1.5 if index == len(blocks) - 1 else value
+
+        heading_set = set(headings)
+        paragraphs = sorted(
+            (i for i in range(lead_end + 1, len(blocks)) if i not in heading_set),
+            key=score, reverse=True,
+        )
+
+        selected = set(range(lead_end + 1))
+        used = lead_tokens
+        for index in headings + paragraphs:
+            tokens = self.count(blocks[index], model) + separator * 2
+            if used + tokens <= budget:
+                selected.add(index)
+                used += tokens
+
+        parts = []
+        previous = -1
+        for index in sorted(selected):
+            if index != previous + 1:
+                parts.append(GAP_MARKER)
+            parts.append(blocks[index])
+            previous = index
+        if previous != len(blocks) - 1:
+            parts.append(GAP_MARKER)
+        return '\n\n'.join(parts)
+
+    # 요약용 청크 분할 (map-reduce 요약)
+    # 청크 경계는 문단 내용 해시로 정하므로(content-defined chunking) 한 문단을 고쳐도
+    # 보통 그 문단이 속한 청크만 바뀌고 나머지 청크는 그대로 유지되어 청크 요약 캐시를 재사용할 수 있음.
+    # 최소 크기(max_tokens // 3)를 넘은 뒤 경계 문단을 만나거나 최대 크기에 도달하면 청크를 끝냄.
+    def chunk(self, content: str, model: str, max_tokens: int) -> List[str]:
+        min_tokens = max_tokens // 3
+        separator = self.count('\n\n', model)
+
+        units = []
+        for block in split_blocks(content):
+            if self.count(block, model) <= max_tokens:
+                units.append(block)
+                continue
+            for sentence in _split_sentences(block):
+                while self.count(sentence, model) > max_tokens:
+                    # 디코딩한 앞부분 중 원문과 일치하는 길이에서 잘라 글자가 빠지거나 겹치지 않도록 함
+                    head = ai_tokens.truncate_tokens(sentence, max_tokens, model).rstrip('\ufffd')
+                    offset = len(commonprefix([head, sentence]))
+                    if not offset:
+                        break
+                    units.append(sentence[:offset])
+                    sentence = sentence[offset:].lstrip()
+                if sentence:
+                    units.append(sentence)
+
+        chunks = []
+        current, used = [], 0
+        for unit in units:
+            tokens = self.count(unit, model)
+            if current and used + separator + tokens > max_tokens:
+                chunks.append('\n\n'.join(current))
+                current, used = [], 0
+
+            current.append(unit)
+            used += tokens + (separator if used else 0)
+            if used >= min_tokens and _is_anchor(unit):
+                chunks.append('\n\n'.join(current))
+                current, used = [], 0
+
+        if current:
+            chunks.append('\n\n'.join(current))
+        return chunks
+
+    # 남은 컨텍스트 길이로 출력 토큰 수 결정
+    def max_tokens(self, messages: List[dict], model: str, requested: int) -> int:
+        prompt_tokens = self.count_messages(messages, model)
+        available = _context_window(model) - prompt_tokens - CONTEXT_MARGIN
+        if available < requested:
+            logger.warning(f"컨텍스트 길이 부족 - 모델: {model}, 입력: {prompt_tokens}, 요청 출력: {requested}, 가능: {available}")
+            ai_metrics.incr('ai_budget.max_tokens_reduced')
+        return max(MIN_COMPLETION_TOKENS, min(requested, available))
+
+
+prompt_budget = PromptBudget()
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import ai_metrics
+
+logger = logging.getLogger('ai_service')
+
+# 기능별 기본 TTL (초) - settings.AI_CACHE_TTLS 로 덮어쓸 수 있음
+DEFAULT_TTLS = {
+    'title_suggest': 60 * 60,
+    'tag_suggest': 6 * 60 * 60,
+    'summary': 24 * 60 * 60,
+    'autocomplete': 10 * 60,
+    'assist_bundle': 60 * 60,
+    'summary_chunk': 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+DEFAULT_BACKENDS = [
+    'blog.ai_cache.LRUCacheBackend',
+    'blog.ai_cache.DatabaseCacheBackend',
+]
+
+
+# 요청을 정규화한 뒤 해시하여 캐시 키 생성
+def make_cache_key(model: str, messages: List[dict], max_tokens: int, temperature: float, **extra) -> str:
+    normalized = {
+        'model': model,
+        'messages': [
+            {
+                'role': message.get('role', ''),
+                'content': (message.get('content') or '').replace('\r\n', '\n').strip(),
+            }
+            for message in messages
+        ],
+        'max_tokens': int(max_tokens),
+        'temperature': round(float(temperature), 3),
+        **extra,
+    }
+    payload = json.dumps(normalized, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# 캐시 백엔드 공통 인터페이스
+class BaseCacheBackend:
+    name = 'base'
+    # 여러 워커 프로세스가 함께 보는 계층인지 여부
+    shared = False
+
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict, ttl: int, feature: str = '') -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+# 프로세스 내부 LRU 캐시 (크기 제한 + TTL)
+class LRUCacheBackend(BaseCacheBackend):
+    name = 'lru'
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or getattr(settings, 'AI_CACHE_LRU_SIZE', 512)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, feature=''):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# DB 테이블 기반 영속 캐시 (만료 시각 기준 TTL 제거)
+class DatabaseCacheBackend(BaseCacheBackend):
+    name = 'db'
+    shared = True
+    # set 호출이 이 횟수만큼 쌓이면 만료된 행 정리
+    purge_every = 100
+
+    def __init__(self):
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        from .models import AIResponseCache
+
+        entry = AIResponseCache.objects.filter(key=key).only('response', 'expires_at').first()
+        if entry is None:
+            return None
+        if entry.expires_at <= timezone.now():
+            AIResponseCache.objects.filter(key=key).delete()
+            return None
+        return entry.response
+
+    def set(self, key, value, ttl, feature=''):
+        from .models import AIResponseCache
+
+        AIResponseCache.objects.update_or_create(
+            key=key,
+            defaults={
+                'feature_type': feature,
+                'response': value,
+                'expires_at': timezone.now() + timedelta(seconds=ttl),
+            },
+        )
+
+        with self._lock:
+            self._writes += 1
+            should_purge = self._writes % self.purge_every == 0
+        if should_purge:
+            self.purge_expired()
+
+    def delete(self, key):
+        from .models import AIResponseCache
+
+        AIResponseCache.objects.filter(key=key).delete()
+
+    def clear(self):
+        from .models import AIResponseCache
+
+        AIResponseCache.objects.all().delete()
+
+    # 만료된 캐시 행 삭제
+    def purge_expired(self) -> int:
+        from .models import AIResponseCache
+
+        deleted, _ = AIResponseCache.objects.filter(expires_at__lte=timezone.now()).delete()
+        if deleted:
+            logger.info(f"AI 응답 캐시 만료 항목 정리 - {deleted}건")
+        return deleted
+
+
+# 여러 계층을 순서대로 조회하는 응답 캐시
+class ResponseCache:
+    def __init__(self, backends: List[BaseCacheBackend], ttls: Optional[dict] = None, default_ttl: int = DEFAULT_TTL):
+        self.backends = backends
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+    # 기능별 TTL
+    def ttl_for(self, feature: str) -> int:
+        return self.ttls.get(feature, self.default_ttl)
+
+    def get(self, key: str, feature: str = '') -> Optional[dict]:
+        for index, backend in enumerate(self.backends):
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                logger.warning(f"AI 응답 캐시 조회 실패 ({backend.name}): {e}")
+                continue
+
+            if value is not None:
+                ai_metrics.incr(f'ai_cache.hit.{backend.name}')
+                ai_metrics.incr(f'ai_cache.hit.feature.{feature or "unknown"}')
+                # 상위 계층으로 승격
+                for upper in self.backends[:index]:
+                    try:
+                        upper.set(key, value, self.ttl_for(feature), feature)
+                    except Exception as e:
+                        logger.warning(f"AI 응답 캐시 승격 실패 ({upper.name}): {e}")
+                return value
+
+        ai_metrics.incr('ai_cache.miss')
+        ai_metrics.incr(f'ai_cache.miss.feature.{feature or "unknown"}')
+        return None
+
+    # 프로세스 간 공유 계층만 조회 (지표에 집계하지 않음)
+    def get_shared(self, key: str) -> Optional[dict]:
+        for backend in self.backends:
+            if not backend.shared:
+                continue
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                logger.warning(f"AI 응답 캐시 조회 실패 ({backend.name}): {e}")
+                continue
+            if value is not None:
+                return value
+        return None
+
+    def set(self, key: str, value: dict, feature: str = '') -> None:
+        ttl = self.ttl_for(feature)
+        if ttl <= 0:
+            return
+        for backend in self.backends:
+            try:
+                backend.set(key, value, ttl, feature)
+            except Exception as e:
+                logger.warning(f"AI 응답 캐시 저장 실패 ({backend.name}): {e}")
+        ai_metrics.incr('ai_cache.store')
+
+    def clear(self) -> None:
+        for backend in self.backends:
+            backend.clear()
+
+    # 적중/실패 통계
+    def stats(self) -> dict:
+        hits = {backend.name: ai_metrics.get(f'ai_cache.hit.{backend.name}') for backend in self.backends}
+        misses = ai_metrics.get('ai_cache.miss')
+        total = sum(hits.values()) + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(sum(hits.values()) / total, 4) if total else 0.0,
+        }
+
+
+# settings 기반으로 응답 캐시 생성 (비활성화 시 None)
+def build_response_cache() -> Optional[ResponseCache]:
+    if not getattr(settings, 'AI_CACHE_ENABLED', True):
+        return None
+
+    backends = []
+    for path in getattr(settings, 'AI_CACHE_BACKENDS', DEFAULT_BACKENDS):
+        try:
+            backends.append(import_string(path)())
+        except Exception as e:
+            logger.error(f"AI 응답 캐시 백엔드 로드 실패 ({path}): {e}")
+
+    if not backends:
+        return None
+
+    return ResponseCache(
+        backends,
+        ttls=getattr(settings, 'AI_CACHE_TTLS', None),
+        default_ttl=getattr(settings, 'AI_CACHE_DEFAULT_TTL', DEFAULT_TTL),
+    )
@@ -0,0 +1,238 @@
+import hashlib
+import logging
+import os
+import random
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .ai_usage import usage_recorder
+from .models import AIJob, Post
+from .page_cache import page_cache
+
+logger = logging.getLogger('ai_service')
+
+# 요약을 생성할 최소 본문 길이 (SummaryGenerationView 와 동일)
+SUMMARY_MIN_LENGTH = 200
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+# 게시글 저장 후 요약 작업 등록 (대기/처리 중인 작업이 있으면 재사용)
+def enqueue_summary_job(post: Post):
+    from .ai_service import ai_service
+
+    if not getattr(settings, 'AI_SUMMARY_ON_SAVE', True):
+        return None
+
+    # AI 서비스를 쓸 수 없으면(API 키 없음 등) 실패할 작업을 만들지 않음
+    if not ai_service or ai_service.dummy_mode:
+        return None
+
+    if len(post.content.strip()) < SUMMARY_MIN_LENGTH:
+        return None
+
+    digest = content_hash(post.content)
+
+    # 본문이 바뀌지 않았고 이미 요약이 있으면 건너뜀
+    if post.summary and AIJob.objects.filter(
+        post=post, job_type='summary', status='done', content_hash=digest
+    ).exists():
+        return None
+
+    # 처리 중인 작업은 해시만 갱신 - 워커가 끝난 뒤 해시가 바뀌었으면 다시 대기열에 넣음 (요약 작업이 겹치지 않도록)
+    existing = AIJob.objects.filter(post=post, job_type='summary', status__in=['pending', 'running']).first()
+    if existing:
+        if existing.content_hash != digest:
+            AIJob.objects.filter(pk=existing.pk).update(content_hash=digest)
+        return existing
+
+    job = AIJob.objects.create(
+        post=post,
+        job_type='summary',
+        content_hash=digest,
+        max_attempts=getattr(settings, 'AI_JOB_MAX_ATTEMPTS', 5),
+    )
+    logger.info(f"요약 작업 등록 - 게시글: {post.pk}, 작업: {job.pk}")
+    return job
+
+
+# 게시글 저장 후 임베딩 작업 등록 (외부 임베딩 API 를 쓰는 경우 - 저장 요청이 API 호출을 기다리지 않음)
+def enqueue_embedding_job(post: Post):
+    digest = content_hash(f"{post.title}\n\n{post.content}")
+    pending = AIJob.objects.filter(post=post, job_type='embedding', status='pending').first()
+    if pending:
+        if pending.content_hash != digest:
+            AIJob.objects.filter(pk=pending.pk).update(content_hash=digest)
+        return pending
+
+    job = AIJob.objects.create(
+        post=post,
+        job_type='embedding',
+        content_hash=digest,
+        max_attempts=getattr(settings, 'AI_JOB_MAX_ATTEMPTS', 5),
+    )
+    logger.info(f"임베딩 작업 등록 - 게시글: {post.pk}, 작업: {job.pk}")
+    return job
+
+
+# 작업 큐 처리기
+class AIJobWorker:
+    def __init__(self, worker_id=None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.backoff_base = getattr(settings, 'AI_JOB_BACKOFF_BASE', 30)
+        self.backoff_max = getattr(settings, 'AI_JOB_BACKOFF_MAX', 60 * 60)
+        self.lease_timeout = getattr(settings, 'AI_JOB_LEASE_TIMEOUT', 5 * 60)
+
+    # 처리할 작업 선점 (조건부 UPDATE 로 다른 워커와 중복 방지)
+    def claim(self, limit: int):
+        now = timezone.now()
+        candidates = AIJob.objects.filter(
+            status='pending', run_after__lte=now
+        ).order_by('run_after').values_list('pk', flat=True)[:limit * 2]
+
+        claimed = []
+        for pk in candidates:
+            updated = AIJob.objects.filter(pk=pk, status='pending').update(
+                status='running',
+                locked_by=self.worker_id,
+                locked_at=now,
+                started_at=now,
+                attempts=F('attempts') + 1,
+            )
+            if updated:
+                claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+        return claimed
+
+    # 워커가 비정상 종료되어 임대 시간이 지난 작업을 대기 상태로 되돌림
+    def release_stale(self) -> int:
+        expired = timezone.now() - timedelta(seconds=self.lease_timeout)
+        released = AIJob.objects.filter(status='running', locked_at__lt=expired).update(
+            status='pending', locked_by='', locked_at=None
+        )
+        if released:
+            logger.warning(f"임대 시간이 지난 AI 작업 {released}건을 다시 대기열에 넣었습니다.")
+        return released
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+        return delay * random.uniform(0.8, 1.2)
+
+    # 단일 작업 처리
+    def run(self, job_id: int) -> bool:
+        job = AIJob.objects.select_related('post', 'post__author').get(pk=job_id)
+
+        try:
+            if job.job_type == 'summary':
+                if not self.run_summary(job):
+                    self.requeue(job)
+                    return False
+            elif job.job_type == 'embedding':
+                self.run_embedding(job)
+            else:
+                raise ValueError(f"알 수 없는 작업 유형: {job.job_type}")
+
+        except Exception as e:
+            now = timezone.now()
+            if job.attempts >= job.max_attempts:
+                AIJob.objects.filter(pk=job.pk).update(
+                    status='failed', last_error=str(e), finished_at=now, locked_by='', locked_at=None
+                )
+                logger.error(f"AI 작업 실패 (재시도 중단) - 작업: {job.pk}, 오류: {e}")
+            else:
+                delay = self.backoff(job.attempts)
+                AIJob.objects.filter(pk=job.pk).update(
+                    status='pending', last_error=str(e), locked_by='', locked_at=None,
+                    run_after=now + timedelta(seconds=delay),
+                )
+                logger.warning(f"AI 작업 실패 - 작업: {job.pk}, {job.attempts}회차, {delay:.0f}초 후 재시도: {e}")
+            return False
+
+        AIJob.objects.filter(pk=job.pk).update(
+            status='done', last_error='', finished_at=timezone.now(), locked_by='', locked_at=None
+        )
+        return True
+
+    # 처리 중 본문이 바뀐 작업을 바로 다시 대기열에 넣음 (실패가 아니므로 시도 횟수에 포함하지 않음)
+    def requeue(self, job: AIJob):
+        AIJob.objects.filter(pk=job.pk, status='running').update(
+            status='pending', locked_by='', locked_at=None, run_after=timezone.now(),
+            attempts=Greatest(F('attempts') - 1, 0),
+        )
+        logger.info(f"요약 작업 중 본문이 변경되어 다시 대기열에 넣음 - 게시글: {job.post_id}, 작업: {job.pk}")
+
+    # 요약 생성 후 저장 (update() 로 저장하여 updated_at 을 건드리지 않음)
+    # 처리 중 본문이 바뀌었으면 False (최신 본문으로 다시 처리해야 함)
+    def run_summary(self, job: AIJob) -> bool:
+        from .ai_service import ai_service, AIServiceError
+
+        if not ai_service:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다.")
+
+        post = job.post
+        digest = content_hash(post.content)
+        result = ai_service.summarize(post.content, max_length=200)
+        summary = result.value
+
+        # 저장 시 자동 생성이므로 사용자 AI 사용 횟수에는 포함하지 않음
+        usage_recorder.record(post.author_id, 'summary', result, count=0)
+
+        # 처리 중 본문이 수정되었으면 저장하지 않고 최신 본문으로 다시 처리
+        updated = Post.objects.filter(pk=post.pk, content=post.content).update(summary=summary)
+        if not updated:
+            return False
+        # update() 는 post_save 신호가 없으므로 상세 화면 캐시를 직접 무효화
+        page_cache.invalidate_post(post.pk)
+
+        # 처리 중 저장으로 작업 해시가 갱신되었으면 (본문이 바뀌었다가 되돌아간 경우 등) 다시 처리
+        if not AIJob.objects.filter(pk=job.pk, content_hash=job.content_hash).update(content_hash=digest):
+            return False
+
+        logger.info(f"요약 작업 완료 - 게시글: {post.pk}, {len(summary)}자")
+        return True
+
+
+    # 최신 제목/본문으로 임베딩 갱신 (입력이 같으면 API 를 호출하지 않음)
+    def run_embedding(self, job: AIJob):
+        from .semantic import semantic_index
+
+        updated = semantic_index.upsert(job.post)
+        logger.info(f"임베딩 작업 완료 - 게시글: {job.post_id}, 갱신: {updated}")
+
+
+# 큐 상태 (대기 건수, 처리 지연 시간)
+def job_queue_stats() -> dict:
+    now = timezone.now()
+    counts = dict(AIJob.objects.order_by().values_list('status').annotate(total=Count('pk')))
+
+    oldest = AIJob.objects.filter(status='pending').order_by('created_at').values_list('created_at', flat=True).first()
+
+    # 최근 1시간 완료 작업의 등록~완료 지연 시간
+    recent = AIJob.objects.filter(
+        status='done', finished_at__gte=now - timedelta(hours=1)
+    ).values_list('created_at', 'finished_at')
+    latencies = sorted((finished - created).total_seconds() for created, finished in recent)
+
+    def percentile(p):
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+    return {
+        'pending': counts.get('pending', 0),
+        'running': counts.get('running', 0),
+        'failed': counts.get('failed', 0),
+        'done': counts.get('done', 0),
+        'oldest_pending_age': round((now - oldest).total_seconds(), 2) if oldest else None,
+        'latency_p50': percentile(0.5),
+        'latency_p95': percentile(0.95),
+        'completed_last_hour': len(latencies),
+    }
@@ -0,0 +1,54 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+# AI 기능 관련 프로세스 내부 지표 (카운터 + 게이지)
+_lock = threading.Lock()
+_counters: Dict[str, int] = defaultdict(int)
+_gauges: Dict[str, Callable[[], object]] = {}
+
+
+# 카운터 증가
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+# 카운터 값 조회
+def get(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+# 조회 시점에 값을 계산하는 게이지 등록
+def register_gauge(name: str, func: Callable[[], object]) -> None:
+    with _lock:
+        _gauges[name] = func
+
+
+# 두 카운터의 비율 (분모가 0이면 0.0)
+def ratio(numerator: str, denominator: str) -> float:
+    total = get(denominator)
+    return round(get(numerator) / total, 4) if total else 0.0
+
+
+# 전체 지표 스냅샷
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+
+    values = {}
+    for name, func in gauges.items():
+        try:
+            values[name] = func()
+        except Exception as e:
+            values[name] = f'error: {e}'
+
+    return {'counters': counters, 'gauges': values}
+
+
+# 카운터 초기화 (관리 명령/디버깅용)
+def reset() -> None:
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,215 @@
+import logging
+import math
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import ai_metrics
+
+logger = logging.getLogger('ai_service')
+
+# 기능별 요청 버킷 (capacity: 최대 연속 요청 수, per_minute: 분당 충전량)
+DEFAULT_RATE_LIMITS = {
+    'default': {'capacity': 10, 'per_minute': 6},
+    'autocomplete': {'capacity': 20, 'per_minute': 20},
+    'assist_bundle': {'capacity': 5, 'per_minute': 3},
+}
+
+Decision = namedtuple('Decision', ['allowed', 'retry_after', 'reason'])
+
+
+# 프로세스 내부 토큰 버킷 저장소
+class LocalBucketStore:
+    # 보관 버킷이 이 수를 넘으면 가득 찬(= 오래 쓰지 않은) 버킷 정리
+    max_entries = 10000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    # 토큰 1개 사용 시도 - (허용 여부, 남은 토큰, 재시도까지 초)
+    def take(self, key: str, capacity: int, rate: float):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (1 - tokens) / rate
+
+            if len(self._buckets) > self.max_entries:
+                self._prune(now, capacity, rate)
+            return allowed, tokens - 1 if allowed else tokens, retry_after
+
+    def peek(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            return min(capacity, tokens + (now - updated) * rate)
+
+    def _prune(self, now, capacity, rate):
+        full = [key for key, (tokens, updated) in self._buckets.items()
+                if tokens + (now - updated) * rate >= capacity]
+        for key in full:
+            del self._buckets[key]
+
+
+# Django 캐시(Redis, Memcached 등) 기반 공유 저장소 - 워커 프로세스 간 한도 공유
+# 읽기-수정-쓰기 사이 경쟁으로 동시 요청 몇 건이 추가로 허용될 수 있음
+class CacheBucketStore:
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'AI_RATE_LIMIT_CACHE', 'default')]
+
+    def _load(self, key, capacity, rate, now):
+        tokens, updated = self.cache.get(f'ai_rl:{key}') or (capacity, now)
+        return min(capacity, tokens + (now - updated) * rate)
+
+    def take(self, key: str, capacity: int, rate: float):
+        now = time.time()
+        tokens = self._load(key, capacity, rate, now)
+        timeout = math.ceil(capacity / rate)
+        if tokens >= 1:
+            self.cache.set(f'ai_rl:{key}', (tokens - 1, now), timeout)
+            return True, tokens - 1, 0
+        self.cache.set(f'ai_rl:{key}', (tokens, now), timeout)
+        return False, tokens, (1 - tokens) / rate
+
+    def peek(self, key: str, capacity: int, rate: float) -> float:
+        return self._load(key, capacity, rate, time.time())
+
+
+# 사용자별/기능별 요청 속도 제한 + 일/월 토큰 예산
+class AIRateLimiter:
+    def __init__(self, store=None):
+        self.enabled = getattr(settings, 'AI_RATE_LIMIT_ENABLED', True)
+        self.limits = {**DEFAULT_RATE_LIMITS, **getattr(settings, 'AI_RATE_LIMITS', {})}
+        self.daily_budget = getattr(settings, 'AI_TOKEN_BUDGET_DAILY', None)
+        self.monthly_budget = getattr(settings, 'AI_TOKEN_BUDGET_MONTHLY', None)
+        self.usage_cache_ttl = getattr(settings, 'AI_TOKEN_BUDGET_CACHE_TTL', 30)
+        self.store = store or import_string(
+            getattr(settings, 'AI_RATE_LIMIT_STORE', 'blog.ai_ratelimit.LocalBucketStore')
+        )()
+        # (사용자, 기간 시작) -> (DB 사용량, 만료 시각)
+        self._usage = {}
+        self._usage_lock = threading.Lock()
+
+    def _limit(self, feature: str):
+        limit = self.limits.get(feature, self.limits['default'])
+        return limit['capacity'], limit['per_minute'] / 60
+
+    # 요청 허용 여부 확인 (허용 시 버킷 토큰 차감)
+    def check(self, user, feature: str) -> Decision:
+        if not self.enabled:
+            return Decision(True, 0, '')
+
+        # 예산을 먼저 확인해 거절된 요청이 버킷을 소모하지 않도록 함
+        for period, budget in (('daily', self.daily_budget), ('monthly', self.monthly_budget)):
+            if budget and self.tokens_used(user.pk, period) >= budget:
+                ai_metrics.incr(f'ai_ratelimit.budget.{period}')
+                return Decision(False, self._seconds_until_reset(period), period)
+
+        capacity, rate = self._limit(feature)
+        allowed, _, retry_after = self.store.take(f'{user.pk}:{feature}', capacity, rate)
+        if not allowed:
+            ai_metrics.incr('ai_ratelimit.rejected')
+            return Decision(False, math.ceil(retry_after), 'rate')
+        return Decision(True, 0, '')
+
+    # 기간 시작 시각 (로컬 시간 기준 자정/월초)
+    def _period_start(self, period: str):
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today if period == 'daily' else today.replace(day=1)
+
+    def _seconds_until_reset(self, period: str) -> int:
+        start = self._period_start(period)
+        if period == 'daily':
+            reset = start + timedelta(days=1)
+        else:
+            reset = (start + timedelta(days=32)).replace(day=1)
+        return max(1, math.ceil((reset - timezone.localtime()).total_seconds()))
+
+    # 기간 내 실제 API 사용 토큰 수 (캐시 결과 제외, 저장 대기 중인 기록 포함)
+    def tokens_used(self, user_id, period: str) -> int:
+        from .ai_usage import usage_recorder
+        from .models import AIUsageLog
+
+        start = self._period_start(period)
+        cache_key = (user_id, start)
+        now = time.monotonic()
+
+        with self._usage_lock:
+            cached = self._usage.get(cache_key)
+        if cached and cached[1] > now:
+            used = cached[0]
+        else:
+            used = AIUsageLog.objects.filter(
+                user_id=user_id, cached=False, created_at__gte=start
+            ).aggregate(total=Sum('tokens_used'))['total'] or 0
+            with self._usage_lock:
+                if len(self._usage) > LocalBucketStore.max_entries:
+                    self._usage.clear()
+                self._usage[cache_key] = (used, now + self.usage_cache_ttl)
+
+        return used + usage_recorder.pending_tokens(user_id, since=start)
+
+    # 남은 한도 (ai_usage_stats 표시용)
+    def status(self, user) -> dict:
+        features = {}
+        for feature in ['title_suggest', 'autocomplete', 'tag_suggest', 'summary', 'assist_bundle']:
+            capacity, rate = self._limit(feature)
+            features[feature] = {
+                'remaining': int(self.store.peek(f'{user.pk}:{feature}', capacity, rate)),
+                'capacity': capacity,
+            }
+
+        budgets = {}
+        for period, budget in (('daily', self.daily_budget), ('monthly', self.monthly_budget)):
+            used = self.tokens_used(user.pk, period)
+            budgets[period] = {
+                'used': used,
+                'limit': budget,
+                'remaining': max(budget - used, 0) if budget else None,
+            }
+
+        return {'enabled': self.enabled, 'requests': features, 'tokens': budgets}
+
+
+rate_limiter = AIRateLimiter()
+
+
+# 한도 초과 응답 (429 + Retry-After)
+def rate_limited_response(decision: Decision) -> JsonResponse:
+    messages = {
+        'rate': f'AI 요청이 너무 많습니다. {decision.retry_after}초 후 다시 시도해주세요.',
+        'daily': '오늘 사용할 수 있는 AI 토큰을 모두 사용했습니다. 내일 다시 시도해주세요.',
+        'monthly': '이번 달 사용할 수 있는 AI 토큰을 모두 사용했습니다.',
+    }
+    response = JsonResponse({
+        'success': False,
+        'error': messages[decision.reason],
+        'reason': decision.reason,
+        'retry_after': decision.retry_after,
+    }, status=429)
+    response['Retry-After'] = str(decision.retry_after)
+    return response
+
+
+# 요청 한도 확인 - 초과 시 429 응답, 허용 시 None
+# 입력 검증을 통과한 뒤 API 호출 직전에 호출해 잘못된 요청이 버킷 토큰을 소모하지 않도록 함
+def check_rate_limit(user, feature: str):
+    decision = rate_limiter.check(user, feature)
+    if not decision.allowed:
+        logger.warning(f"AI 요청 한도 초과 - 사용자: {user.username}, 기능: {feature}, 사유: {decision.reason}")
+        return rate_limited_response(decision)
+    return None
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+from . import ai_metrics
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+logger = logging.getLogger('ai_service')
+
+# 오류 분류 결과
+# - retryable: 잠시 후 재시도하면 성공할 수 있는 오류
+# - counts: 서킷 브레이커의 실패로 집계할 오류 (공급자 장애로 볼 수 있는 오류)
+ErrorKind = namedtuple('ErrorKind', ['name', 'retryable', 'counts', 'message'])
+
+TIMEOUT = ErrorKind('timeout', True, True, "AI 응답 시간이 초과되었습니다. 다시 시도해주세요.")
+CONNECTION = ErrorKind('connection', True, True, "AI 서비스에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.")
+RATE_LIMIT = ErrorKind('rate_limit', True, True, "API 사용량 한도를 초과했습니다. 잠시 후 다시 시도해주세요.")
+QUOTA = ErrorKind('quota', False, True, "API 크레딧이 부족합니다.")
+SERVER = ErrorKind('server', True, True, "AI 서비스 일시 오류입니다. 다시 시도해주세요.")
+AUTH = ErrorKind('auth', False, True, "API 인증에 실패했습니다.")
+REQUEST = ErrorKind('request', False, False, "AI 요청이 올바르지 않습니다.")
+UNKNOWN = ErrorKind('unknown', False, False, "AI 서비스 일시 오류입니다. 다시 시도해주세요.")
+
+
+# openai 예외 타입으로 오류 분류
+def classify_error(e: Exception) -> ErrorKind:
+    if isinstance(e, (TimeoutError, asyncio.TimeoutError)):
+        return TIMEOUT
+
+    if not OPENAI_AVAILABLE:
+        return UNKNOWN
+
+    # APITimeoutError 는 APIConnectionError 의 하위 클래스
+    if isinstance(e, openai.APITimeoutError):
+        return TIMEOUT
+    if isinstance(e, openai.APIConnectionError):
+        return CONNECTION
+    if isinstance(e, openai.RateLimitError):
+        return QUOTA if getattr(e, 'code', None) == 'insufficient_quota' else RATE_LIMIT
+    if isinstance(e, (openai.AuthenticationError, openai.PermissionDeniedError)):
+        return AUTH
+    if isinstance(e, openai.APIStatusError):
+        return SERVER if e.status_code >= 500 else REQUEST
+    return UNKNOWN
+
+
+# 응답의 Retry-After 헤더 (초)
+def retry_after_seconds(e: Exception):
+    response = getattr(e, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+# 재시도 정책 (지수 백오프 + full jitter)
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 4.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    # attempt 회차 실패 후 대기 시간 (재시도하지 않으면 None)
+    def delay(self, attempt: int, kind: ErrorKind, error: Exception, remaining: float):
+        if not kind.retryable or attempt >= self.max_attempts:
+            return None
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+
+        # 남은 기한 안에 재시도할 수 없으면 포기
+        if delay >= remaining:
+            return None
+        return delay
+
+
+# 서킷 브레이커
+# 최근 window_size 건 중 실패 비율이 failure_threshold 이상이면 open 상태가 되어 즉시 실패하고,
+# reset_timeout 초 후 half-open 상태에서 시험 요청 1건으로 복구 여부를 확인함.
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str = 'openai', failure_threshold: float = 0.5, window_size: int = 20,
+                 min_requests: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probing = False
+        # 마지막으로 내준 시험 요청 번호 (결과 없이 끝난 시험 요청만 돌려받기 위함)
+        self._probe_id = 0
+        self._lock = threading.Lock()
+
+        ai_metrics.register_gauge(f'ai_breaker.{name}.state', lambda: self.STATE_CODES[self.current_state()])
+        ai_metrics.register_gauge(f'ai_breaker.{name}.failure_rate', self.failure_rate)
+
+    def current_state(self) -> str:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self.state
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return round(self._outcomes.count(False) / len(self._outcomes), 4)
+
+    # 요청 허용 여부 (half-open 에서는 시험 요청 1건만 허용)
+    def allow(self) -> bool:
+        return self.acquire() is not None
+
+    # 요청 허가 - 거부 None, 일반 요청 0, 시험 요청은 시험 요청 번호
+    def acquire(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    ai_metrics.incr(f'ai_breaker.{self.name}.rejected')
+                    return None
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    ai_metrics.incr(f'ai_breaker.{self.name}.rejected')
+                    return None
+                self._probing = True
+                self._probe_id += 1
+                return self._probe_id
+            return 0
+
+    # 결과(record_success/record_failure) 없이 끝난 시험 요청 반환 (요청 취소 등)
+    # 반환하지 않으면 half-open 상태에서 이후 요청이 모두 거부됨. 이미 결과가 기록됐거나 일반 요청이면 무시
+    def release(self, ticket):
+        with self._lock:
+            if ticket and self.state == self.HALF_OPEN and self._probing and ticket == self._probe_id:
+                self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                logger.info(f"서킷 브레이커 복구 ({self.name})")
+                self.state = self.CLOSED
+                self._outcomes.clear()
+                self._probing = False
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == self.HALF_OPEN:
+                self._open()
+                return
+
+            if len(self._outcomes) >= self.min_requests:
+                rate = self._outcomes.count(False) / len(self._outcomes)
+                if self.state == self.CLOSED and rate >= self.failure_threshold:
+                    self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        ai_metrics.incr(f'ai_breaker.{self.name}.opened')
+        logger.warning(f"서킷 브레이커 open ({self.name}) - {self.reset_timeout:.0f}초 동안 요청을 차단합니다.")
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._probing = False
@@ -1,9 +1,27 @@
+import asyncio
+import json
 import logging
+import os
+import socket
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import timedelta
 from django.conf import settings
-from typing import List
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+from typing import Any, Callable, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from . import ai_metrics, ai_tokens
+from .ai_budget import prompt_budget
+from .ai_cache import build_response_cache, make_cache_key
+from .ai_resilience import CircuitBreaker, RetryPolicy, classify_error
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -15,75 +33,560 @@ logger = logging.getLogger('ai_service')
 class AIServiceError(Exception):
     pass
 
+# 서킷 브레이커가 열려 요청을 보내지 않은 경우
+class AICircuitOpenError(AIServiceError):
+    pass
+
+# 기능별 요청 기한 (초, 재시도 포함) - settings.AI_REQUEST_TIMEOUTS 로 덮어쓸 수 있음
+DEFAULT_TIMEOUTS = {
+    'title_suggest': 15,
+    'tag_suggest': 10,
+    'summary': 30,
+    'autocomplete': 30,
+    'assist_bundle': 30,
+    'summary_chunk': 30,
+    'embedding': 15,
+}
+DEFAULT_TIMEOUT = 20
+
+# AI 요청 결과 (가공된 값 + 토큰 사용량, 모델, 지연 시간)
+# - cached: 응답 캐시에서 가져온 결과 (토큰은 최초 생성 시 사용량)
+# - estimated: 실제 사용량이 없어 로컬 토크나이저로 추정한 값
+# - fallback: API 실패로 기본 응답을 사용한 결과
+@dataclass
+class AIResult:
+    value: Any = None
+    text: str = ''
+    model: str = ''
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    latency_ms: int = 0
+    cached: bool = False
+    estimated: bool = False
+    fallback: bool = False
+
+    @classmethod
+    def from_usage(cls, text: str, usage: Optional[dict], messages: List[dict], model: str, **fields) -> 'AIResult':
+        if not usage:
+            usage = ai_tokens.estimate_usage(messages, text, model)
+            fields['estimated'] = True
+        return cls(
+            text=text,
+            model=model,
+            prompt_tokens=usage['prompt_tokens'],
+            completion_tokens=usage['completion_tokens'],
+            total_tokens=usage['total_tokens'],
+            **fields,
+        )
+
+    @property
+    def usage(self) -> dict:
+        return {
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.total_tokens,
+        }
+
+    def with_value(self, value) -> 'AIResult':
+        return replace(self, value=value)
+
+# 진행 중인 단일 요청 (대기자들이 결과를 공유)
+class _InflightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# 동일 요청 병합 (single-flight)
+# 같은 키로 동시에 들어온 요청은 하나의 API 호출만 수행하고 결과를 공유함.
+# 프로세스 내부(스레드, asyncio 태스크)는 항상 병합하며, shared=True 이면
+# AIInflightLock 테이블로 워커 프로세스 간에도 병합함 (대기 측은 DB 캐시 계층에서 결과를 읽음).
+# share 가 주어지면 대기 측이 받는 결과에 적용함 (예: 공유받은 결과를 캐시 결과로 표시).
+class SingleFlight:
+    def __init__(self, shared: bool = False, lock_ttl: int = 30, wait_timeout: int = 30, poll_interval: float = 0.2):
+        self.shared = shared
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = weakref.WeakKeyDictionary()
+
+        ai_metrics.register_gauge('ai_coalesce.inflight', self.inflight_count)
+        ai_metrics.register_gauge(
+            'ai_coalesce.rate',
+            lambda: ai_metrics.ratio('ai_coalesce.follower', 'ai_coalesce.requests'),
+        )
+
+    def inflight_count(self) -> int:
+        with self._lock:
+            return len(self._calls) + sum(len(calls) for calls in self._async_calls.values())
+
+    # 스레드 경로
+    def do(self, key: str, func: Callable, fetch_shared: Optional[Callable] = None, share: Optional[Callable] = None):
+        ai_metrics.incr('ai_coalesce.requests')
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InflightCall()
+                self._calls[key] = call
+
+        if not leader:
+            ai_metrics.incr('ai_coalesce.follower')
+            if call.event.wait(self.wait_timeout):
+                if call.error:
+                    raise call.error
+                return share(call.result) if share else call.result
+            # 대표 요청이 너무 오래 걸리면 직접 호출
+            ai_metrics.incr('ai_coalesce.timeout')
+            return func()
+
+        ai_metrics.incr('ai_coalesce.leader')
+        try:
+            if self.shared and fetch_shared:
+                call.result = self._run_shared(key, func, fetch_shared)
+            else:
+                call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    # asyncio 경로 (이벤트 루프별로 병합)
+    async def ado(self, key: str, coro_func: Callable, fetch_shared: Optional[Callable] = None,
+                  share: Optional[Callable] = None):
+        ai_metrics.incr('ai_coalesce.requests')
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+        future = calls.get(key)
+
+        if future is not None:
+            ai_metrics.incr('ai_coalesce.follower')
+            try:
+                result = await asyncio.shield(future)
+                return share(result) if share else result
+            except asyncio.CancelledError:
+                # 대표 태스크만 취소된 경우 직접 호출
+                if not future.cancelled():
+                    raise
+                return await coro_func()
+
+        ai_metrics.incr('ai_coalesce.leader')
+        future = loop.create_future()
+        calls[key] = future
+        try:
+            if self.shared and fetch_shared:
+                result = await self._arun_shared(key, coro_func, fetch_shared)
+            else:
+                result = await coro_func()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없어도 경고가 남지 않도록 예외를 회수
+            future.exception()
+            raise
+        finally:
+            calls.pop(key, None)
+
+    # 프로세스 간 잠금 획득 (만료된 잠금은 정리)
+    def _acquire(self, key: str) -> bool:
+        from .models import AIInflightLock
+
+        now = timezone.now()
+        AIInflightLock.objects.filter(key=key, expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                AIInflightLock.objects.create(
+                    key=key, owner=self.owner, expires_at=now + timedelta(seconds=self.lock_ttl)
+                )
+            return True
+        except IntegrityError:
+            return False
+
+    def _release(self, key: str) -> None:
+        from .models import AIInflightLock
+
+        AIInflightLock.objects.filter(key=key, owner=self.owner).delete()
+
+    def _is_locked(self, key: str) -> bool:
+        from .models import AIInflightLock
+
+        return AIInflightLock.objects.filter(key=key, expires_at__gt=timezone.now()).exists()
+
+    def _run_shared(self, key, func, fetch_shared):
+        deadline = time.monotonic() + self.wait_timeout
+        while not self._acquire(key):
+            # 다른 프로세스가 처리 중 - 공유 캐시에 결과가 올라올 때까지 대기
+            result = fetch_shared()
+            if result is not None:
+                ai_metrics.incr('ai_coalesce.shared_follower')
+                return result
+            if time.monotonic() >= deadline or not self._is_locked(key):
+                ai_metrics.incr('ai_coalesce.shared_timeout')
+                return func()
+            time.sleep(self.poll_interval)
+
+        try:
+            return func()
+        finally:
+            self._release(key)
+
+    async def _arun_shared(self, key, coro_func, fetch_shared):
+        deadline = time.monotonic() + self.wait_timeout
+        while not await sync_to_async(self._acquire)(key):
+            result = await sync_to_async(fetch_shared)()
+            if result is not None:
+                ai_metrics.incr('ai_coalesce.shared_follower')
+                return result
+            if time.monotonic() >= deadline or not await sync_to_async(self._is_locked)(key):
+                ai_metrics.incr('ai_coalesce.shared_timeout')
+                return await coro_func()
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            return await coro_func()
+        finally:
+            await sync_to_async(self._release)(key)
+
 # OpenAI API 서비스 클래스
 class OpenAIService:
+    # API 실패 시 기본 응답
+    COMPLETION_FALLBACK = "이어서 설명하면, 이 주제에 대해 더 깊이 있게 다뤄보겠습니다. 실무에서 유용한 팁들을 공유하겠습니다."
+    TAG_FALLBACK = ["Python", "Django", "웹개발", "프로그래밍"]
+    SUMMARY_FALLBACK = "이 글의 핵심 내용을 요약한 정보입니다."
+
     def __init__(self):
         self.model = "gpt-4o-mini"
         self.max_tokens = 1000
         self.temperature = 0.7
-        
-        # API 키 확인
-        if not hasattr(settings, 'OPENAI_API_KEY') or not settings.OPENAI_API_KEY:
+
+        # 응답 캐시 (LRU + DB 계층)
+        self.cache = build_response_cache()
+
+        # 비동기 경로의 프로세스당 동시 API 호출 수 제한 (이벤트 루프별 세마포어)
+        self.max_concurrent_requests = getattr(settings, 'AI_MAX_CONCURRENT_REQUESTS', 8)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        # 동일 요청 병합
+        self.singleflight = SingleFlight(
+            shared=getattr(settings, 'AI_COALESCE_SHARED', False),
+            lock_ttl=getattr(settings, 'AI_COALESCE_LOCK_TTL', 30),
+            wait_timeout=getattr(settings, 'AI_COALESCE_WAIT_TIMEOUT', 30),
+        )
+
+        # 긴 글 map-reduce 요약 (청크 최대 토큰 수, 청크 병렬 요청 수)
+        self.map_reduce_enabled = getattr(settings, 'AI_SUMMARY_MAP_REDUCE', True)
+        self.chunk_tokens = getattr(settings, 'AI_SUMMARY_CHUNK_TOKENS', 1500)
+        self.map_concurrency = getattr(settings, 'AI_SUMMARY_MAP_CONCURRENCY', 4)
+
+        # 기능별 요청 기한, 재시도 정책, 서킷 브레이커
+        self.timeouts = {**DEFAULT_TIMEOUTS, **getattr(settings, 'AI_REQUEST_TIMEOUTS', {})}
+        self.retry_policy = RetryPolicy(
+            max_attempts=getattr(settings, 'AI_RETRY_MAX_ATTEMPTS', 3),
+            base_delay=getattr(settings, 'AI_RETRY_BASE_DELAY', 0.5),
+            max_delay=getattr(settings, 'AI_RETRY_MAX_DELAY', 4.0),
+        )
+        self.breaker = CircuitBreaker(
+            'openai',
+            failure_threshold=getattr(settings, 'AI_BREAKER_FAILURE_THRESHOLD', 0.5),
+            window_size=getattr(settings, 'AI_BREAKER_WINDOW', 20),
+            min_requests=getattr(settings, 'AI_BREAKER_MIN_REQUESTS', 5),
+            reset_timeout=getattr(settings, 'AI_BREAKER_RESET_TIMEOUT', 30),
+        )
+
+        # API 키 확인 (OPENAI_BASE_URL 로 로컬 대역 서버를 쓰는 경우 키 없이 사용)
+        base_url = getattr(settings, 'OPENAI_BASE_URL', None)
+        api_key = getattr(settings, 'OPENAI_API_KEY', None) or ('standin' if base_url else None)
+        if not api_key:
             logger.warning("OpenAI API 키가 설정되지 않았습니다. 더미 모드로 작동합니다.")
             self.dummy_mode = True
             return
-        
+
         if not OPENAI_AVAILABLE:
             logger.warning("OpenAI 라이브러리가 설치되지 않았습니다. 더미 모드로 작동합니다.")
             self.dummy_mode = True
             return
-        
+
         try:
-            # OpenAI 클라이언트 초기화
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            # OpenAI 클라이언트 초기화 (동기 + 비동기, 재시도는 직접 처리)
+            client_options = {'api_key': api_key, 'max_retries': 0}
+            if base_url:
+                client_options['base_url'] = base_url
+            self.client = OpenAI(**client_options)
+            self.async_client = AsyncOpenAI(**client_options)
             self.dummy_mode = False
-            logger.info("OpenAI API 클라이언트 초기화 완료")
+            logger.info(f"OpenAI API 클라이언트 초기화 완료{f' ({base_url})' if base_url else ''}")
         except Exception as e:
             logger.error(f"OpenAI 클라이언트 초기화 실패: {e}")
             self.dummy_mode = True
-    
-    # OpenAI API 요청 처리
-    def _make_request(self, messages: List[dict], **kwargs) -> str:
+
+    # 요청 파라미터 정리 및 캐시 키 생성 (max_tokens 는 남은 컨텍스트 길이 안으로 제한)
+    def _prepare_request(self, messages: List[dict], **kwargs) -> Tuple[dict, str]:
+        model = kwargs.get('model', self.model)
+        params = {
+            'model': model,
+            'messages': messages,
+            'max_tokens': prompt_budget.max_tokens(messages, model, kwargs.get('max_tokens', self.max_tokens)),
+            'temperature': kwargs.get('temperature', self.temperature),
+        }
+        extra = {}
+        if kwargs.get('response_format'):
+            params['response_format'] = extra['response_format'] = kwargs['response_format']
+        cache_key = make_cache_key(params['model'], messages, params['max_tokens'], params['temperature'], **extra)
+        return params, cache_key
+
+    # 응답에서 본문, 사용량, 모델명 추출
+    def _parse_response(self, response) -> Tuple[str, Optional[dict], str]:
+        content = response.choices[0].message.content.strip()
+
+        usage_data = None
+        if hasattr(response, 'usage') and response.usage:
+            usage_data = self._usage_dict(response.usage)
+
+        return content, usage_data, getattr(response, 'model', None) or ''
+
+    # 사용량 객체를 dict 로 변환하고 로깅
+    def _usage_dict(self, usage) -> dict:
+        logger.info(f"OpenAI API 사용량 - 입력: {usage.prompt_tokens}, "
+                    f"출력: {usage.completion_tokens}, "
+                    f"총합: {usage.total_tokens}")
+        return {
+            'prompt_tokens': usage.prompt_tokens,
+            'completion_tokens': usage.completion_tokens,
+            'total_tokens': usage.total_tokens,
+        }
+
+    # 캐시 항목을 결과로 변환 (사용량이 없는 이전 항목은 추정)
+    def _cached_result(self, cached: dict, params: dict, started: float) -> AIResult:
+        return AIResult.from_usage(
+            cached['content'], cached.get('usage'), params['messages'], cached.get('model') or params['model'],
+            latency_ms=int((time.monotonic() - started) * 1000), cached=True,
+        )
+
+    # API 실패 시 기본 응답 결과 (사용량은 로컬 추정)
+    def _fallback_result(self, messages: List[dict], value) -> AIResult:
+        text = value if isinstance(value, str) else '\n'.join(value)
+        result = AIResult.from_usage(text, None, messages, self.model, fallback=True)
+        return result.with_value(value)
+
+    # API 예외를 서비스 예외로 변환 (openai 예외 타입으로 분류)
+    def _raise_service_error(self, e: Exception):
+        if isinstance(e, AIServiceError):
+            raise e
+        kind = classify_error(e)
+        logger.error(f"OpenAI API 요청 실패 ({kind.name}): {e}")
+        raise AIServiceError(kind.message) from e
+
+    def timeout_for(self, feature: str) -> float:
+        return self.timeouts.get(feature, DEFAULT_TIMEOUT)
+
+    # 서킷 브레이커 + 기한 + 재시도를 적용한 API 호출 (call: 남은 기한(초)을 받아 응답 반환)
+    def _call_provider(self, feature: str, call: Callable):
+        ticket = self.breaker.acquire()
+        if ticket is None:
+            raise AICircuitOpenError("AI 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.")
+
+        # 취소(CancelledError) 등으로 결과를 기록하지 못하고 끝나도 시험 요청은 반환
+        try:
+            deadline = time.monotonic() + self.timeout_for(feature)
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    response = call(max(deadline - time.monotonic(), 0.1))
+                except Exception as e:
+                    kind = classify_error(e)
+                    delay = self.retry_policy.delay(attempt, kind, e, deadline - time.monotonic())
+                    if delay is not None:
+                        ai_metrics.incr(f'ai_retry.{kind.name}')
+                        logger.warning(f"OpenAI API 재시도 ({attempt}회 실패, {kind.name}) - {delay:.2f}초 후")
+                        time.sleep(delay)
+                        continue
+                    self._record_outcome(kind)
+                    self._raise_service_error(e)
+
+                self.breaker.record_success()
+                return response
+        finally:
+            self.breaker.release(ticket)
+
+    async def _acall_provider(self, feature: str, call: Callable):
+        ticket = self.breaker.acquire()
+        if ticket is None:
+            raise AICircuitOpenError("AI 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.")
+
+        # 취소(CancelledError) 등으로 결과를 기록하지 못하고 끝나도 시험 요청은 반환
+        try:
+            deadline = time.monotonic() + self.timeout_for(feature)
+            attempt = 0
+            while True:
+                attempt += 1
+                remaining = max(deadline - time.monotonic(), 0.1)
+                try:
+                    response = await asyncio.wait_for(call(remaining), remaining)
+                except Exception as e:
+                    kind = classify_error(e)
+                    delay = self.retry_policy.delay(attempt, kind, e, deadline - time.monotonic())
+                    if delay is not None:
+                        ai_metrics.incr(f'ai_retry.{kind.name}')
+                        logger.warning(f"OpenAI API 재시도 ({attempt}회 실패, {kind.name}) - {delay:.2f}초 후")
+                        await asyncio.sleep(delay)
+                        continue
+                    self._record_outcome(kind)
+                    self._raise_service_error(e)
+
+                self.breaker.record_success()
+                return response
+        finally:
+            self.breaker.release(ticket)
+
+    # 공급자 장애로 볼 수 있는 오류만 실패로 집계 (잘못된 요청 등은 응답을 받은 것으로 처리)
+    def _record_outcome(self, kind):
+        if kind.counts:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    # 현재 이벤트 루프의 동시 호출 슬롯 확보
+    @asynccontextmanager
+    async def _async_slot(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._semaphores[loop] = semaphore
+
+        async with semaphore:
+            yield
+
+    # OpenAI API 요청 처리 - 사용량이 포함된 AIResult 반환
+    def _complete(self, messages: List[dict], feature: str = '', use_cache: bool = True, **kwargs) -> AIResult:
         if self.dummy_mode:
             raise AIServiceError("AI 서비스를 사용할 수 없습니다. 관리자에게 문의하세요.")
 
+        started = time.monotonic()
+        params, cache_key = self._prepare_request(messages, **kwargs)
+
+        # 동일한 요청은 캐시된 응답 재사용 (다시 추천 요청 시 우회)
+        if self.cache and use_cache:
+            cached = self.cache.get(cache_key, feature)
+            if cached is not None:
+                logger.info(f"AI 응답 캐시 적중 - 기능: {feature or '-'}")
+                return self._cached_result(cached, params, started)
+
+        # 동시에 들어온 동일 요청은 한 번만 호출
         try:
-            response = self.client.chat.completions.create(
-                model=kwargs.get('model', self.model),
-                messages=messages,
-                max_tokens=kwargs.get('max_tokens', self.max_tokens),
-                temperature=kwargs.get('temperature', self.temperature),
+            return self.singleflight.do(
+                cache_key,
+                lambda: self._request_provider(params, cache_key, feature),
+                fetch_shared=self._shared_fetcher(cache_key, params, use_cache),
+                share=self._shared_result,
             )
-            content = response.choices[0].message.content.strip()
+        except AICircuitOpenError:
+            # 차단 중에는 '다시 추천' 요청이라도 캐시된 응답이 있으면 제공
+            cached = self.cache.get(cache_key, feature) if self.cache and not use_cache else None
+            if cached is None:
+                raise
+            return self._cached_result(cached, params, started)
 
-            # 사용량 로깅
-            if hasattr(response, 'usage') and response.usage:
-                usage = response.usage
-                logger.info(f"OpenAI API 사용량 - 입력: {usage.prompt_tokens}, "
-                            f"출력: {usage.completion_tokens}, "
-                            f"총합: {usage.total_tokens}")
+    # 실제 API 호출 후 캐시에 저장
+    def _request_provider(self, params: dict, cache_key: str, feature: str) -> AIResult:
+        started = time.monotonic()
+        response = self._call_provider(
+            feature, lambda timeout: self.client.chat.completions.create(**params, timeout=timeout)
+        )
+        try:
+            content, usage_data, model = self._parse_response(response)
+        except Exception as e:
+            self._raise_service_error(e)
 
-            return content
+        return self._provider_result(params, cache_key, feature, content, usage_data, model, started)
 
+    async def _arequest_provider(self, params: dict, cache_key: str, feature: str) -> AIResult:
+        async with self._async_slot():
+            started = time.monotonic()
+            response = await self._acall_provider(
+                feature, lambda timeout: self.async_client.chat.completions.create(**params, timeout=timeout)
+            )
+        try:
+            content, usage_data, model = self._parse_response(response)
         except Exception as e:
-            error_msg = str(e)
-            logger.error(f"OpenAI API 요청 실패: {error_msg}")
-
-            if "rate_limit" in error_msg.lower():
-                raise AIServiceError("API 사용량 한도를 초과했습니다. 잠시 후 다시 시도해주세요.")
-            elif "authentication" in error_msg.lower():
-                raise AIServiceError("API 인증에 실패했습니다.")
-            elif "insufficient_quota" in error_msg.lower():
-                raise AIServiceError("API 크레딧이 부족합니다.")
-            else:
-                raise AIServiceError("AI 서비스 일시 오류입니다. 다시 시도해주세요.")
+            self._raise_service_error(e)
 
-    # 글 내용을 바탕으로 제목 추천
-    def generate_title_suggestions(self, content: str, count: int = 5) -> List[str]:    
-        if len(content) > 1000:
-            content = content[:1000] + "..."
-        
-        messages = [
+        return await sync_to_async(self._provider_result)(params, cache_key, feature, content, usage_data, model, started)
+
+    # API 응답을 결과로 변환하고 캐시에 저장
+    def _provider_result(self, params, cache_key, feature, content, usage_data, model, started) -> AIResult:
+        model = model or params['model']
+        latency_ms = int((time.monotonic() - started) * 1000)
+
+        if self.cache and content:
+            self.cache.set(cache_key, {'content': content, 'usage': usage_data, 'model': model}, feature)
+
+        return AIResult.from_usage(content, usage_data, params['messages'], model, latency_ms=latency_ms)
+
+    # 병합되어 다른 요청의 결과를 받은 경우 (API 사용량이 발생하지 않았으므로 캐시 결과로 표시)
+    def _shared_result(self, result: AIResult) -> AIResult:
+        return replace(result, cached=True)
+
+    # 다른 프로세스가 처리한 결과를 공유 캐시 계층에서 읽는 함수
+    def _shared_fetcher(self, cache_key: str, params: dict, use_cache: bool) -> Optional[Callable]:
+        if not (self.cache and use_cache):
+            return None
+
+        started = time.monotonic()
+
+        def fetch():
+            cached = self.cache.get_shared(cache_key)
+            return self._cached_result(cached, params, started) if cached else None
+
+        return fetch
+
+    # OpenAI API 비동기 요청 처리 (ASGI 경로)
+    async def _acomplete(self, messages: List[dict], feature: str = '', use_cache: bool = True, **kwargs) -> AIResult:
+        if self.dummy_mode:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다. 관리자에게 문의하세요.")
+
+        started = time.monotonic()
+        params, cache_key = self._prepare_request(messages, **kwargs)
+
+        if self.cache and use_cache:
+            cached = await sync_to_async(self.cache.get)(cache_key, feature)
+            if cached is not None:
+                logger.info(f"AI 응답 캐시 적중 - 기능: {feature or '-'}")
+                return self._cached_result(cached, params, started)
+
+        try:
+            return await self.singleflight.ado(
+                cache_key,
+                lambda: self._arequest_provider(params, cache_key, feature),
+                fetch_shared=self._shared_fetcher(cache_key, params, use_cache),
+                share=self._shared_result,
+            )
+        except AICircuitOpenError:
+            cached = await sync_to_async(self.cache.get)(cache_key, feature) if self.cache and not use_cache else None
+            if cached is None:
+                raise
+            return self._cached_result(cached, params, started)
+
+    # 제목 추천 프롬프트
+    def _title_messages(self, content: str, count: int) -> List[dict]:
+        content = prompt_budget.fit(content, 'title_suggest', self.model)
+
+        return [
             {
                 "role": "system",
                 "content": "당신은 한국어 블로그 제목을 추천하는 전문가입니다. 매력적이고 클릭하고 싶은 제목을 한국어로 제안해주세요."
@@ -106,35 +609,59 @@ class OpenAIService:
 """
             }
         ]
-        
+
+    # 제목 추천 응답 정제
+    def _parse_titles(self, response: str, count: int) -> List[str]:
+        titles = [title.strip() for title in response.split('\n') if title.strip()]
+
+        # 빈 제목이나 번호가 포함된 제목 제거
+        clean_titles = []
+        for title in titles:
+            if title and not title[0].isdigit() and len(title) > 5:
+                clean_titles.append(title)
+
+        return clean_titles[:count] if clean_titles else ["AI 추천 제목을 생성할 수 없습니다"]
+
+    def _title_fallback(self, content: str) -> List[str]:
+        return [f"📝 {content[:20]}...에 대한 완벽 가이드", f"🚀 {content[:15]}... 시작하기"]
+
+    # 글 내용을 바탕으로 제목 추천
+    def generate_title_suggestions(self, content: str, count: int = 5, use_cache: bool = True) -> AIResult:
+        messages = self._title_messages(content, count)
+
         try:
-            response = self._make_request(messages, max_tokens=200)
-            titles = [title.strip() for title in response.split('\n') if title.strip()]
-            
-            # 빈 제목이나 번호가 포함된 제목 제거
-            clean_titles = []
-            for title in titles:
-                if title and not title[0].isdigit() and len(title) > 5:
-                    clean_titles.append(title)
-            
-            return clean_titles[:count] if clean_titles else ["AI 추천 제목을 생성할 수 없습니다"]
-        
+            result = self._complete(messages, feature='title_suggest', use_cache=use_cache, max_tokens=200)
+            return result.with_value(self._parse_titles(result.text, count))
+
         except Exception as e:
             logger.error(f"제목 추천 생성 실패: {e}")
-            return [f"📝 {content[:20]}...에 대한 완벽 가이드", f"🚀 {content[:15]}... 시작하기"]
-    
-    # 글 자동완성
-    def generate_content_completion(self, partial_content: str, style: str = "friendly") -> str:
+            return self._fallback_result(messages, self._title_fallback(content))
+
+    async def agenerate_title_suggestions(self, content: str, count: int = 5, use_cache: bool = True) -> AIResult:
+        messages = self._title_messages(content, count)
+
+        try:
+            result = await self._acomplete(messages, feature='title_suggest', use_cache=use_cache, max_tokens=200)
+            return result.with_value(self._parse_titles(result.text, count))
+
+        except Exception as e:
+            logger.error(f"제목 추천 생성 실패: {e}")
+            return self._fallback_result(messages, self._title_fallback(content))
+
+    # 자동완성 프롬프트
+    def _completion_messages(self, partial_content: str, style: str) -> List[dict]:
         style_prompts = {
             "friendly": "친근하고 대화하는 듯한 톤으로",
             "professional": "전문적이고 격식있는 톤으로",
             "casual": "캐주얼하고 편안한 톤으로",
             "informative": "정보 전달에 집중하는 톤으로"
         }
-        
+
         style_instruction = style_prompts.get(style, style_prompts["friendly"])
-        
-        messages = [
+        # 이어쓰기는 글의 끝부분이 중요하므로 뒤쪽을 남김
+        partial_content = prompt_budget.fit(partial_content, 'autocomplete', self.model, tail=True)
+
+        return [
             {
                 "role": "system",
                 "content": f"당신은 한국어 블로그 글쓰기를 도와주는 AI 어시스턴트입니다. {style_instruction} 글을 자연스럽게 이어서 작성해주세요."
@@ -155,22 +682,124 @@ class OpenAIService:
 """
             }
         ]
-        
+
+    # 글 자동완성
+    def generate_content_completion(self, partial_content: str, style: str = "friendly", use_cache: bool = True) -> AIResult:
+        messages = self._completion_messages(partial_content, style)
+
         try:
-            completion = self._make_request(messages, max_tokens=500)
-            return completion if completion else "자동완성을 생성할 수 없습니다."
-        
+            result = self._complete(messages, feature='autocomplete', use_cache=use_cache, max_tokens=500)
+            return result.with_value(result.text if result.text else "자동완성을 생성할 수 없습니다.")
+
         except Exception as e:
             logger.error(f"내용 자동완성 생성 실패: {e}")
-            return "이어서 설명하면, 이 주제에 대해 더 깊이 있게 다뤄보겠습니다. 실무에서 유용한 팁들을 공유하겠습니다."
-    
-    # 제목과 내용을 바탕으로 태그 추천
-    def generate_tags(self, title: str, content: str, max_tags: int = 5) -> List[str]:
-        
-        if len(content) > 800:
-            content = content[:800] + "..."
-        
-        messages = [
+            return self._fallback_result(messages, self.COMPLETION_FALLBACK)
+
+    async def agenerate_content_completion(self, partial_content: str, style: str = "friendly", use_cache: bool = True) -> AIResult:
+        messages = self._completion_messages(partial_content, style)
+
+        try:
+            result = await self._acomplete(messages, feature='autocomplete', use_cache=use_cache, max_tokens=500)
+            return result.with_value(result.text if result.text else "자동완성을 생성할 수 없습니다.")
+
+        except Exception as e:
+            logger.error(f"내용 자동완성 생성 실패: {e}")
+            return self._fallback_result(messages, self.COMPLETION_FALLBACK)
+
+    # 글 자동완성 스트리밍 - {'type': 'delta', 'text'} 이벤트 후 마지막에 {'type': 'done', 'content', 'cached', 'result'} 이벤트를 생성
+    def stream_content_completion(self, partial_content: str, style: str = "friendly", use_cache: bool = True):
+        if self.dummy_mode:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다. 관리자에게 문의하세요.")
+
+        started = time.monotonic()
+        messages = self._completion_messages(partial_content, style)
+        params, cache_key = self._prepare_request(messages, max_tokens=500)
+
+        if self.cache and use_cache:
+            cached = self.cache.get(cache_key, 'autocomplete')
+            if cached is not None:
+                yield {'type': 'delta', 'text': cached['content']}
+                result = self._cached_result(cached, params, started).with_value(cached['content'])
+                yield {'type': 'done', 'content': cached['content'], 'cached': True, 'result': result}
+                return
+
+        stream = self._call_provider('autocomplete', lambda timeout: self.client.chat.completions.create(
+            **params, stream=True, stream_options={'include_usage': True}, timeout=timeout
+        ))
+
+        parts = []
+        usage_data = None
+        model = ''
+        try:
+            for chunk in stream:
+                model = model or getattr(chunk, 'model', None) or ''
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield {'type': 'delta', 'text': chunk.choices[0].delta.content}
+                if getattr(chunk, 'usage', None):
+                    usage_data = self._usage_dict(chunk.usage)
+        except Exception as e:
+            self._record_outcome(classify_error(e))
+            self._raise_service_error(e)
+        finally:
+            # 클라이언트 연결 종료(GeneratorExit) 시에도 API 스트림을 닫음
+            stream.close()
+
+        content = ''.join(parts).strip()
+        result = self._provider_result(params, cache_key, 'autocomplete', content, usage_data, model, started)
+        yield {'type': 'done', 'content': content, 'cached': False, 'result': result.with_value(content)}
+
+    # 글 자동완성 스트리밍 (비동기)
+    async def astream_content_completion(self, partial_content: str, style: str = "friendly", use_cache: bool = True):
+        if self.dummy_mode:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다. 관리자에게 문의하세요.")
+
+        started = time.monotonic()
+        messages = self._completion_messages(partial_content, style)
+        params, cache_key = self._prepare_request(messages, max_tokens=500)
+
+        if self.cache and use_cache:
+            cached = await sync_to_async(self.cache.get)(cache_key, 'autocomplete')
+            if cached is not None:
+                yield {'type': 'delta', 'text': cached['content']}
+                result = self._cached_result(cached, params, started).with_value(cached['content'])
+                yield {'type': 'done', 'content': cached['content'], 'cached': True, 'result': result}
+                return
+
+        parts = []
+        usage_data = None
+        model = ''
+        async with self._async_slot():
+            stream = await self._acall_provider('autocomplete', lambda timeout: self.async_client.chat.completions.create(
+                **params, stream=True, stream_options={'include_usage': True}, timeout=timeout
+            ))
+
+            try:
+                async for chunk in stream:
+                    model = model or getattr(chunk, 'model', None) or ''
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield {'type': 'delta', 'text': chunk.choices[0].delta.content}
+                    if getattr(chunk, 'usage', None):
+                        usage_data = self._usage_dict(chunk.usage)
+            except Exception as e:
+                self._record_outcome(classify_error(e))
+                self._raise_service_error(e)
+            finally:
+                # 클라이언트 연결 종료(CancelledError) 시에도 API 스트림을 닫음
+                await stream.close()
+
+        content = ''.join(parts).strip()
+        result = await sync_to_async(self._provider_result)(
+            params, cache_key, 'autocomplete', content, usage_data, model, started
+        )
+        yield {'type': 'done', 'content': content, 'cached': False, 'result': result.with_value(content)}
+
+    # 태그 추천 프롬프트
+    def _tag_messages(self, title: str, content: str, max_tags: int) -> List[dict]:
+        content = prompt_budget.fit(content, 'tag_suggest', self.model)
+
+        return [
             {
                 "role": "system",
                 "content": "당신은 한국어 블로그 태그를 추천하는 전문가입니다. 글의 주제와 내용을 분석하여 적절한 태그를 제안해주세요."
@@ -195,27 +824,47 @@ class OpenAIService:
 """
             }
         ]
-        
+
+    # 태그 추천 응답 정제
+    def _parse_tags(self, response: str, max_tags: int) -> List[str]:
+        tags = [tag.strip().replace('#', '') for tag in response.split('\n') if tag.strip()]
+
+        # 빈 태그나 너무 긴 태그 제거
+        clean_tags = []
+        for tag in tags:
+            if tag and 2 <= len(tag) <= 15 and not tag[0].isdigit():
+                clean_tags.append(tag)
+
+        return clean_tags[:max_tags] if clean_tags else ["기술", "블로그", "개발"]
+
+    # 제목과 내용을 바탕으로 태그 추천
+    def generate_tags(self, title: str, content: str, max_tags: int = 5, use_cache: bool = True) -> AIResult:
+        messages = self._tag_messages(title, content, max_tags)
+
+        try:
+            result = self._complete(messages, feature='tag_suggest', use_cache=use_cache, max_tokens=150)
+            return result.with_value(self._parse_tags(result.text, max_tags))
+
+        except Exception as e:
+            logger.error(f"태그 추천 생성 실패: {e}")
+            return self._fallback_result(messages, list(self.TAG_FALLBACK))
+
+    async def agenerate_tags(self, title: str, content: str, max_tags: int = 5, use_cache: bool = True) -> AIResult:
+        messages = self._tag_messages(title, content, max_tags)
+
         try:
-            response = self._make_request(messages, max_tokens=150)
-            tags = [tag.strip().replace('#', '') for tag in response.split('\n') if tag.strip()]
-            
-            # 빈 태그나 너무 긴 태그 제거
-            clean_tags = []
-            for tag in tags:
-                if tag and 2 <= len(tag) <= 15 and not tag[0].isdigit():
-                    clean_tags.append(tag)
-            
-            return clean_tags[:max_tags] if clean_tags else ["기술", "블로그", "개발"]
-        
+            result = await self._acomplete(messages, feature='tag_suggest', use_cache=use_cache, max_tokens=150)
+            return result.with_value(self._parse_tags(result.text, max_tags))
+
         except Exception as e:
             logger.error(f"태그 추천 생성 실패: {e}")
-            return ["Python", "Django", "웹개발", "프로그래밍"]
-    
-    # 글 요약 생성
-    def generate_summary(self, content: str, max_length: int = 200) -> str:
-        
-        messages = [
+            return self._fallback_result(messages, list(self.TAG_FALLBACK))
+
+    # 요약 프롬프트
+    def _summary_messages(self, content: str, max_length: int) -> List[dict]:
+        content = prompt_budget.fit(content, 'summary', self.model)
+
+        return [
             {
                 "role": "system",
                 "content": "당신은 한국어 글 요약 전문가입니다. 주어진 글의 핵심 내용을 간결하고 명확하게 요약해주세요."
@@ -236,19 +885,352 @@ class OpenAIService:
 """
             }
         ]
-        
+
+    # 요약 길이 제한
+    def _parse_summary(self, summary: str, max_length: int) -> str:
+        if len(summary) > max_length:
+            summary = summary[:max_length-3] + "..."
+
+        return summary if summary else "요약을 생성할 수 없습니다."
+
+    # 청크 요약 프롬프트 (map 단계)
+    def _chunk_summary_messages(self, chunk: str) -> List[dict]:
+        return [
+            {
+                "role": "system",
+                "content": "당신은 한국어 글 요약 전문가입니다. 긴 글의 일부를 받아 핵심 내용만 간결하게 요약해주세요."
+            },
+            {
+                "role": "user",
+                "content": f"""
+다음은 긴 블로그 글의 일부입니다. 이 부분의 핵심 내용을 3-5문장의 한국어로 요약해주세요:
+
+{chunk}
+
+조건:
+- 사실, 수치, 고유명사는 빠뜨리지 말 것
+- 앞뒤 맥락을 추측하지 말고 주어진 내용만 요약
+- 한국어로만 작성
+"""
+            }
+        ]
+
+    # 부분 요약 결합 프롬프트 (reduce 단계)
+    def _reduce_summary_messages(self, partials: List[str], max_length: int) -> List[dict]:
+        joined = '\n\n'.join(f"[{index}] {partial}" for index, partial in enumerate(partials, 1))
+
+        return [
+            {
+                "role": "system",
+                "content": "당신은 한국어 글 요약 전문가입니다. 주어진 글의 핵심 내용을 간결하고 명확하게 요약해주세요."
+            },
+            {
+                "role": "user",
+                "content": f"""
+다음은 한 편의 긴 글을 순서대로 나누어 요약한 내용입니다. 이를 종합해 글 전체를 {max_length}자 이내로 한국어로 요약해주세요:
+
+{joined}
+
+조건:
+- 글 전체의 핵심 메시지 포함
+- 읽기 쉽고 명확한 문장
+- 원문의 톤 유지
+- 한국어로만 작성
+- {max_length}자 이내
+"""
+            }
+        ]
+
+    # 요약 단계별 결과 합산 (토큰은 실제로 API 를 호출한 단계만 합산, 모두 캐시면 최초 사용량 합)
+    def _combine_results(self, results: List[AIResult], final: AIResult, started: float) -> AIResult:
+        fresh = [result for result in results if not result.cached]
+        counted = fresh or results
+        return replace(
+            final,
+            prompt_tokens=sum(result.prompt_tokens for result in counted),
+            completion_tokens=sum(result.completion_tokens for result in counted),
+            total_tokens=sum(result.total_tokens for result in counted),
+            latency_ms=int((time.monotonic() - started) * 1000),
+            cached=not fresh,
+            estimated=any(result.estimated for result in counted),
+        )
+
+    # 예산을 넘는 긴 글인지 여부
+    def _needs_map_reduce(self, content: str) -> bool:
+        return self.map_reduce_enabled and prompt_budget.count(content, self.model) > prompt_budget.input_budget('summary')
+
+    # 청크 요약 (map) - 청크 요약은 청크 내용 해시로 캐싱되므로 다시 요약해도 바뀐 청크만 API 호출
+    def _map_chunks(self, chunks: List[str]) -> List[AIResult]:
+        def run(chunk):
+            try:
+                return self._complete(self._chunk_summary_messages(chunk), feature='summary_chunk', max_tokens=300)
+            finally:
+                close_old_connections()
+
+        if len(chunks) == 1:
+            return [self._complete(self._chunk_summary_messages(chunks[0]), feature='summary_chunk', max_tokens=300)]
+        with ThreadPoolExecutor(max_workers=min(self.map_concurrency, len(chunks))) as executor:
+            return list(executor.map(run, chunks))
+
+    async def _amap_chunks(self, chunks: List[str]) -> List[AIResult]:
+        return list(await asyncio.gather(*(
+            self._acomplete(self._chunk_summary_messages(chunk), feature='summary_chunk', max_tokens=300)
+            for chunk in chunks
+        )))
+
+    # 결합할 부분 요약이 예산을 넘으면 부분 요약을 다시 청크로 묶어 한 단계 더 요약
+    def _reduce_input(self, partials: List[str]) -> Optional[str]:
+        joined = '\n\n'.join(partials)
+        if len(partials) > 1 and prompt_budget.count(joined, self.model) > prompt_budget.input_budget('summary'):
+            return joined
+        return None
+
+    # 긴 글 map-reduce 요약 (청크 요약을 병렬로 만든 뒤 결합)
+    def _map_reduce_summarize(self, content: str, max_length: int, use_cache: bool) -> AIResult:
+        started = time.monotonic()
+        results = []
+        text = content
+        while True:
+            chunks = prompt_budget.chunk(text, self.model, self.chunk_tokens)
+            mapped = self._map_chunks(chunks)
+            results.extend(mapped)
+            partials = [result.text for result in mapped]
+            text = self._reduce_input(partials)
+            if text is None:
+                break
+
+        ai_metrics.incr('ai_summary.map_reduce')
+        ai_metrics.incr('ai_summary.chunks', len(results))
+        ai_metrics.incr('ai_summary.chunks_cached', sum(1 for result in results if result.cached))
+        final = self._complete(self._reduce_summary_messages(partials, max_length), feature='summary',
+                               use_cache=use_cache, max_tokens=300)
+        combined = self._combine_results(results + [final], final, started)
+        return combined.with_value(self._parse_summary(final.text, max_length))
+
+    async def _amap_reduce_summarize(self, content: str, max_length: int, use_cache: bool) -> AIResult:
+        started = time.monotonic()
+        results = []
+        text = content
+        while True:
+            chunks = prompt_budget.chunk(text, self.model, self.chunk_tokens)
+            mapped = await self._amap_chunks(chunks)
+            results.extend(mapped)
+            partials = [result.text for result in mapped]
+            text = self._reduce_input(partials)
+            if text is None:
+                break
+
+        ai_metrics.incr('ai_summary.map_reduce')
+        ai_metrics.incr('ai_summary.chunks', len(results))
+        ai_metrics.incr('ai_summary.chunks_cached', sum(1 for result in results if result.cached))
+        final = await self._acomplete(self._reduce_summary_messages(partials, max_length), feature='summary',
+                                      use_cache=use_cache, max_tokens=300)
+        combined = self._combine_results(results + [final], final, started)
+        return combined.with_value(self._parse_summary(final.text, max_length))
+
+    # 글 요약 생성 (실패 시 AIServiceError - 백그라운드 작업의 재시도 판단용)
+    # 입력 예산을 넘는 긴 글은 map-reduce 요약 (다시 요약 요청 시에도 청크 요약 캐시는 재사용하고 결합 단계만 새로 생성)
+    def summarize(self, content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
+        if self._needs_map_reduce(content):
+            return self._map_reduce_summarize(content, max_length, use_cache)
+
+        messages = self._summary_messages(content, max_length)
+        result = self._complete(messages, feature='summary', use_cache=use_cache, max_tokens=300)
+        return result.with_value(self._parse_summary(result.text, max_length))
+
+    async def asummarize(self, content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
+        if self._needs_map_reduce(content):
+            return await self._amap_reduce_summarize(content, max_length, use_cache)
+
+        messages = self._summary_messages(content, max_length)
+        result = await self._acomplete(messages, feature='summary', use_cache=use_cache, max_tokens=300)
+        return result.with_value(self._parse_summary(result.text, max_length))
+
+    # 글 요약 생성
+    def generate_summary(self, content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
+        try:
+            return self.summarize(content, max_length, use_cache=use_cache)
+
+        except Exception as e:
+            logger.error(f"요약 생성 실패: {e}")
+            return self._fallback_result(self._summary_messages(content, max_length), self.SUMMARY_FALLBACK)
+
+    async def agenerate_summary(self, content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
         try:
-            summary = self._make_request(messages, max_tokens=300)
-            
-            # 길이 제한
-            if len(summary) > max_length:
-                summary = summary[:max_length-3] + "..."
-            
-            return summary if summary else "요약을 생성할 수 없습니다."
-        
+            return await self.asummarize(content, max_length, use_cache=use_cache)
+
         except Exception as e:
             logger.error(f"요약 생성 실패: {e}")
-            return "이 글의 핵심 내용을 요약한 정보입니다."
+            return self._fallback_result(self._summary_messages(content, max_length), self.SUMMARY_FALLBACK)
+
+    # 제목/태그/요약 일괄 추천 프롬프트 (JSON 응답)
+    def _bundle_messages(self, title: str, content: str, title_count: int, max_tags: int, max_length: int) -> List[dict]:
+        content = prompt_budget.fit(content, 'assist_bundle', self.model)
+
+        return [
+            {
+                "role": "system",
+                "content": "당신은 한국어 블로그 글쓰기 도우미입니다. 글을 분석하여 제목, 태그, 요약을 한 번에 제안하고 반드시 JSON 객체로만 응답해주세요."
+            },
+            {
+                "role": "user",
+                "content": f"""
+다음 블로그 글을 바탕으로 아래 JSON 형식에 맞춰 응답해주세요.
+
+{{"titles": ["제목", ...], "tags": ["태그", ...], "summary": "요약"}}
+
+현재 제목: {title or '(없음)'}
+
+글 내용:
+{content}
+
+조건:
+- titles: 매력적인 한국어 제목 {title_count}개, 각 50자 이내, 번호나 특수문자 없이
+- tags: 검색에 도움이 되는 태그 {max_tags}개, 각 2-10자, 해시태그 없이 단어만
+- summary: 글의 핵심 메시지를 {max_length}자 이내의 한국어로 요약
+- JSON 외의 다른 텍스트는 포함하지 말 것
+"""
+            }
+        ]
+
+    # 일괄 추천 JSON 응답 파싱 - 실패 시 ValueError
+    def _parse_bundle(self, response: str, title_count: int, max_tags: int, max_length: int) -> dict:
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 파싱 실패: {e}")
+
+        titles = data.get('titles') if isinstance(data, dict) else None
+        tags = data.get('tags') if isinstance(data, dict) else None
+        summary = data.get('summary') if isinstance(data, dict) else None
+        if not isinstance(titles, list) or not isinstance(tags, list) or not isinstance(summary, str):
+            raise ValueError("응답 형식이 올바르지 않습니다.")
+
+        # 개별 기능과 동일한 정제 규칙 적용
+        return {
+            'titles': self._parse_titles('\n'.join(str(t) for t in titles), title_count),
+            'tags': self._parse_tags('\n'.join(str(t) for t in tags), max_tags),
+            'summary': self._parse_summary(summary.strip(), max_length),
+        }
+
+    # 일괄 요청 사용량을 기능별 결과로 배분 (입력 토큰은 균등, 출력 토큰은 결과 길이 비율)
+    def _split_bundle_result(self, parsed: dict, result: AIResult) -> dict:
+        features = ['title_suggest', 'tag_suggest', 'summary']
+        values = [parsed['titles'], parsed['tags'], parsed['summary']]
+        lengths = [
+            len(''.join(parsed['titles'])),
+            len(''.join(parsed['tags'])),
+            len(parsed['summary']),
+        ]
+        total_length = sum(lengths) or 1
+
+        split = {}
+        prompt_left = result.prompt_tokens
+        completion_left = result.completion_tokens
+        for index, feature in enumerate(features):
+            if index == len(features) - 1:
+                prompt, completion = prompt_left, completion_left
+            else:
+                prompt = result.prompt_tokens // len(features)
+                completion = result.completion_tokens * lengths[index] // total_length
+            prompt_left -= prompt
+            completion_left -= completion
+            split[feature] = replace(
+                result,
+                value=values[index],
+                prompt_tokens=prompt,
+                completion_tokens=completion,
+                total_tokens=prompt + completion,
+            )
+        return split
+
+    # 제목/태그/요약을 한 번의 요청으로 생성
+    # 반환: {'titles', 'tags', 'summary', 'results': {기능: AIResult}, 'bundled': bool}
+    def generate_assist_bundle(self, title: str, content: str, title_count: int = 4, max_tags: int = 5,
+                               max_length: int = 200, use_cache: bool = True) -> dict:
+        messages = self._bundle_messages(title, content, title_count, max_tags, max_length)
+
+        try:
+            response = self._complete(
+                messages, feature='assist_bundle', use_cache=use_cache,
+                max_tokens=600, response_format={'type': 'json_object'},
+            )
+            bundle = self._parse_bundle(response.text, title_count, max_tags, max_length)
+            bundle['results'] = self._split_bundle_result(bundle, response)
+            bundle['bundled'] = True
+            return bundle
+
+        except Exception as e:
+            logger.error(f"일괄 추천 생성 실패, 개별 요청으로 대체: {e}")
+
+        # 개별 프롬프트로 대체
+        results = {
+            'title_suggest': self.generate_title_suggestions(content, title_count, use_cache=use_cache),
+            'tag_suggest': self.generate_tags(title, content, max_tags, use_cache=use_cache),
+            'summary': self.generate_summary(content, max_length, use_cache=use_cache),
+        }
+        return self._bundle_from_results(results)
+
+    async def agenerate_assist_bundle(self, title: str, content: str, title_count: int = 4, max_tags: int = 5,
+                                      max_length: int = 200, use_cache: bool = True) -> dict:
+        messages = self._bundle_messages(title, content, title_count, max_tags, max_length)
+
+        try:
+            response = await self._acomplete(
+                messages, feature='assist_bundle', use_cache=use_cache,
+                max_tokens=600, response_format={'type': 'json_object'},
+            )
+            bundle = self._parse_bundle(response.text, title_count, max_tags, max_length)
+            bundle['results'] = self._split_bundle_result(bundle, response)
+            bundle['bundled'] = True
+            return bundle
+
+        except Exception as e:
+            logger.error(f"일괄 추천 생성 실패, 개별 요청으로 대체: {e}")
+
+        # 개별 프롬프트로 대체 (동시 요청)
+        title_result, tag_result, summary_result = await asyncio.gather(
+            self.agenerate_title_suggestions(content, title_count, use_cache=use_cache),
+            self.agenerate_tags(title, content, max_tags, use_cache=use_cache),
+            self.agenerate_summary(content, max_length, use_cache=use_cache),
+        )
+        return self._bundle_from_results({
+            'title_suggest': title_result,
+            'tag_suggest': tag_result,
+            'summary': summary_result,
+        })
+
+    def _bundle_from_results(self, results: dict) -> dict:
+        return {
+            'titles': results['title_suggest'].value,
+            'tags': results['tag_suggest'].value,
+            'summary': results['summary'].value,
+            'results': results,
+            'bundled': False,
+        }
+
+    # 임베딩 벡터 생성 (의미 검색용, 입력 순서대로 반환)
+    def embed(self, texts: List[str], model: str = 'text-embedding-3-small', dimensions: Optional[int] = None) -> List[List[float]]:
+        if self.dummy_mode:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다. 관리자에게 문의하세요.")
+
+        params = {'model': model, 'input': texts}
+        if dimensions:
+            params['dimensions'] = dimensions
+
+        response = self._call_provider(
+            'embedding', lambda timeout: self.client.embeddings.create(**params, timeout=timeout)
+        )
+        try:
+            vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            self._raise_service_error(e)
+
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            ai_metrics.incr('ai_embedding.tokens', getattr(usage, 'total_tokens', 0) or 0)
+        ai_metrics.incr('ai_embedding.requests')
+        return vectors
 
 # 싱글톤 인스턴스
 try:
@@ -259,25 +1241,73 @@ except Exception as e:
     ai_service = None
 
 # 제목 추천 가져오기
-def get_title_suggestions(content: str, count: int = 3) -> List[str]:
+def get_title_suggestions(content: str, count: int = 3, use_cache: bool = True) -> AIResult:
     if not ai_service:
-        return ["제목을 생성할 수 없습니다"]
-    return ai_service.generate_title_suggestions(content, count)
+        return AIResult(value=["제목을 생성할 수 없습니다"], fallback=True)
+    return ai_service.generate_title_suggestions(content, count, use_cache=use_cache)
 
 # 내용 자동완성 가져오기
-def get_content_completion(partial_content: str, style: str = "friendly") -> str:
+def get_content_completion(partial_content: str, style: str = "friendly", use_cache: bool = True) -> AIResult:
     if not ai_service:
-        return "자동완성을 사용할 수 없습니다."
-    return ai_service.generate_content_completion(partial_content, style)
+        return AIResult(value="자동완성을 사용할 수 없습니다.", fallback=True)
+    return ai_service.generate_content_completion(partial_content, style, use_cache=use_cache)
+
+# 내용 자동완성 스트리밍
+def stream_content_completion(partial_content: str, style: str = "friendly", use_cache: bool = True):
+    if not ai_service:
+        raise AIServiceError("자동완성을 사용할 수 없습니다.")
+    return ai_service.stream_content_completion(partial_content, style, use_cache=use_cache)
 
 # 태그 추천 가져오기
-def get_tag_suggestions(title: str, content: str, max_tags: int = 5) -> List[str]:
+def get_tag_suggestions(title: str, content: str, max_tags: int = 5, use_cache: bool = True) -> AIResult:
     if not ai_service:
-        return ["태그", "추천", "불가"]
-    return ai_service.generate_tags(title, content, max_tags)
+        return AIResult(value=["태그", "추천", "불가"], fallback=True)
+    return ai_service.generate_tags(title, content, max_tags, use_cache=use_cache)
 
 # 내용 요약 가져오기
-def get_content_summary(content: str, max_length: int = 200) -> str:
+def get_content_summary(content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
+    if not ai_service:
+        return AIResult(value="요약을 사용할 수 없습니다.", fallback=True)
+    return ai_service.generate_summary(content, max_length, use_cache=use_cache)
+
+# 제목 추천 가져오기 (비동기)
+async def aget_title_suggestions(content: str, count: int = 3, use_cache: bool = True) -> AIResult:
+    if not ai_service:
+        return AIResult(value=["제목을 생성할 수 없습니다"], fallback=True)
+    return await ai_service.agenerate_title_suggestions(content, count, use_cache=use_cache)
+
+# 내용 자동완성 가져오기 (비동기)
+async def aget_content_completion(partial_content: str, style: str = "friendly", use_cache: bool = True) -> AIResult:
+    if not ai_service:
+        return AIResult(value="자동완성을 사용할 수 없습니다.", fallback=True)
+    return await ai_service.agenerate_content_completion(partial_content, style, use_cache=use_cache)
+
+# 내용 자동완성 스트리밍 (비동기)
+def astream_content_completion(partial_content: str, style: str = "friendly", use_cache: bool = True):
+    if not ai_service:
+        raise AIServiceError("자동완성을 사용할 수 없습니다.")
+    return ai_service.astream_content_completion(partial_content, style, use_cache=use_cache)
+
+# 태그 추천 가져오기 (비동기)
+async def aget_tag_suggestions(title: str, content: str, max_tags: int = 5, use_cache: bool = True) -> AIResult:
+    if not ai_service:
+        return AIResult(value=["태그", "추천", "불가"], fallback=True)
+    return await ai_service.agenerate_tags(title, content, max_tags, use_cache=use_cache)
+
+# 내용 요약 가져오기 (비동기)
+async def aget_content_summary(content: str, max_length: int = 200, use_cache: bool = True) -> AIResult:
+    if not ai_service:
+        return AIResult(value="요약을 사용할 수 없습니다.", fallback=True)
+    return await ai_service.agenerate_summary(content, max_length, use_cache=use_cache)
+
+# 제목/태그/요약 일괄 추천 가져오기
+def get_assist_bundle(title: str, content: str, use_cache: bool = True) -> Optional[dict]:
+    if not ai_service:
+        return None
+    return ai_service.generate_assist_bundle(title, content, use_cache=use_cache)
+
+# 제목/태그/요약 일괄 추천 가져오기 (비동기)
+async def aget_assist_bundle(title: str, content: str, use_cache: bool = True) -> Optional[dict]:
     if not ai_service:
-        return "요약을 사용할 수 없습니다."
-    return ai_service.generate_summary(content, max_length)
\ No newline at end of file
+        return None
+    return await ai_service.agenerate_assist_bundle(title, content, use_cache=use_cache)
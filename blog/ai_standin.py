@@ -0,0 +1,214 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import ai_tokens
+
+logger = logging.getLogger('ai_service')
+
+# 응답 본문 생성용 문장 (요청 내용 해시로 선택하므로 같은 요청은 항상 같은 응답)
+SENTENCES = [
+    "처음 시작할 때는 작은 예제부터 직접 만들어 보는 것이 가장 빠릅니다.",
+    "실무에서는 설정을 환경 변수로 분리해 두면 배포가 훨씬 편해집니다.",
+    "자주 쓰는 코드는 함수로 묶어 두면 유지보수가 쉬워집니다.",
+    "문제가 생기면 로그를 먼저 확인하는 습관을 들이는 것이 좋습니다.",
+    "테스트 데이터를 미리 준비해 두면 기능을 검증하는 시간이 줄어듭니다.",
+    "성능 문제는 측정한 뒤에 개선하는 것이 원칙입니다.",
+    "공식 문서를 함께 읽으면 동작 원리를 더 깊이 이해할 수 있습니다.",
+    "처음부터 완벽하게 만들기보다 동작하는 버전을 먼저 완성해 보세요.",
+]
+TITLES = [
+    "초보자도 따라 하는 {k} 완벽 가이드",
+    "{k}, 이것만 알면 충분합니다",
+    "실무에서 바로 쓰는 {k} 노하우",
+    "아무도 알려주지 않았던 {k}의 비밀",
+    "{k} 시작하기 전에 꼭 알아야 할 것들",
+    "하루 만에 끝내는 {k} 핵심 정리",
+]
+TAGS = ["Python", "Django", "웹개발", "프로그래밍", "튜토리얼", "백엔드", "개발팁", "블로그"]
+
+
+# 대역 서버 동작 설정
+@dataclass
+class StandinConfig:
+    # 응답 지연 (로그 정규분포: 중앙값 latency_ms, 분산 latency_sigma)
+    latency_ms: float = 300.0
+    latency_sigma: float = 0.5
+    # 500 오류 / 429 응답 비율
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    # 스트리밍 시 초당 출력 토큰 수
+    tokens_per_second: float = 50.0
+    model: str = 'gpt-4o-mini-standin'
+    seed: int = 0
+
+
+# 요청 메시지로부터 결정적인 응답 본문 생성
+def build_content(body: dict) -> str:
+    messages = body.get('messages') or []
+    system = (messages[0].get('content') or '') if messages else ''
+    prompt = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+    rng = random.Random(digest)
+    keyword = rng.choice(["Django", "파이썬", "웹 개발", "블로그 운영", "API 설계"])
+
+    if (body.get('response_format') or {}).get('type') == 'json_object':
+        return json.dumps({
+            'titles': [title.format(k=keyword) for title in rng.sample(TITLES, 4)],
+            'tags': rng.sample(TAGS, 5),
+            'summary': ' '.join(rng.sample(SENTENCES, 2)),
+        }, ensure_ascii=False)
+    if '제목' in system:
+        return '\n'.join(title.format(k=keyword) for title in rng.sample(TITLES, 4))
+    if '태그' in system:
+        return '\n'.join(rng.sample(TAGS, 5))
+    if '요약' in system:
+        return ' '.join(rng.sample(SENTENCES, 2))
+    return '\n\n'.join(' '.join(rng.sample(SENTENCES, 3)) for _ in range(2))
+
+
+def usage_for(body: dict, content: str, model: str) -> dict:
+    return ai_tokens.estimate_usage(body.get('messages') or [], content, model)
+
+
+# OpenAI chat completions API 대역 서버 핸들러
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = StandinConfig()
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+    counter = 0
+
+    def log_message(self, format, *args):
+        logger.debug(f"standin {self.address_string()} {format % args}")
+
+    def _random(self):
+        with self.rng_lock:
+            return self.rng.random(), self.rng.lognormvariate(0, self.config.latency_sigma)
+
+    def _next_id(self) -> str:
+        with self.rng_lock:
+            type(self).counter += 1
+            return f"chatcmpl-standin-{type(self).counter}"
+
+    def _send_json(self, status: int, payload: dict, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, error_type: str, code=None, headers=None):
+        self._send_json(status, {'error': {'message': message, 'type': error_type, 'param': None, 'code': code}}, headers)
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._error(404, f"Unknown path: {self.path}", 'invalid_request_error')
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._error(400, "Invalid JSON body", 'invalid_request_error')
+            return
+
+        roll, latency_factor = self._random()
+        config = self.config
+        latency = config.latency_ms * latency_factor / 1000
+
+        if roll < config.rate_limit_rate:
+            self._error(429, "Rate limit reached (standin)", 'requests', code='rate_limit_exceeded',
+                        headers={'Retry-After': str(config.retry_after)})
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            time.sleep(latency)
+            self._error(500, "Internal server error (standin)", 'server_error')
+            return
+
+        model = body.get('model') or config.model
+        content = build_content(body)
+        usage = usage_for(body, content, model)
+
+        if body.get('stream'):
+            self._stream(body, content, usage, model, latency)
+            return
+
+        time.sleep(latency)
+        self._send_json(200, {
+            'id': self._next_id(),
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': usage,
+        })
+
+    # SSE 스트리밍 응답 (첫 토큰까지 latency, 이후 tokens_per_second 속도)
+    def _stream(self, body, content, usage, model, latency):
+        completion_id = self._next_id()
+        created = int(time.time())
+
+        def chunk(delta, finish_reason=None, with_usage=False):
+            payload = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [] if with_usage else [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            if with_usage:
+                payload['usage'] = usage
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        time.sleep(latency)
+        # 약 4글자 단위로 나누어 전송
+        pieces = [content[i:i + 4] for i in range(0, len(content), 4)]
+        interval = 1 / max(self.config.tokens_per_second, 1.0)
+        try:
+            self.wfile.write(chunk({'role': 'assistant', 'content': ''}))
+            for piece in pieces:
+                self.wfile.write(chunk({'content': piece}))
+                self.wfile.flush()
+                time.sleep(interval)
+            self.wfile.write(chunk({}, finish_reason='stop'))
+            if (body.get('stream_options') or {}).get('include_usage'):
+                self.wfile.write(chunk(None, with_usage=True))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("standin 스트림 클라이언트 연결 종료")
+
+
+# 대역 서버 생성 (설정별 핸들러 클래스)
+def make_server(host: str, port: int, config: StandinConfig) -> ThreadingHTTPServer:
+    handler = type('ConfiguredStandinHandler', (StandinHandler,), {
+        'config': config,
+        'rng': random.Random(config.seed),
+        'rng_lock': threading.Lock(),
+        'counter': 0,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
@@ -0,0 +1,92 @@
+import json
+import logging
+import time
+from django.http import StreamingHttpResponse
+from .ai_service import AIResult, AIServiceError, ai_service, stream_content_completion, astream_content_completion
+from .ai_usage import usage_recorder
+
+logger = logging.getLogger(__name__)
+
+
+# SSE 프레임 생성
+def sse_event(event: str, data: dict) -> str:
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+# text/event-stream 응답 생성 (프록시 버퍼링 비활성화)
+def sse_response(stream) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# 스트림 종료 후 사용량 기록 (done 이벤트 전에 연결이 끊기면 로컬 토크나이저로 추정)
+# 추정 시 입력 토큰은 실제로 보낸 메시지(시스템 프롬프트 + 예산에 맞춘 글 내용) 기준
+# buffered: 비동기 스트림에서는 True (이벤트 루프에서 DB 접근 없음)
+def log_stream_usage(user, content: str, style: str, generated: str, result, buffered: bool = None):
+    if result is None:
+        if ai_service:
+            result = AIResult.from_usage(generated, None, ai_service._completion_messages(content, style), ai_service.model)
+        else:
+            result = AIResult.from_usage(generated, None, [{'role': 'user', 'content': content}], '')
+
+    usage_recorder.record(user, 'autocomplete', result, buffered=buffered)
+
+
+# 자동완성 SSE 스트림 (WSGI)
+def completion_event_stream(user, content: str, style: str, use_cache: bool = True):
+    parts = []
+    result = None
+    start_time = time.time()
+
+    try:
+        for event in stream_content_completion(content, style, use_cache=use_cache):
+            if event['type'] == 'delta':
+                if not parts:
+                    logger.info(f"자동완성 스트림 첫 응답 - {time.time() - start_time:.2f}초")
+                parts.append(event['text'])
+                yield sse_event('delta', {'text': event['text']})
+            else:
+                result = event['result']
+                yield sse_event('done', {
+                    'success': True,
+                    'cached': event['cached'],
+                    'message': 'AI가 글을 이어서 작성했습니다!'
+                })
+    except AIServiceError as e:
+        yield sse_event('error', {'success': False, 'error': str(e)})
+    finally:
+        # 정상 종료, 오류, 클라이언트 연결 종료 모두 기록
+        if parts:
+            log_stream_usage(user, content, style, ''.join(parts), result)
+            logger.info(f"자동완성 스트림 종료 - {len(''.join(parts))}자, 소요시간: {time.time() - start_time:.2f}초")
+
+
+# 자동완성 SSE 스트림 (ASGI)
+async def acompletion_event_stream(user, content: str, style: str, use_cache: bool = True):
+    parts = []
+    result = None
+    start_time = time.time()
+
+    try:
+        async for event in astream_content_completion(content, style, use_cache=use_cache):
+            if event['type'] == 'delta':
+                if not parts:
+                    logger.info(f"자동완성 스트림 첫 응답 - {time.time() - start_time:.2f}초")
+                parts.append(event['text'])
+                yield sse_event('delta', {'text': event['text']})
+            else:
+                result = event['result']
+                yield sse_event('done', {
+                    'success': True,
+                    'cached': event['cached'],
+                    'message': 'AI가 글을 이어서 작성했습니다!'
+                })
+    except AIServiceError as e:
+        yield sse_event('error', {'success': False, 'error': str(e)})
+    finally:
+        if parts:
+            log_stream_usage(user, content, style, ''.join(parts), result, buffered=True)
+            logger.info(f"자동완성 스트림 종료 - {len(''.join(parts))}자, 소요시간: {time.time() - start_time:.2f}초")
@@ -0,0 +1,348 @@
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict, namedtuple
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections
+from scipy import sparse
+
+from . import ai_metrics
+
+logger = logging.getLogger('ai_service')
+
+# 특징 해싱 차원 (어휘 사전 없이 증분 갱신 가능)
+FEATURE_DIM = 2 ** 18
+# 게시글당 벡터화할 최대 본문 길이
+MAX_CONTENT_CHARS = 5000
+TITLE_WEIGHT = 2
+
+# 이웃 게시글 수, 동시 출현 태그 가중치, 본문 언급 가산점
+NEIGHBORS = 20
+COOCCURRENCE_WEIGHT = 0.3
+MENTION_BONUS = 0.3
+
+_HANGUL = re.compile(r'[가-힣]+')
+_LATIN = re.compile(r'[0-9a-z][0-9a-z+#._-]*[0-9a-z+#]|[a-z]')
+
+TagSuggestion = namedtuple('TagSuggestion', ['tags', 'scores', 'confident'])
+
+
+# 텍스트 특징 추출 (영문/숫자 단어 + 한글 글자 bigram - 조사가 붙은 어절도 같은 특징을 공유)
+def extract_features(text: str) -> Counter:
+    text = text.lower()
+    features = Counter(_LATIN.findall(text))
+    for word in _HANGUL.findall(text):
+        if len(word) == 1:
+            continue
+        for i in range(len(word) - 1):
+            features[word[i:i + 2]] += 1
+    return features
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode('utf-8')) % FEATURE_DIM
+
+
+# 게시글/질의 벡터 (해시 인덱스, 1 + log(tf))
+def vectorize(title: str, content: str):
+    counts = Counter()
+    for feature, count in extract_features(title).items():
+        counts[_hash(feature)] += count * TITLE_WEIGHT
+    for feature, count in extract_features(content[:MAX_CONTENT_CHARS]).items():
+        counts[_hash(feature)] += count
+
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return indices, values
+
+
+# 기존 게시글과 태그로 학습하는 로컬 태그 추천기
+# - 게시글 제목+본문의 TF-IDF 벡터로 비슷한 게시글(kNN)을 찾아 그 게시글들의 태그를 유사도로 가중 집계
+# - 태그 동시 출현 인덱스로 후보 태그와 자주 함께 쓰인 태그를 보강
+# - 게시글 저장 시 update_post() 로 증분 갱신, 다른 프로세스의 변경은 updated_at 기준으로 주기적으로 반영
+class LocalTagSuggester:
+    def __init__(self):
+        self.enabled = getattr(settings, 'AI_TAG_LOCAL_ENABLED', True)
+        self.min_posts = getattr(settings, 'AI_TAG_LOCAL_MIN_POSTS', 20)
+        self.min_score = getattr(settings, 'AI_TAG_LOCAL_MIN_SCORE', 0.25)
+        self.min_tags = getattr(settings, 'AI_TAG_LOCAL_MIN_TAGS', 3)
+        self.refresh_interval = getattr(settings, 'AI_TAG_INDEX_REFRESH', 60)
+        self.max_age = getattr(settings, 'AI_TAG_INDEX_MAX_AGE', 60 * 60)
+
+        self._lock = threading.RLock()
+        self._reset()
+        self._built_at = None
+        self._synced_at = 0.0
+        self._last_updated = None
+        self._building = False
+
+        ai_metrics.register_gauge('ai_tags.indexed_posts', lambda: len(self._rows))
+        ai_metrics.register_gauge('ai_tags.tags', lambda: len(self._tag_counts))
+
+    def _reset(self):
+        # post_id -> (indices, values)
+        self._rows = {}
+        self._df = np.zeros(FEATURE_DIM, dtype=np.int32)
+        # post_id -> 태그 이름 집합, 태그별 게시글 수, 태그 동시 출현 수
+        self._post_tags = {}
+        self._tag_counts = Counter()
+        self._cooccurrence = defaultdict(Counter)
+        # 태그 이름 앞 2글자 -> 태그 이름 (본문 언급 확인 시 전체 태그를 훑지 않도록)
+        self._tag_prefixes = defaultdict(set)
+        # 태그가 있는 게시글의 정규화된 TF-IDF 행렬 (변경 시 다음 조회에서 다시 계산)
+        self._matrix = None
+        self._matrix_ids = None
+
+    @property
+    def ready(self) -> bool:
+        return self._built_at is not None
+
+    # 게시글 추가/수정 반영
+    def update_post(self, post, tag_names=None):
+        if tag_names is None:
+            tag_names = [tag.name for tag in post.tags.all()]
+        indices, values = vectorize(post.title, post.content)
+        with self._lock:
+            self._set_row(post.pk, indices, values)
+            self._set_tags(post.pk, tag_names)
+        ai_metrics.incr('ai_tags.updated')
+
+    def remove_post(self, post_id):
+        with self._lock:
+            self._set_row(post_id, None, None)
+            self._set_tags(post_id, [])
+
+    def _set_row(self, post_id, indices, values):
+        old = self._rows.pop(post_id, None)
+        if old is not None:
+            self._df[old[0]] -= 1
+        if indices is not None:
+            self._rows[post_id] = (indices, values)
+            self._df[indices] += 1
+        self._matrix = None
+
+    def _set_tags(self, post_id, tag_names):
+        old = self._post_tags.pop(post_id, frozenset())
+        new = frozenset(name for name in tag_names if name)
+        if old == new:
+            if new:
+                self._post_tags[post_id] = new
+            return
+
+        for name in old:
+            self._tag_counts[name] -= 1
+            if self._tag_counts[name] <= 0:
+                del self._tag_counts[name]
+                self._index_tag_name(name, add=False)
+            for other in old:
+                if other != name:
+                    self._cooccurrence[name][other] -= 1
+                    if self._cooccurrence[name][other] <= 0:
+                        del self._cooccurrence[name][other]
+        for name in new:
+            if not self._tag_counts[name]:
+                self._index_tag_name(name, add=True)
+            self._tag_counts[name] += 1
+            for other in new:
+                if other != name:
+                    self._cooccurrence[name][other] += 1
+        if new:
+            self._post_tags[post_id] = new
+        self._matrix = None
+
+    def _index_tag_name(self, name, add):
+        key = name.lower()
+        if len(key) < 2:
+            return
+        names = self._tag_prefixes[key[:2]]
+        if add:
+            names.add(name)
+        else:
+            names.discard(name)
+            if not names:
+                del self._tag_prefixes[key[:2]]
+
+    # 본문에 이름이 그대로 나오는 태그 (본문의 2글자 조각으로 후보를 찾은 뒤 확인)
+    def _mentioned_tags(self, text: str):
+        pieces = {text[i:i + 2] for i in range(len(text) - 1)}
+        mentioned = []
+        for piece in pieces & self._tag_prefixes.keys():
+            mentioned.extend(name for name in self._tag_prefixes[piece] if name.lower() in text)
+        return mentioned
+
+    # DB 전체로 인덱스 구축
+    def build(self):
+        from .models import Post
+
+        started = time.monotonic()
+        tags = defaultdict(list)
+        for post_id, name in Post.tags.through.objects.values_list('post_id', 'tag__name').iterator():
+            tags[post_id].append(name)
+
+        rows = {}
+        last_updated = None
+        for post_id, title, content, updated_at in Post.objects.values_list(
+            'id', 'title', 'content', 'updated_at'
+        ).order_by().iterator(chunk_size=500):
+            rows[post_id] = vectorize(title, content)
+            if last_updated is None or updated_at > last_updated:
+                last_updated = updated_at
+
+        with self._lock:
+            self._reset()
+            for post_id, (indices, values) in rows.items():
+                self._set_row(post_id, indices, values)
+                self._set_tags(post_id, tags.get(post_id, []))
+            self._built_at = self._synced_at = time.monotonic()
+            self._last_updated = last_updated
+
+        ai_metrics.incr('ai_tags.build')
+        logger.info(f"로컬 태그 인덱스 구축 - 게시글 {len(rows)}개, 태그 {len(self._tag_counts)}개, "
+                    f"{time.monotonic() - started:.2f}초")
+
+    # 다른 프로세스에서 수정된 게시글 반영 (updated_at 기준)
+    def sync(self):
+        from .models import Post
+
+        with self._lock:
+            since = self._last_updated
+            self._synced_at = time.monotonic()
+        if since is None:
+            return
+
+        posts = list(Post.objects.filter(updated_at__gt=since).prefetch_related('tags'))
+        for post in posts:
+            self.update_post(post)
+        if posts:
+            with self._lock:
+                self._last_updated = max(post.updated_at for post in posts)
+            logger.info(f"로컬 태그 인덱스 갱신 - 게시글 {len(posts)}개")
+
+    # 인덱스가 없거나 오래되었으면 구축, 갱신 주기가 지났으면 변경분 반영 - 모두 백그라운드에서 (요청은 기다리지 않음)
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._building:
+            return
+        rebuild = self._built_at is None or now - self._built_at >= self.max_age
+        if not rebuild and now - self._synced_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=self._refresh_in_background, args=(rebuild,), name='ai-tag-index', daemon=True).start()
+
+    def _refresh_in_background(self, rebuild):
+        try:
+            if rebuild:
+                self.build()
+            else:
+                self.sync()
+        except Exception as e:
+            logger.error(f"로컬 태그 인덱스 {'구축' if rebuild else '갱신'} 실패: {e}")
+        finally:
+            self._building = False
+            close_old_connections()
+
+    def _idf(self):
+        return (np.log((1 + len(self._rows)) / (1 + self._df)) + 1).astype(np.float32)
+
+    # 태그가 있는 게시글만으로 정규화된 TF-IDF 행렬 구성
+    def _tagged_matrix(self, idf):
+        if self._matrix is not None:
+            return self._matrix_ids, self._matrix
+
+        ids = [post_id for post_id in self._rows if post_id in self._post_tags]
+        if not ids:
+            self._matrix_ids, self._matrix = np.array([], dtype=np.int64), None
+            return self._matrix_ids, None
+
+        lengths = [len(self._rows[post_id][0]) for post_id in ids]
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.concatenate([self._rows[post_id][0] for post_id in ids])
+        data = np.concatenate([self._rows[post_id][1] for post_id in ids]) * idf[indices]
+
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(ids), FEATURE_DIM))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix = sparse.diags(1 / norms).dot(matrix).tocsr()
+
+        self._matrix_ids, self._matrix = np.array(ids), matrix
+        return self._matrix_ids, matrix
+
+    # 태그 추천 (confident=False 이면 LLM 으로 넘김)
+    def suggest(self, title: str, content: str, max_tags: int = 5) -> TagSuggestion:
+        if not self.enabled:
+            return TagSuggestion([], [], False)
+
+        self._ensure_fresh()
+        if not self.ready:
+            ai_metrics.incr('ai_tags.not_ready')
+            return TagSuggestion([], [], False)
+
+        started = time.monotonic()
+        indices, values = vectorize(title, content)
+
+        with self._lock:
+            idf = self._idf()
+            ids, matrix = self._tagged_matrix(idf)
+            if matrix is None or not len(indices):
+                return TagSuggestion([], [], False)
+
+            # 질의도 인덱스와 같은 희소 행으로 구성 (특징 차원 크기의 배열을 만들지 않음)
+            weights = values * idf[indices]
+            norm = np.linalg.norm(weights)
+            if norm:
+                weights /= norm
+            query = sparse.csr_matrix((weights, indices, [0, len(indices)]), shape=(1, FEATURE_DIM))
+            similarities = matrix.dot(query.T).toarray().ravel()
+
+            # 유사한 게시글의 태그를 유사도로 가중 집계 (0~1: 이웃 중 해당 태그를 쓴 비율)
+            k = min(NEIGHBORS, len(ids))
+            top = np.argpartition(-similarities, k - 1)[:k]
+            scores = Counter()
+            total = 0.0
+            for index in top:
+                similarity = float(similarities[index])
+                if similarity <= 0:
+                    continue
+                total += similarity
+                for name in self._post_tags[int(ids[index])]:
+                    scores[name] += similarity
+            if total:
+                for name in scores:
+                    scores[name] /= total
+
+            # 동시 출현 보강: P(태그2 | 태그1) 비율로 가산
+            expanded = Counter()
+            for name, score in scores.most_common(max_tags * 2):
+                count = self._tag_counts.get(name) or 1
+                for other, together in self._cooccurrence[name].items():
+                    expanded[other] += score * together / count * COOCCURRENCE_WEIGHT
+
+            # 본문에 태그 이름이 그대로 나오면 가산
+            text = f"{title}\n{content[:MAX_CONTENT_CHARS]}".lower()
+            for name in self._mentioned_tags(text):
+                expanded[name] += MENTION_BONUS
+
+            enough_posts = len(ids) >= self.min_posts
+
+        for name, bonus in expanded.items():
+            scores[name] = min(1.0, scores[name] + bonus)
+
+        ranked = scores.most_common(max_tags)
+        tags = [name for name, _ in ranked]
+        confident = enough_posts and sum(1 for _, score in ranked if score >= self.min_score) >= min(self.min_tags, max_tags)
+
+        ai_metrics.incr('ai_tags.confident' if confident else 'ai_tags.low_confidence')
+        logger.info(f"로컬 태그 추천 - {len(tags)}개, 신뢰: {confident}, {(time.monotonic() - started) * 1000:.1f}ms")
+        return TagSuggestion(tags, [round(score, 3) for _, score in ranked], confident)
+
+
+tag_suggester = LocalTagSuggester()
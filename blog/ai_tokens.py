@@ -0,0 +1,160 @@
+import logging
+import math
+import re
+import threading
+import time
+from typing import List, Optional
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger('ai_service')
+
+# chat 형식 메시지당 추가 토큰 (역할 구분자 등) 및 응답 시작 토큰
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# 토크나이저가 없을 때 사용하는 근사치
+# - 한글/한자/가나: 글자당 약 1토큰 (영문 기준 len // 4 추정은 한국어에서 3~4배 과소 추정됨)
+# - 그 외 문자: 약 4글자당 1토큰
+_WIDE_CHARS = re.compile(r'[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3]')
+WIDE_CHARS_PER_TOKEN = 1.0
+OTHER_CHARS_PER_TOKEN = 4.0
+
+# 인코딩 로드 실패 후 다시 시도하기까지의 대기 시간 (실패할 때마다 두 배, 최대 LOAD_RETRY_MAX_SECONDS)
+LOAD_RETRY_SECONDS = 30
+LOAD_RETRY_MAX_SECONDS = 60 * 60
+DEFAULT_MODEL = 'gpt-4o-mini'
+
+_encodings = {}
+# 모델 -> (연속 실패 횟수, 다음 시도 시각)
+_failures = {}
+_loading = set()
+_lock = threading.Lock()
+
+
+# 모델용 인코딩 (없으면 None - 근사치 사용)
+# 처음 한 번만 호출한 쪽에서 로드하고, 로드 중이거나 실패 후 재시도는 기다리지 않음 (재시도는 백그라운드)
+def _get_encoding(model: str):
+    if not TIKTOKEN_AVAILABLE:
+        return None
+
+    encoding = _encodings.get(model)
+    if encoding is not None or model in _loading:
+        return encoding
+    failure = _failures.get(model)
+    if failure is None:
+        return _load_encoding(model)
+    if time.monotonic() >= failure[1]:
+        _load_in_background(model)
+    return None
+
+
+# 인코딩 로드 (인코딩 파일 다운로드가 불가능한 환경 등에서 실패하면 대기 후 다시 시도)
+def _load_encoding(model: str):
+    with _lock:
+        if model in _encodings or model in _loading:
+            return _encodings.get(model)
+        _loading.add(model)
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        with _lock:
+            attempts = _failures.get(model, (0, 0))[0] + 1
+            delay = min(LOAD_RETRY_MAX_SECONDS, LOAD_RETRY_SECONDS * 2 ** (attempts - 1))
+            _failures[model] = (attempts, time.monotonic() + delay)
+            _loading.discard(model)
+        logger.warning(f"토크나이저 로드 실패, {delay}초 후 다시 시도합니다 - 그동안 근사치로 계산 ({model}): {e}")
+        return None
+
+    with _lock:
+        _encodings[model] = encoding
+        _failures.pop(model, None)
+        _loading.discard(model)
+    return encoding
+
+
+def _load_in_background(model: str):
+    threading.Thread(target=_load_encoding, args=(model,), name='tiktoken-loader', daemon=True).start()
+
+
+# 앱 시작 시 인코딩 미리 로드 (첫 요청이 BPE 파일 다운로드를 기다리거나 이벤트 루프를 막지 않도록)
+def warm_up(model: str = DEFAULT_MODEL):
+    if TIKTOKEN_AVAILABLE and model not in _encodings:
+        _load_in_background(model)
+
+
+# 근사 토큰 수
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    other = len(text) - wide
+    return math.ceil(wide / WIDE_CHARS_PER_TOKEN + other / OTHER_CHARS_PER_TOKEN)
+
+
+# 텍스트 토큰 수 (tiktoken 이 있으면 정확한 값, 없으면 근사치)
+def count_tokens(text: str, model: str = 'gpt-4o-mini') -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# chat 메시지 목록의 입력 토큰 수
+def count_message_tokens(messages: List[dict], model: str = 'gpt-4o-mini') -> int:
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE
+        total += count_tokens(message.get('content') or '', model)
+    return total
+
+
+# 요청/응답으로 사용량 추정 (캐시, 더미 응답 등 실제 사용량이 없는 경우)
+def estimate_usage(messages: Optional[List[dict]], completion: str, model: str = 'gpt-4o-mini') -> dict:
+    prompt_tokens = count_message_tokens(messages, model) if messages else 0
+    completion_tokens = count_tokens(completion, model)
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+    }
+
+
+# 텍스트를 max_tokens 이내로 자름 (from_end=True 이면 뒤쪽을 남김)
+def truncate_tokens(text: str, max_tokens: int, model: str = 'gpt-4o-mini', from_end: bool = False) -> str:
+    if max_tokens <= 0 or not text:
+        return ''
+
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        # 토큰 경계에서 잘린 한글 등 멀티바이트 글자는 U+FFFD 로 디코딩되므로 제거
+        if from_end:
+            return encoding.decode(tokens[-max_tokens:]).lstrip('\ufffd')
+        return encoding.decode(tokens[:max_tokens]).rstrip('\ufffd')
+
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 근사치는 글자 수에 대해 단조 증가하므로 이진 탐색으로 최대 길이 계산
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        piece = text[-middle:] if from_end else text[:middle]
+        if estimate_tokens(piece) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[-low:] if from_end and low else text[:low]
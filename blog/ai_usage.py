@@ -0,0 +1,170 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import ai_metrics
+
+logger = logging.getLogger('ai_service')
+
+UsageEvent = namedtuple('UsageEvent', [
+    'user_id', 'feature_type', 'prompt_tokens', 'completion_tokens', 'tokens_used',
+    'model', 'latency_ms', 'cached', 'estimated', 'count', 'created_at',
+])
+
+
+# AI 사용량 기록기 (메모리 버퍼 후 주기적으로 일괄 저장)
+# - record() 는 DB 에 접근하지 않으며, 백그라운드 스레드가 주기/크기 기준으로 flush
+# - 프로세스가 비정상 종료(SIGKILL 등)되면 마지막 flush 이후 최대 flush_interval 초 또는 max_buffer 건이 유실될 수 있음
+class UsageRecorder:
+    def __init__(self, flush_interval=None, max_buffer=None, buffered=None):
+        self.flush_interval = flush_interval or getattr(settings, 'AI_USAGE_FLUSH_INTERVAL', 5)
+        self.max_buffer = max_buffer or getattr(settings, 'AI_USAGE_FLUSH_SIZE', 200)
+        self.buffered = getattr(settings, 'AI_USAGE_BUFFERED', True) if buffered is None else buffered
+        self._buffer = []
+        self._lock = threading.Lock()
+        # flush 자체가 겹치지 않도록 하는 잠금
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        ai_metrics.register_gauge('ai_usage.buffered', lambda: len(self._buffer))
+
+    # 사용 기록 추가 (result: AIResult, count: ai_usage_count 증가분)
+    # buffered: 이벤트 루프(비동기 뷰, 비동기 스트림)에서 호출할 때 True - AI_USAGE_BUFFERED 설정과 무관하게 DB 에 접근하지 않음
+    def record(self, user, feature_type: str, result, count: int = 1, buffered: bool = None):
+        event = UsageEvent(
+            user_id=getattr(user, 'pk', user),
+            feature_type=feature_type,
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            tokens_used=result.total_tokens,
+            model=result.model,
+            latency_ms=result.latency_ms,
+            cached=result.cached,
+            estimated=result.estimated,
+            count=count,
+            created_at=timezone.now(),
+        )
+
+        if not (self.buffered if buffered is None else buffered):
+            self._write([event])
+            return
+
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.max_buffer
+        ai_metrics.incr('ai_usage.recorded')
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    # 아직 저장되지 않은 사용자별 기능 사용 횟수 (통계 화면 보정용)
+    def pending(self, user_id) -> Counter:
+        with self._lock:
+            return Counter(event.feature_type for event in self._buffer if event.user_id == user_id)
+
+    def pending_count(self, user_id) -> int:
+        with self._lock:
+            return sum(event.count for event in self._buffer if event.user_id == user_id)
+
+    # 아직 저장되지 않은 실제 API 사용 토큰 수 (토큰 예산 계산용)
+    def pending_tokens(self, user_id, since=None) -> int:
+        with self._lock:
+            return sum(
+                event.tokens_used for event in self._buffer
+                if event.user_id == user_id and not event.cached and (since is None or event.created_at >= since)
+            )
+
+    # 버퍼의 이벤트를 DB 에 저장하고 저장한 건수 반환
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+            if not events:
+                return 0
+
+            try:
+                self._write(events)
+            except Exception as e:
+                # 실패한 이벤트는 버퍼 앞쪽으로 되돌림 (최대 크기의 10배까지만 보관)
+                with self._lock:
+                    self._buffer = (events + self._buffer)[-self.max_buffer * 10:]
+                ai_metrics.incr('ai_usage.flush_error')
+                logger.error(f"AI 사용량 저장 실패 - {len(events)}건 재시도 예정: {e}")
+                return 0
+
+            ai_metrics.incr('ai_usage.flushed', len(events))
+            return len(events)
+
+    # 로그는 bulk_create, 사용 횟수는 사용자별 F() 증가로 한 트랜잭션에 저장
+    def _write(self, events):
+        from accounts.models import CustomUser
+        from .models import AIUsageLog
+
+        counts = Counter()
+        for event in events:
+            counts[event.user_id] += event.count
+
+        with transaction.atomic():
+            AIUsageLog.objects.bulk_create([
+                AIUsageLog(
+                    user_id=event.user_id,
+                    feature_type=event.feature_type,
+                    prompt_tokens=event.prompt_tokens,
+                    completion_tokens=event.completion_tokens,
+                    tokens_used=event.tokens_used,
+                    model=event.model,
+                    latency_ms=event.latency_ms,
+                    cached=event.cached,
+                    estimated=event.estimated,
+                    created_at=event.created_at,
+                )
+                for event in events
+            ])
+            for user_id, count in counts.items():
+                if count:
+                    CustomUser.objects.filter(pk=user_id).update(ai_usage_count=F('ai_usage_count') + count)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='ai-usage-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            started = time.monotonic()
+            try:
+                flushed = self.flush()
+                if flushed:
+                    logger.debug(f"AI 사용량 {flushed}건 저장 - {time.monotonic() - started:.3f}초")
+            finally:
+                close_old_connections()
+
+    # 종료 시 남은 버퍼 저장
+    def shutdown(self):
+        self._stopped = True
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"종료 시 AI 사용량 저장 실패: {e}")
+
+
+usage_recorder = UsageRecorder()
+atexit.register(usage_recorder.shutdown)
@@ -1,16 +1,69 @@
 import json
 import time
+from django.db.models import Sum
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.views import View
-from .ai_service import get_title_suggestions, get_content_completion, get_tag_suggestions, get_content_summary
+from .ai_service import get_title_suggestions, get_content_completion, get_tag_suggestions, get_content_summary, get_assist_bundle
+from .ai_streaming import sse_response, completion_event_stream
 from .models import AIUsageLog
+from . import ai_metrics
+from .ai_jobs import job_queue_stats
+from .ai_usage import usage_recorder
+from .ai_ratelimit import check_rate_limit, rate_limiter
+from .ai_tags import tag_suggester
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 일괄 추천에 포함되는 기능
+BUNDLE_FEATURES = ['title_suggest', 'tag_suggest', 'summary']
+
+
+# 일괄 추천 결과의 기능별 (기능, AIResult) 목록
+def bundle_usage_entries(bundle):
+    return [(feature, bundle['results'][feature]) for feature in BUNDLE_FEATURES]
+
+
+# 기능별 최소 내용 길이와 안내 문구 (동기/비동기 뷰 공통)
+MIN_CONTENT_LENGTH = {
+    'title_suggest': (20, '더 많은 내용을 작성한 후 제목을 추천받아보세요.'),
+    'autocomplete': (30, '더 많은 내용을 작성한 후 자동완성을 사용해보세요.'),
+    'summary': (200, '요약하기에는 내용이 너무 짧습니다.'),
+    'assist_bundle': (200, '한 번에 추천받으려면 더 많은 내용이 필요합니다.'),
+}
+
+
+# 기능별 입력 검증 (동기/비동기 뷰 공통) - 오류 응답, 통과하면 None
+def validate_request(feature_type, data):
+    content = data.get('content', '').strip()
+
+    if feature_type == 'tag_suggest':
+        if not content and not data.get('title', '').strip():
+            return JsonResponse({
+                'success': False,
+                'error': '제목이나 내용을 입력해주세요.'
+            })
+        return None
+
+    if not content:
+        return JsonResponse({
+            'success': False,
+            'error': '내용을 입력해주세요.'
+        })
+
+    minimum, message = MIN_CONTENT_LENGTH[feature_type]
+    if len(content) < minimum:
+        return JsonResponse({
+            'success': False,
+            'error': f'{message} (현재: {len(content)}자, 최소: {minimum}자)'
+        })
+    return None
+
+
 # 제목 추천
 @method_decorator([login_required, csrf_exempt], name='dispatch')
 class TitleSuggestionView(View):    
@@ -20,39 +73,30 @@ class TitleSuggestionView(View):
         try:
             data = json.loads(request.body)
             content = data.get('content', '').strip()
+            # '다시 추천' 요청이면 캐시를 우회
+            regenerate = bool(data.get('regenerate', False))
             
-            if not content:
-                return JsonResponse({
-                    'success': False,
-                    'error': '내용을 입력해주세요.'
-                })
+            invalid = validate_request('title_suggest', data)
+            if invalid:
+                return invalid
             
-            if len(content) < 20:
-                return JsonResponse({
-                    'success': False,
-                    'error': f'더 많은 내용을 작성한 후 제목을 추천받아보세요. (현재: {len(content)}자, 최소: 50자)'
-                })
+            limited = check_rate_limit(request.user, 'title_suggest')
+            if limited:
+                return limited
             
             # AI 제목 추천 요청
             logger.info(f"OpenAI API 제목 추천 요청 시작 - 내용 길이: {len(content)}자")
             start_time = time.time()
             
-            titles = get_title_suggestions(content, count=4)
+            result = get_title_suggestions(content, count=4, use_cache=not regenerate)
+            titles = result.value
             
             end_time = time.time()
             logger.info(f"OpenAI API 제목 추천 완료 - 소요시간: {end_time - start_time:.2f}초")
             
             if titles:
-                # AI 사용량 로깅
-                AIUsageLog.objects.create(
-                    user=request.user,
-                    feature_type='title_suggest',
-                    tokens_used=len(content) // 4
-                )
-                
-                # 사용자 AI 사용량 증가
-                request.user.ai_usage_count += 1
-                request.user.save()
+                # AI 사용량 로깅 (버퍼링 후 일괄 저장)
+                usage_recorder.record(request.user, 'title_suggest', result)
                 
                 logger.info(f"제목 추천 성공 - {len(titles)}개 생성")
                 
@@ -90,38 +134,29 @@ class ContentCompletionView(View):
             data = json.loads(request.body)
             content = data.get('content', '').strip()
             style = data.get('style', 'friendly')
+            regenerate = bool(data.get('regenerate', False))
             
-            if not content:
-                return JsonResponse({
-                    'success': False,
-                    'error': '내용을 입력해주세요.'
-                })
+            invalid = validate_request('autocomplete', data)
+            if invalid:
+                return invalid
             
-            if len(content) < 30:
-                return JsonResponse({
-                    'success': False,
-                    'error': f'더 많은 내용을 작성한 후 자동완성을 사용해보세요. (현재: {len(content)}자, 최소: 30자)'
-                })
+            limited = check_rate_limit(request.user, 'autocomplete')
+            if limited:
+                return limited
             
             # AI 자동완성 요청
             logger.info(f"OpenAI API 자동완성 요청 시작 - 내용 길이: {len(content)}자, 스타일: {style}")
             start_time = time.time()
             
-            completion = get_content_completion(content, style)
+            result = get_content_completion(content, style, use_cache=not regenerate)
+            completion = result.value
             
             end_time = time.time()
             logger.info(f"OpenAI API 자동완성 완료 - 소요시간: {end_time - start_time:.2f}초")
             
             if completion:
-                # AI 사용량 로깅
-                AIUsageLog.objects.create(
-                    user=request.user,
-                    feature_type='autocomplete',
-                    tokens_used=len(content + completion) // 4
-                )
-                
-                request.user.ai_usage_count += 1
-                request.user.save()
+                # AI 사용량 로깅 (버퍼링 후 일괄 저장)
+                usage_recorder.record(request.user, 'autocomplete', result)
                 
                 logger.info(f"자동완성 성공 - {len(completion)}자 생성")
                 
@@ -143,7 +178,38 @@ class ContentCompletionView(View):
                 'error': f'서버 오류가 발생했습니다: {str(e)}'
             })
 
+# 내용 자동완성 스트리밍 API (SSE)
+@method_decorator([login_required, csrf_exempt], name='dispatch')
+class ContentCompletionStreamView(View):
+    def post(self, request):
+        logger.info(f"자동완성 스트리밍 요청 - 사용자: {request.user.username}")
+        
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            logger.error("JSON 파싱 오류")
+            return JsonResponse({
+                'success': False,
+                'error': '요청 형식이 올바르지 않습니다.'
+            })
+        
+        content = data.get('content', '').strip()
+        style = data.get('style', 'friendly')
+        regenerate = bool(data.get('regenerate', False))
+        
+        invalid = validate_request('autocomplete', data)
+        if invalid:
+            return invalid
+        
+        limited = check_rate_limit(request.user, 'autocomplete')
+        if limited:
+            return limited
+        
+        return sse_response(completion_event_stream(request.user, content, style, use_cache=not regenerate))
+
 # 태그 추천 API
+# 로컬 태그 추천기(blog/ai_tags.py)가 충분히 확신하면 바로 응답하고, 아니면 OpenAI 로 추천
+# ('regenerate' 또는 'use_ai' 요청은 항상 OpenAI 사용)
 @method_decorator([login_required, csrf_exempt], name='dispatch')
 class TagSuggestionView(View):
     def post(self, request):
@@ -153,38 +219,49 @@ class TagSuggestionView(View):
             data = json.loads(request.body)
             title = data.get('title', '').strip()
             content = data.get('content', '').strip()
+            regenerate = bool(data.get('regenerate', False))
+            use_ai = regenerate or bool(data.get('use_ai', False))
             
-            if not title and not content:
-                return JsonResponse({
-                    'success': False,
-                    'error': '제목이나 내용을 입력해주세요.'
-                })
+            invalid = validate_request('tag_suggest', data)
+            if invalid:
+                return invalid
+            
+            # 로컬 추천 (API 호출 없음 - 요청 한도와 사용량에 포함하지 않음)
+            if not use_ai:
+                local = tag_suggester.suggest(title, content, max_tags=5)
+                if local.confident:
+                    logger.info(f"로컬 태그 추천 성공 - {len(local.tags)}개")
+                    return JsonResponse({
+                        'success': True,
+                        'tags': local.tags,
+                        'source': 'local',
+                        'message': f'기존 글을 바탕으로 {len(local.tags)}개의 태그를 추천했습니다!'
+                    })
+            
+            limited = check_rate_limit(request.user, 'tag_suggest')
+            if limited:
+                return limited
             
             # AI 태그 추천 요청
             logger.info(f"OpenAI API 태그 추천 요청 시작")
             start_time = time.time()
             
-            tags = get_tag_suggestions(title, content, max_tags=5)
+            result = get_tag_suggestions(title, content, max_tags=5, use_cache=not regenerate)
+            tags = result.value
             
             end_time = time.time()
             logger.info(f"OpenAI API 태그 추천 완료 - 소요시간: {end_time - start_time:.2f}초")
             
             if tags:
-                # AI 사용량 로깅
-                AIUsageLog.objects.create(
-                    user=request.user,
-                    feature_type='tag_suggest',
-                    tokens_used=len(title + content) // 4
-                )
-                
-                request.user.ai_usage_count += 1
-                request.user.save()
+                # AI 사용량 로깅 (버퍼링 후 일괄 저장)
+                usage_recorder.record(request.user, 'tag_suggest', result)
                 
                 logger.info(f"태그 추천 성공 - {len(tags)}개 생성")
                 
                 return JsonResponse({
                     'success': True,
                     'tags': tags,
+                    'source': 'ai',
                     'message': f'AI가 {len(tags)}개의 태그를 추천했습니다!'
                 })
             else:
@@ -209,38 +286,29 @@ class SummaryGenerationView(View):
         try:
             data = json.loads(request.body)
             content = data.get('content', '').strip()
+            regenerate = bool(data.get('regenerate', False))
             
-            if not content:
-                return JsonResponse({
-                    'success': False,
-                    'error': '내용을 입력해주세요.'
-                })
+            invalid = validate_request('summary', data)
+            if invalid:
+                return invalid
             
-            if len(content) < 200:
-                return JsonResponse({
-                    'success': False,
-                    'error': f'요약하기에는 내용이 너무 짧습니다. (현재: {len(content)}자, 최소: 200자)'
-                })
+            limited = check_rate_limit(request.user, 'summary')
+            if limited:
+                return limited
             
             # AI 요약 생성 요청
             logger.info(f"OpenAI API 요약 생성 요청 시작 - 내용 길이: {len(content)}자")
             start_time = time.time()
             
-            summary = get_content_summary(content, max_length=200)
+            result = get_content_summary(content, max_length=200, use_cache=not regenerate)
+            summary = result.value
             
             end_time = time.time()
             logger.info(f"OpenAI API 요약 생성 완료 - 소요시간: {end_time - start_time:.2f}초")
             
             if summary:
-                # AI 사용량 로깅
-                AIUsageLog.objects.create(
-                    user=request.user,
-                    feature_type='summary',
-                    tokens_used=len(content + summary) // 4
-                )
-                
-                request.user.ai_usage_count += 1
-                request.user.save()
+                # AI 사용량 로깅 (버퍼링 후 일괄 저장)
+                usage_recorder.record(request.user, 'summary', result)
                 
                 logger.info(f"요약 생성 성공 - {len(summary)}자 생성")
                 
@@ -262,20 +330,87 @@ class SummaryGenerationView(View):
                 'error': f'서버 오류가 발생했습니다: {str(e)}'
             })
 
+# 제목/태그/요약 일괄 추천 API
+@method_decorator([login_required, csrf_exempt], name='dispatch')
+class AssistBundleView(View):
+    def post(self, request):
+        logger.info(f"일괄 추천 요청 - 사용자: {request.user.username}")
+        
+        try:
+            data = json.loads(request.body)
+            title = data.get('title', '').strip()
+            content = data.get('content', '').strip()
+            regenerate = bool(data.get('regenerate', False))
+            
+            invalid = validate_request('assist_bundle', data)
+            if invalid:
+                return invalid
+            
+            limited = check_rate_limit(request.user, 'assist_bundle')
+            if limited:
+                return limited
+            
+            logger.info(f"OpenAI API 일괄 추천 요청 시작 - 내용 길이: {len(content)}자")
+            start_time = time.time()
+            
+            bundle = get_assist_bundle(title, content, use_cache=not regenerate)
+            
+            end_time = time.time()
+            logger.info(f"OpenAI API 일괄 추천 완료 - 소요시간: {end_time - start_time:.2f}초")
+            
+            if not bundle:
+                return JsonResponse({
+                    'success': False,
+                    'error': '일괄 추천에 실패했습니다. 다시 시도해주세요.'
+                })
+            
+            # 기능별 AI 사용량 로깅
+            for feature, result in bundle_usage_entries(bundle):
+                usage_recorder.record(request.user, feature, result)
+            
+            return JsonResponse({
+                'success': True,
+                'titles': bundle['titles'],
+                'tags': bundle['tags'],
+                'summary': bundle['summary'],
+                'message': 'AI가 제목, 태그, 요약을 추천했습니다!'
+            })
+        
+        except json.JSONDecodeError:
+            logger.error("JSON 파싱 오류")
+            return JsonResponse({
+                'success': False,
+                'error': '요청 형식이 올바르지 않습니다.'
+            })
+        except Exception as e:
+            logger.error(f"일괄 추천 API 오류: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': f'서버 오류가 발생했습니다: {str(e)}'
+            })
+
 # 사용자 AI 사용량 통계
 @login_required
 def ai_usage_stats(request):
     try:
         user_usage = AIUsageLog.objects.filter(user=request.user)
+        # 아직 저장되지 않은 버퍼 기록 포함
+        pending = usage_recorder.pending(request.user.pk)
         
         stats = {
-            'total_usage': request.user.ai_usage_count,
-            'title_suggestions': user_usage.filter(feature_type='title_suggest').count(),
-            'autocompletions': user_usage.filter(feature_type='autocomplete').count(),
-            'tag_suggestions': user_usage.filter(feature_type='tag_suggest').count(),
-            'summaries': user_usage.filter(feature_type='summary').count(),
+            'total_usage': request.user.ai_usage_count + usage_recorder.pending_count(request.user.pk),
+            'title_suggestions': user_usage.filter(feature_type='title_suggest').count() + pending['title_suggest'],
+            'autocompletions': user_usage.filter(feature_type='autocomplete').count() + pending['autocomplete'],
+            'tag_suggestions': user_usage.filter(feature_type='tag_suggest').count() + pending['tag_suggest'],
+            'summaries': user_usage.filter(feature_type='summary').count() + pending['summary'],
+            # 실제 API 호출로 사용한 토큰 수 (캐시 결과 제외, 토큰 예산 확인과 같이 버퍼 기록 포함)
+            'tokens_used': (user_usage.filter(cached=False).aggregate(total=Sum('tokens_used'))['total'] or 0)
+                           + usage_recorder.pending_tokens(request.user.pk),
         }
         
+        # 남은 요청 한도와 토큰 예산
+        stats['quota'] = rate_limiter.status(request.user)
+        
         logger.info(f"AI 사용량 통계 조회 - 사용자: {request.user.username}, 총 사용량: {stats['total_usage']}")
         
         return JsonResponse({
@@ -288,4 +423,19 @@ def ai_usage_stats(request):
         return JsonResponse({
             'success': False,
             'error': '통계를 가져오는데 실패했습니다.'
-        })
\ No newline at end of file
+        })
+
+# AI 서비스 내부 지표 (관리자 전용)
+@staff_member_required
+def ai_metrics_view(request):
+    from .ai_service import ai_service
+
+    metrics = ai_metrics.snapshot()
+    if ai_service and ai_service.cache:
+        metrics['cache'] = ai_service.cache.stats()
+    metrics['jobs'] = job_queue_stats()
+
+    return JsonResponse({
+        'success': True,
+        'metrics': metrics
+    })
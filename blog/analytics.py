@@ -0,0 +1,282 @@
+import atexit
+import hashlib
+import logging
+import math
+import threading
+import time
+import zlib
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from . import ai_metrics
+
+logger = logging.getLogger(__name__)
+
+# 레지스터 수 2^12 = 4096 (스케치 4KB, 표준 오차 약 1.6%)
+HLL_PRECISION = 12
+
+
+# HyperLogLog 순방문자 추정 스케치 (같은 방문자를 여러 번 넣어도 한 번으로 셈, 스케치끼리 합칠 수 있음)
+class HyperLogLog:
+    def __init__(self, registers=None, precision=HLL_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = np.zeros(self.size, dtype=np.uint8) if registers is None else registers
+
+    def add(self, value: str):
+        hashed = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        # 나머지 비트의 앞쪽 0 개수 + 1
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, other: 'HyperLogLog'):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # 작은 값은 빈 레지스터 비율로 보정 (linear counting)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    # 저장용 바이트 (방문자가 적은 스케치는 대부분 0 이라 압축하면 수십 바이트)
+    def to_bytes(self) -> bytes:
+        return zlib.compress(self.registers.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data) -> 'HyperLogLog':
+        if not data:
+            return cls()
+        return cls(np.frombuffer(zlib.decompress(bytes(data)), dtype=np.uint8).copy())
+
+    # 여러 스케치(저장된 바이트)를 합친 스케치
+    @classmethod
+    def merge(cls, sketches) -> 'HyperLogLog':
+        merged = cls()
+        for sketch in sketches:
+            merged.update(sketch if isinstance(sketch, cls) else cls.from_bytes(sketch))
+        return merged
+
+
+# 게시글 일별 통계 기록기 (조회수/좋아요/순방문자를 메모리에 모았다가 주기적으로 PostDailyStats 에 저장)
+# - 요청 경로에서는 DB 에 접근하지 않음
+# - 프로세스가 비정상 종료되면 마지막 flush 이후 최대 flush_interval 초 분량이 유실될 수 있음
+class PostAnalytics:
+    def __init__(self, flush_interval=None, enabled=None):
+        self.flush_interval = flush_interval or getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 30)
+        self.enabled = getattr(settings, 'ANALYTICS_ENABLED', True) if enabled is None else enabled
+        # (게시글 id, 날짜) -> [조회수, 좋아요, 좋아요 취소, HyperLogLog]
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        ai_metrics.register_gauge('analytics.buffered', lambda: len(self._buffer))
+
+    def _entry(self, post_id):
+        key = (post_id, timezone.localdate())
+        entry = self._buffer.get(key)
+        if entry is None:
+            entry = self._buffer[key] = [0, 0, 0, HyperLogLog()]
+        return entry
+
+    # 조회 기록 (visitor: 방문자 식별값, counted: 조회수에 포함되는 조회인지 - 중복 조회도 순방문자 스케치에는 넣음)
+    def record_view(self, post_id, visitor: str, counted: bool = True):
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._entry(post_id)
+            if counted:
+                entry[0] += 1
+            entry[3].add(visitor)
+        self._ensure_thread()
+
+    # 좋아요 기록 (delta: 1 좋아요, -1 취소)
+    def record_like(self, post_id, delta: int):
+        if not self.enabled or not delta:
+            return
+        with self._lock:
+            entry = self._entry(post_id)
+            entry[1 if delta > 0 else 2] += abs(delta)
+        self._ensure_thread()
+
+    # 버퍼를 DB 에 저장하고 저장한 (게시글, 날짜) 수 반환
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, {}
+            if not buffer:
+                return 0
+
+            try:
+                self._write(buffer)
+            except Exception as e:
+                # 실패한 항목은 버퍼에 다시 합침
+                with self._lock:
+                    for key, (views, likes, unlikes, sketch) in buffer.items():
+                        entry = self._buffer.setdefault(key, [0, 0, 0, HyperLogLog()])
+                        entry[0] += views
+                        entry[1] += likes
+                        entry[2] += unlikes
+                        entry[3].update(sketch)
+                ai_metrics.incr('analytics.flush_error')
+                logger.error(f"게시글 통계 저장 실패 - {len(buffer)}건 재시도 예정: {e}")
+                return 0
+
+            ai_metrics.incr('analytics.flushed', len(buffer))
+            return len(buffer)
+
+    # 없는 행은 먼저 만들고, 잠근 뒤 카운터는 더하고 스케치는 레지스터별 최댓값으로 합침
+    def _write(self, buffer):
+        from .models import Post, PostDailyStats
+
+        # 그 사이 삭제된 게시글은 제외
+        existing = set(Post.objects.filter(pk__in={post_id for post_id, _ in buffer}).values_list('pk', flat=True))
+        buffer = {key: value for key, value in buffer.items() if key[0] in existing}
+        if not buffer:
+            return
+
+        with transaction.atomic():
+            PostDailyStats.objects.bulk_create(
+                [PostDailyStats(post_id=post_id, date=date) for post_id, date in buffer],
+                ignore_conflicts=True,
+            )
+            rows = PostDailyStats.objects.select_for_update().filter(
+                post_id__in={post_id for post_id, _ in buffer},
+                date__in={date for _, date in buffer},
+            )
+            changed = []
+            for row in rows:
+                entry = buffer.get((row.post_id, row.date))
+                if entry is None:
+                    continue
+                views, likes, unlikes, sketch = entry
+                merged = HyperLogLog.from_bytes(row.sketch)
+                merged.update(sketch)
+                row.views += views
+                row.likes += likes
+                row.unlikes += unlikes
+                row.sketch = merged.to_bytes()
+                row.uniques = merged.count()
+                changed.append(row)
+            PostDailyStats.objects.bulk_update(changed, ['views', 'likes', 'unlikes', 'sketch', 'uniques'])
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='analytics-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            started = time.monotonic()
+            try:
+                flushed = self.flush()
+                if flushed:
+                    logger.debug(f"게시글 통계 {flushed}건 저장 - {time.monotonic() - started:.3f}초")
+            finally:
+                close_old_connections()
+
+    # 종료 시 남은 버퍼 저장
+    def shutdown(self):
+        self._stopped = True
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"종료 시 게시글 통계 저장 실패: {e}")
+
+
+post_analytics = PostAnalytics()
+atexit.register(post_analytics.shutdown)
+
+
+# --- 조회 ---
+
+# 기간 내 순방문자 수 (여러 게시글이면 게시글 사이의 중복 방문자도 한 번으로 셈)
+def unique_readers(post_ids, start, end) -> int:
+    from .models import PostDailyStats
+
+    sketches = PostDailyStats.objects.filter(
+        post_id__in=post_ids, date__range=(start, end)
+    ).values_list('sketch', flat=True)
+    return HyperLogLog.merge(sketches).count()
+
+
+# 작성자 통계 (최근 days 일 일별 조회수/좋아요/순방문자, 기간 전체 순방문자, 순방문자 상위 게시글)
+def author_report(user, days: int = 30, top: int = 5) -> dict:
+    from .models import PostDailyStats
+
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    rows = PostDailyStats.objects.filter(
+        post__author=user, date__range=(start, end)
+    ).values_list('post_id', 'post__title', 'date', 'views', 'likes', 'sketch')
+
+    total = HyperLogLog()
+    daily = {}
+    posts = {}
+    for post_id, title, date, views, likes, data in rows.iterator():
+        sketch = HyperLogLog.from_bytes(data)
+        total.update(sketch)
+
+        day = daily.setdefault(date, {'views': 0, 'likes': 0, 'sketch': HyperLogLog()})
+        day['views'] += views
+        day['likes'] += likes
+        day['sketch'].update(sketch)
+
+        post = posts.setdefault(post_id, {'id': post_id, 'title': title, 'views': 0, 'sketch': HyperLogLog()})
+        post['views'] += views
+        post['sketch'].update(sketch)
+
+    series = []
+    for offset in range(days):
+        date = start + timedelta(days=offset)
+        day = daily.get(date)
+        series.append({
+            'date': date,
+            'views': day['views'] if day else 0,
+            'likes': day['likes'] if day else 0,
+            'uniques': day['sketch'].count() if day else 0,
+        })
+
+    # 그래프 막대 높이 (최댓값 대비 %)
+    for name in ('views', 'likes', 'uniques'):
+        peak = max((point[name] for point in series), default=0) or 1
+        for point in series:
+            point[f'{name}_pct'] = round(point[name] * 100 / peak)
+
+    top_posts = []
+    for post in posts.values():
+        top_posts.append({'id': post['id'], 'title': post['title'], 'views': post['views'],
+                          'uniques': post['sketch'].count()})
+    top_posts.sort(key=lambda post: (-post['uniques'], -post['views']))
+
+    return {
+        'days': days,
+        'start': start,
+        'end': end,
+        'series': series,
+        'total_views': sum(point['views'] for point in series),
+        'total_likes': sum(point['likes'] for point in series),
+        'unique_readers': total.count(),
+        'top_posts': top_posts[:top],
+    }
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        # 전문 검색 색인 동기화
+        from . import signals  # noqa: F401
+        # 토크나이저 인코딩 미리 로드
+        from . import ai_tokens
+        ai_tokens.warm_up()
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber, Substr
+
+from .models import Comment
+from .pagination import encode_cursor, paginate_keyset
+
+# 댓글 목록 정렬 (최상위 댓글: 오래된 순 id, 답글: 경로 = 스레드 안 깊이 우선 순서)
+COMMENT_ORDERINGS = {
+    'thread': ('id',),
+    'path': ('path',),
+}
+
+# '.' 다음 문자 - 경로 p 의 하위 댓글은 모두 (p + '.', p + '/') 범위
+_SUBTREE_END = chr(ord(Comment.PATH_SEPARATOR) + 1)
+
+
+def _subtree_range(first_path: str, last_path: str = None):
+    return first_path + Comment.PATH_SEPARATOR, (last_path or first_path) + _SUBTREE_END
+
+
+# 댓글 JSON (권한 확인용 게시글 작성자는 post_author_id 로 받아 행마다 게시글을 조회하지 않음)
+def serialize(comment, user, post_author_id) -> dict:
+    is_author = user.is_authenticated and comment.author_id == user.pk
+    return {
+        'id': comment.id,
+        'content': comment.content,
+        'author': comment.author.username,
+        'author_id': comment.author_id,
+        'created_at': comment.created_at.strftime('%Y년 %m월 %d일 %H:%M'),
+        'parent_id': comment.parent_id,
+        'depth': comment.depth,
+        'is_author': is_author,
+        'can_delete': is_author or (user.is_authenticated and post_author_id == user.pk),
+        'replies': [],
+    }
+
+
+# 경로 순으로 정렬된 댓글을 한 번 순회하며 트리 구성
+# 부모가 목록에 없는 댓글(이어서 불러온 답글 등)은 최상위 목록에 parent_id 와 함께 둠
+def build_tree(comments, user, post_author_id, nodes=None) -> list:
+    nodes = {} if nodes is None else nodes
+    roots = []
+    for comment in comments:
+        node = serialize(comment, user, post_author_id)
+        nodes[comment.id] = node
+        parent = nodes.get(comment.parent_id)
+        if parent is not None:
+            parent['replies'].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+
+# 최상위 댓글 한 페이지와 스레드별 앞쪽 답글 (쿼리 2번)
+# 답글은 페이지의 첫 스레드 ~ 마지막 스레드 경로 범위를 한 번에 읽고, 스레드마다 replies_limit 개까지만 포함
+def thread_page(post, user, cursor=None, limit=None, replies_limit=None) -> dict:
+    limit = limit or getattr(settings, 'COMMENT_THREADS_PER_PAGE', 10)
+    replies_limit = replies_limit or getattr(settings, 'COMMENT_REPLIES_PER_THREAD', 5)
+
+    roots, next_cursor = paginate_keyset(
+        Comment.objects.filter(post=post, parent__isnull=True).select_related('author'),
+        'thread', cursor, limit, orderings=COMMENT_ORDERINGS,
+    )
+
+    nodes = {}
+    threads = build_tree(roots, user, post.author_id, nodes)
+    if roots:
+        start, end = _subtree_range(roots[0].path, roots[-1].path)
+        replies = Comment.objects.filter(
+            post=post, path__gt=start, path__lt=end, parent__isnull=False
+        ).select_related('author').annotate(
+            thread_key=Substr('path', 1, Comment.PATH_WIDTH),
+            thread_row=Window(RowNumber(), partition_by=[F('thread_key')], order_by=F('path').asc()),
+        ).filter(thread_row__lte=replies_limit + 1).order_by('path')
+
+        included = []
+        last_path = {}
+        more = set()
+        for reply in replies:
+            thread = reply.thread_path
+            if reply.thread_row > replies_limit:
+                more.add(thread)
+                continue
+            included.append(reply)
+            last_path[thread] = reply.path
+        build_tree(included, user, post.author_id, nodes)
+
+        # 더 불러올 답글이 있는 스레드는 이어서 읽을 커서
+        for root, node in zip(roots, threads):
+            node['replies_cursor'] = None
+            if root.path in more:
+                node['replies_cursor'] = encode_cursor(
+                    'path', Comment(path=last_path[root.path]), orderings=COMMENT_ORDERINGS
+                )
+
+    return {'comments': threads, 'next_cursor': next_cursor}
+
+
+# 댓글과 하위 답글 id (삭제 시 함께 지워지는 댓글 - 화면 상태 갱신용)
+def subtree_ids(comment) -> list:
+    start, end = _subtree_range(comment.path)
+    descendants = Comment.objects.filter(post_id=comment.post_id, path__gt=start, path__lt=end)
+    return [comment.id, *descendants.values_list('id', flat=True)]
+
+
+# 댓글 하나의 하위 답글을 경로 순으로 이어서 조회 ("답글 더 보기")
+def reply_page(comment, user, cursor=None, limit=None) -> dict:
+    limit = limit or getattr(settings, 'COMMENT_REPLIES_PAGE_SIZE', 20)
+    start, end = _subtree_range(comment.path)
+    replies, next_cursor = paginate_keyset(
+        Comment.objects.filter(post_id=comment.post_id, path__gt=start, path__lt=end).select_related('author'),
+        'path', cursor, limit, orderings=COMMENT_ORDERINGS,
+    )
+    return {
+        'replies': build_tree(replies, user, comment.post.author_id),
+        'next_cursor': next_cursor,
+    }
@@ -0,0 +1,62 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import Follow
+from .models import Comment, Like, Post
+
+logger = logging.getLogger(__name__)
+
+
+# 행별 실제 개수 (상관 서브쿼리 - JOIN 으로 행이 늘어나지 않음)
+def count_of(model, field):
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+# 모델별 카운터 컬럼과 실제 개수 계산식
+def counter_specs():
+    return [
+        (Post, {
+            'like_count': (Like, 'post'),
+            'comment_count': (Comment, 'post'),
+        }),
+        (get_user_model(), {
+            'follower_count': (Follow, 'following'),
+            'following_count': (Follow, 'follower'),
+        }),
+    ]
+
+
+# 카운터 보정: pk 구간별로 실제 개수와 다른 행만 찾아 DB 에서 다시 계산한 값으로 저장
+# (읽은 값으로 덮어쓰지 않으므로 보정 중 들어온 좋아요/팔로우도 유실되지 않음)
+def reconcile(batch_size=1000, dry_run=False, log=logger.info) -> dict:
+    result = {}
+    for model, counters in counter_specs():
+        expressions = {field: count_of(*source) for field, source in counters.items()}
+        actual = {f'actual_{field}': expression for field, expression in expressions.items()}
+        drift = Q()
+        for field in counters:
+            drift |= ~Q(**{field: F(f'actual_{field}')})
+
+        checked = fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            checked += len(pks)
+
+            drifted = list(model.objects.filter(pk__in=pks).annotate(**actual).filter(drift).values_list('pk', flat=True))
+            if drifted and not dry_run:
+                model.objects.filter(pk__in=drifted).update(**expressions)
+            fixed += len(drifted)
+
+        result[model._meta.label] = {'checked': checked, 'drifted': fixed}
+        log(f"  {model._meta.label}: {checked}개 확인, {fixed}개 {'불일치' if dry_run else '보정'}")
+    return result
@@ -0,0 +1,98 @@
+import logging
+import zlib
+from typing import List
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import ai_tokens
+from .related import char_ngrams
+
+logger = logging.getLogger('ai_service')
+
+# 게시글 임베딩 입력 최대 토큰 수
+MAX_INPUT_TOKENS = 2000
+
+
+# 게시글 임베딩 입력 텍스트
+def post_text(title: str, content: str) -> str:
+    return ai_tokens.truncate_tokens(f"{title}\n\n{content}", MAX_INPUT_TOKENS)
+
+
+# 행 단위 L2 정규화 (코사인 유사도 = 내적)
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+# 임베딩 공급자 공통 인터페이스
+class BaseEmbeddingProvider:
+    dim = 0
+    # 외부 API 호출 여부 (True 이면 게시글 저장 시 백그라운드 작업으로 처리)
+    remote = False
+
+    @property
+    def name(self) -> str:
+        return f'{type(self).__name__}:{self.dim}'
+
+    # 정규화된 float32 행렬 (len(texts) x dim)
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+# OpenAI 임베딩 API (OpenAIService 경유 - 기한/재시도/서킷 브레이커 적용)
+class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
+    remote = True
+
+    def __init__(self):
+        self.model = getattr(settings, 'AI_EMBEDDING_MODEL', 'text-embedding-3-small')
+        self.dim = getattr(settings, 'AI_EMBEDDING_DIM', 512)
+        self.batch_size = getattr(settings, 'AI_EMBEDDING_BATCH_SIZE', 64)
+
+    @property
+    def name(self) -> str:
+        return f'openai:{self.model}:{self.dim}'
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        from .ai_service import ai_service, AIServiceError
+
+        if not ai_service:
+            raise AIServiceError("AI 서비스를 사용할 수 없습니다.")
+
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [text or ' ' for text in texts[start:start + self.batch_size]]
+            vectors.extend(ai_service.embed(batch, model=self.model, dimensions=self.dim))
+        return normalize(np.array(vectors, dtype=np.float32).reshape(len(texts), self.dim))
+
+
+# 로컬 결정적 임베딩 (API 키 없는 개발 환경, 테스트용)
+# 문자 n-gram 을 부호 있는 특징 해싱으로 dim 차원에 투영 - 같은 텍스트는 항상 같은 벡터이며,
+# 의미가 아니라 표현이 비슷한 글끼리 가까워짐
+class LocalEmbeddingProvider(BaseEmbeddingProvider):
+    def __init__(self):
+        self.dim = getattr(settings, 'AI_EMBEDDING_DIM', 512)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram, count in char_ngrams(text).items():
+                digest = zlib.crc32(gram.encode('utf-8'))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dim] += sign * (1 + np.log(count))
+        return normalize(vectors)
+
+
+_provider = None
+
+
+# 설정된 임베딩 공급자 (settings.AI_EMBEDDING_PROVIDER)
+def get_provider() -> BaseEmbeddingProvider:
+    global _provider
+    if _provider is None:
+        path = getattr(settings, 'AI_EMBEDDING_PROVIDER', 'blog.embeddings.LocalEmbeddingProvider')
+        _provider = import_string(path)()
+        logger.info(f"임베딩 공급자: {_provider.name}")
+    return _provider
@@ -0,0 +1,155 @@
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import Client
+from django.urls import reverse
+
+from blog import ai_metrics
+from blog.ai_ratelimit import rate_limiter
+from blog.ai_service import ai_service
+from blog.ai_usage import usage_recorder
+
+# 기능별 엔드포인트와 요청 본문
+FEATURES = {
+    'title_suggest': ('ai_suggest_title', lambda text: {'content': text}),
+    'autocomplete': ('ai_complete_content', lambda text: {'content': text, 'style': 'friendly'}),
+    'tag_suggest': ('ai_suggest_tags', lambda text: {'title': text[:30], 'content': text}),
+    'summary': ('ai_generate_summary', lambda text: {'content': text}),
+}
+
+SAMPLE = (
+    "Django로 블로그를 만들면서 배운 점을 정리해 보려고 합니다. 모델을 설계하고 뷰를 작성하는 과정에서 "
+    "ORM의 동작 방식과 쿼리 최적화가 얼마나 중요한지 알게 되었습니다. 특히 select_related와 "
+    "prefetch_related를 적절히 사용하면 페이지 로딩 속도가 크게 달라졌습니다. "
+)
+
+
+# 백분위 (선형 보간)
+def percentile(values, p: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * p
+    low, high = math.floor(index), math.ceil(index)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+# AI 엔드포인트 부하 측정 (blog/ai_views.py 의 뷰를 프로세스 내부에서 동시 호출)
+class Command(BaseCommand):
+    help = "AI 엔드포인트를 동시에 호출해 기능별 처리량과 p50/p95/p99 지연 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='기능별 요청 수')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+        parser.add_argument('--features', default=','.join(FEATURES), help='측정할 기능 (쉼표 구분)')
+        parser.add_argument('--distinct', type=int, default=None,
+                            help='기능별 서로 다른 본문 수 (기본: 요청 수와 같음, 작게 주면 캐시/병합 효과 측정)')
+        parser.add_argument('--no-cache', action='store_true', help='regenerate 로 응답 캐시 우회')
+        parser.add_argument('--respect-limits', action='store_true', help='요청 한도(429)를 그대로 적용')
+        parser.add_argument('--allow-remote', action='store_true', help='OPENAI_BASE_URL 없이 실제 OpenAI API 사용 허용')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+
+    def handle(self, *args, **options):
+        if not ai_service or ai_service.dummy_mode:
+            raise CommandError("AI 서비스가 더미 모드입니다. OPENAI_BASE_URL 로 대역 서버(openai_standin)를 지정하세요.")
+        if not getattr(settings, 'OPENAI_BASE_URL', None) and not options['allow_remote']:
+            raise CommandError("실제 OpenAI API 크레딧이 사용됩니다. 의도한 경우 --allow-remote 를 지정하세요.")
+
+        features = [feature.strip() for feature in options['features'].split(',') if feature.strip()]
+        unknown = set(features) - set(FEATURES)
+        if unknown:
+            raise CommandError(f"알 수 없는 기능: {', '.join(sorted(unknown))}")
+
+        user, _ = get_user_model().objects.get_or_create(username='ai_bench', defaults={'email': 'ai_bench@localhost'})
+        limiter_enabled = rate_limiter.enabled
+        rate_limiter.enabled = options['respect_limits']
+
+        # 기능이 섞여서 들어오도록 교차 배치
+        distinct = options['distinct'] or options['requests']
+        jobs = [
+            (feature, f"[{feature} #{index % distinct}] " + SAMPLE * 2)
+            for index in range(options['requests'])
+            for feature in features
+        ]
+
+        local = threading.local()
+        host = next((h for h in settings.ALLOWED_HOSTS if '*' not in h), 'localhost')
+
+        def run(job):
+            feature, text = job
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST=host)
+                local.client.force_login(user)
+            url_name, payload = FEATURES[feature]
+            body = payload(text)
+            body['regenerate'] = options['no_cache']
+
+            started = time.perf_counter()
+            try:
+                response = local.client.post(reverse(url_name), json.dumps(body), content_type='application/json')
+                data = b''.join(response.streaming_content) if response.streaming else response.content
+                ok = response.status_code == 200 and json.loads(data).get('success', False)
+                status = response.status_code
+            except Exception as e:
+                ok, status = False, type(e).__name__
+            finally:
+                close_old_connections()
+            return feature, ok, status, (time.perf_counter() - started) * 1000
+
+        before = ai_metrics.snapshot()['counters']
+        self.stdout.write(f"AI 엔드포인트 측정 시작 - {len(jobs)}건, 동시 {options['concurrency']}")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(run, jobs))
+        elapsed = time.perf_counter() - started
+
+        rate_limiter.enabled = limiter_enabled
+        usage_recorder.flush()
+
+        report = {'elapsed_seconds': round(elapsed, 3), 'features': {}}
+        for feature in features + ['all']:
+            rows = [row for row in results if feature == 'all' or row[0] == feature]
+            latencies = [row[3] for row in rows]
+            errors = {}
+            for row in rows:
+                if not row[1]:
+                    errors[str(row[2])] = errors.get(str(row[2]), 0) + 1
+            report['features'][feature] = {
+                'requests': len(rows),
+                'ok': sum(1 for row in rows if row[1]),
+                'errors': errors,
+                'throughput': round(len(rows) / elapsed, 2) if elapsed else None,
+                'p50_ms': round(percentile(latencies, 0.50), 1) if latencies else None,
+                'p95_ms': round(percentile(latencies, 0.95), 1) if latencies else None,
+                'p99_ms': round(percentile(latencies, 0.99), 1) if latencies else None,
+                'max_ms': round(max(latencies), 1) if latencies else None,
+            }
+
+        # 측정 중 증가한 AI 지표 (캐시 적중, 재시도, 병합 등)
+        after = ai_metrics.snapshot()['counters']
+        report['counters'] = {name: value - before.get(name, 0) for name, value in sorted(after.items())
+                              if value - before.get(name, 0)}
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"{'기능':<14}{'요청':>6}{'성공':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        for feature, row in report['features'].items():
+            self.stdout.write(
+                f"{feature:<14}{row['requests']:>6}{row['ok']:>6}{row['throughput']:>9}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}"
+            )
+            if row['errors']:
+                self.stdout.write(f"  실패: {row['errors']}")
+        self.stdout.write(f"소요 시간: {elapsed:.2f}초")
+        for name, value in report['counters'].items():
+            self.stdout.write(f"  {name}: {value}")
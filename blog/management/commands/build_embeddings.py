@@ -0,0 +1,17 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from blog.semantic import semantic_index
+
+
+# 의미 검색 임베딩 전체 재구축 (최초 구축, 임베딩 공급자/차원 변경 후 등)
+class Command(BaseCommand):
+    help = "모든 게시글의 임베딩을 다시 계산해 의미 검색 벡터 인덱스를 새로 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256, help='한 번에 임베딩할 게시글 수')
+
+    def handle(self, *args, **options):
+        result = semantic_index.rebuild(batch_size=options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"임베딩 인덱스 구축 완료 - {json.dumps(result, ensure_ascii=False)}"))
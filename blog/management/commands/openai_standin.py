@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from blog.ai_standin import StandinConfig, make_server
+
+
+# 로컬 OpenAI chat completions API 대역 서버 (부하 테스트용, 크레딧 사용 없음)
+# 사용: OPENAI_BASE_URL=http://127.0.0.1:8765/v1 로 앱을 실행
+class Command(BaseCommand):
+    help = "부하 테스트용 OpenAI chat completions API 대역 서버를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency-ms', type=float, default=300.0, help='응답 지연 중앙값 (ms)')
+        parser.add_argument('--latency-sigma', type=float, default=0.5, help='응답 지연 로그 정규분포 분산 (0이면 고정 지연)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='500 오류 응답 비율 (0~1)')
+        parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='429 응답 비율 (0~1)')
+        parser.add_argument('--retry-after', type=float, default=1.0, help='429 응답의 Retry-After (초)')
+        parser.add_argument('--tokens-per-second', type=float, default=50.0, help='스트리밍 출력 속도')
+        parser.add_argument('--seed', type=int, default=0, help='지연/오류 난수 시드')
+
+    def handle(self, *args, **options):
+        config = StandinConfig(
+            latency_ms=options['latency_ms'],
+            latency_sigma=options['latency_sigma'],
+            error_rate=options['error_rate'],
+            rate_limit_rate=options['rate_limit_rate'],
+            retry_after=options['retry_after'],
+            tokens_per_second=options['tokens_per_second'],
+            seed=options['seed'],
+        )
+        server = make_server(options['host'], options['port'], config)
+        self.stdout.write(self.style.SUCCESS(
+            f"OpenAI 대역 서버 실행 중 - http://{options['host']}:{options['port']}/v1 "
+            f"(지연 {config.latency_ms:.0f}ms, 오류 {config.error_rate:.0%}, 429 {config.rate_limit_rate:.0%})"
+        ))
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write("OpenAI 대역 서버 종료")
+        finally:
+            server.server_close()
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog.ai_cache import DatabaseCacheBackend
+
+
+# 만료된 AI 응답 캐시 정리 (cron 등에서 주기 실행)
+class Command(BaseCommand):
+    help = "만료된 AI 응답 캐시를 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='만료 여부와 관계없이 모든 캐시 삭제')
+
+    def handle(self, *args, **options):
+        backend = DatabaseCacheBackend()
+
+        if options['all']:
+            backend.clear()
+            self.stdout.write(self.style.SUCCESS("AI 응답 캐시를 모두 삭제했습니다."))
+            return
+
+        deleted = backend.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"만료된 AI 응답 캐시 {deleted}건을 삭제했습니다."))
@@ -0,0 +1,18 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild
+
+
+# 관련 게시글 전체 재계산 (최초 구축, 대량 가져오기 후 등)
+class Command(BaseCommand):
+    help = "모든 게시글의 문서 벡터와 관련 게시글(상위 k개)을 여러 프로세스로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수 (기본: CPU 코어 수)')
+        parser.add_argument('--batch-size', type=int, default=256, help='프로세스당 한 번에 처리할 게시글 수')
+
+    def handle(self, *args, **options):
+        result = rebuild(workers=options['workers'], batch_size=options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"관련 게시글 재계산 완료 - {json.dumps(result, ensure_ascii=False)}"))
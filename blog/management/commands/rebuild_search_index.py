@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import search
+
+
+# 전문 검색 색인 전체 재구축 (대량 가져오기, raw SQL 로 게시글을 수정한 뒤 등)
+class Command(BaseCommand):
+    help = "모든 게시글의 전문 검색 색인(SQLite FTS5 / PostgreSQL tsvector)을 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError("이 데이터베이스에서는 전문 검색 색인을 사용할 수 없습니다. (migrate 를 먼저 실행하세요)")
+        count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"전문 검색 색인 재구축 완료 - 게시글 {count}개"))
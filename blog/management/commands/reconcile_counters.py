@@ -0,0 +1,18 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from blog.counters import reconcile
+
+
+# 좋아요/댓글/팔로워 카운터 보정 (사용자 삭제 등 연쇄 삭제, 수동 DB 수정 후)
+class Command(BaseCommand):
+    help = "게시글 좋아요/댓글 수와 사용자 팔로워/팔로잉 수 카운터를 실제 개수와 비교해 보정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 확인할 행 수')
+        parser.add_argument('--dry-run', action='store_true', help='보정하지 않고 불일치 건수만 출력')
+
+    def handle(self, *args, **options):
+        result = reconcile(batch_size=options['batch_size'], dry_run=options['dry_run'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"카운터 확인 완료 - {json.dumps(result, ensure_ascii=False)}"))
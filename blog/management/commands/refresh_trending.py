@@ -0,0 +1,14 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from blog.trending import rebuild
+
+
+# 인기 점수 재계산 (cron 등으로 주기 실행 - 좋아요 취소/댓글 삭제 반영, 식은 게시글 제외)
+class Command(BaseCommand):
+    help = "최근 게시글 작성, 좋아요, 댓글, 일별 조회수로 시간 감쇠 인기 점수를 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        result = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"인기 점수 재계산 완료 - {json.dumps(result, ensure_ascii=False)}"))
@@ -0,0 +1,58 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog.ai_jobs import AIJobWorker, job_queue_stats
+
+
+# 백그라운드 AI 작업 처리 워커 (게시글 요약 생성 등)
+class Command(BaseCommand):
+    help = "대기 중인 AI 작업(요약 생성 등)을 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None, help='동시에 처리할 작업 수')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='대기열이 비었을 때 확인 간격(초)')
+        parser.add_argument('--once', action='store_true', help='현재 대기 중인 작업만 처리하고 종료')
+        parser.add_argument('--stats', action='store_true', help='대기열 상태만 출력')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(job_queue_stats(), ensure_ascii=False, indent=2))
+            return
+
+        concurrency = options['concurrency'] or getattr(settings, 'AI_JOB_CONCURRENCY', 2)
+        worker = AIJobWorker()
+        self.stdout.write(f"AI 작업 워커 시작 - {worker.worker_id}, 동시 처리: {concurrency}")
+
+        processed = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                while True:
+                    worker.release_stale()
+                    job_ids = worker.claim(concurrency)
+
+                    if not job_ids:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    results = list(executor.map(lambda job_id: self.run_job(worker, job_id), job_ids))
+                    processed += len(results)
+                    self.stdout.write(f"AI 작업 {len(results)}건 처리 (성공 {sum(results)}건)")
+            except KeyboardInterrupt:
+                self.stdout.write("AI 작업 워커 종료 요청")
+
+        self.stdout.write(self.style.SUCCESS(f"AI 작업 워커 종료 - 총 {processed}건 처리"))
+
+    # 스레드별 DB 연결 정리 후 작업 실행
+    def run_job(self, worker, job_id):
+        close_old_connections()
+        try:
+            return worker.run(job_id)
+        finally:
+            close_old_connections()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_aiusagelog_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='cached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='completion_tokens',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='estimated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='latency_ms',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='model',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='aiusagelog',
+            name='prompt_tokens',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_aiusagelog_token_usage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiusagelog',
+            index=models.Index(fields=['user', 'created_at'], name='blog_aiusag_user_id_fe7597_idx'),
+        ),
+    ]
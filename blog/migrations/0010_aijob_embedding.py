@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_related_posts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aijob',
+            name='job_type',
+            field=models.CharField(choices=[('summary', '요약 생성'), ('embedding', '임베딩 생성')], default='summary', max_length=20),
+        ),
+    ]
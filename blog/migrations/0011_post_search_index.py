@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from blog import search
+
+    search.create_schema(schema_editor)
+    search.rebuild(apps.get_model('blog', 'Post'))
+
+
+def drop_index(apps, schema_editor):
+    from blog import search
+
+    search.drop_schema(schema_editor)
+
+
+# 게시글 전문 검색 색인 (SQLite FTS5 / PostgreSQL tsvector + GIN, 그 외 DB 는 건너뜀)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_aijob_embedding'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('unlikes', models.PositiveIntegerField(default=0)),
+                ('sketch', models.BinaryField(default=b'')),
+                ('uniques', models.PositiveIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='blog.post')),
+            ],
+            options={
+                'ordering': ['post', 'date'],
+                'indexes': [models.Index(fields=['date'], name='blog_postda_date_f6d414_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'date'), name='unique_post_daily_stats')],
+            },
+        ),
+    ]
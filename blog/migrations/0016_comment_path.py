@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+PATH_WIDTH = 10
+
+
+# 기존 댓글 경로 채우기 (부모 댓글은 항상 자식보다 id 가 작음)
+def fill_paths(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    paths = {}
+    batch = []
+    for comment_id, parent_id in Comment.objects.order_by('id').values_list('id', 'parent_id').iterator():
+        segment = str(comment_id).zfill(PATH_WIDTH)
+        paths[comment_id] = f'{paths[parent_id]}.{segment}' if parent_id in paths else segment
+        batch.append(Comment(id=comment_id, path=paths[comment_id]))
+        if len(batch) >= 1000:
+            Comment.objects.bulk_update(batch, ['path'])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ['path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'parent', 'id'], name='comment_root_idx'),
+        ),
+    ]
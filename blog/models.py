@@ -1,6 +1,11 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
+
+from .page_cache import page_cache
 
 User = get_user_model()
 
@@ -30,6 +35,9 @@ class Post(models.Model):
     tags = models.ManyToManyField(Tag, blank=True)
     image = models.ImageField(upload_to="posts/", blank=True, null=True)
     views = models.PositiveIntegerField(default=0)
+    # 좋아요/댓글 수 (Like/Comment 생성/삭제와 같은 트랜잭션에서 갱신, reconcile_counters 로 보정)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
     is_ai_assisted = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -37,6 +45,12 @@ class Post(models.Model):
     class Meta:
         # 최신순(내림차순)으로 게시물 목록 정렬 기준
         ordering = ["-created_at"]
+        # 목록 정렬/커서 페이지네이션 키 (blog/pagination.py SORT_ORDERINGS)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='post_latest_idx'),
+            models.Index(fields=['-like_count', '-created_at', '-id'], name='post_likes_idx'),
+            models.Index(fields=['-views', '-created_at', '-id'], name='post_views_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -47,7 +61,7 @@ class Post(models.Model):
 
     # 좋아요 수 반환
     def get_like_count(self):
-        return self.likes.count()
+        return self.like_count
     
     # 특정 사용자가 좋아요 했는지 확인
     def is_liked_by(self, user):
@@ -60,14 +74,30 @@ class Post(models.Model):
         if not user.is_authenticated:
             return False, 0
         
-        like, created = Like.objects.get_or_create(user=user, post=self)
-        if not created:
-            # 이미 좋아요한 경우 -> 취소
-            like.delete()
-            return False, self.get_like_count()
-        else:
-            # 새로 좋아요
-            return True, self.get_like_count()
+        with transaction.atomic():
+            deleted, _ = Like.objects.filter(user=user, post=self).delete()
+            if deleted:
+                # 이미 좋아요한 경우 -> 취소
+                delta = -1
+            else:
+                # 새로 좋아요 (동시 요청으로 이미 생성된 경우 카운터는 그대로)
+                try:
+                    with transaction.atomic():
+                        Like.objects.create(user=user, post=self)
+                    delta = 1
+                except IntegrityError:
+                    delta = 0
+
+            if delta:
+                self.adjust_counter('like_count', delta)
+                page_cache.invalidate_post(self.pk)
+            self.like_count = Post.objects.filter(pk=self.pk).values_list('like_count', flat=True).first()
+
+        return not deleted, self.like_count
+
+    # 카운터 원자적 증감 (음수가 되지 않도록)
+    def adjust_counter(self, field, delta):
+        Post.objects.filter(pk=self.pk).update(**{field: Greatest(F(field) + delta, 0)})
 
 # 댓글 데이터 정의 모델(대댓글 포함)
 class Comment(models.Model):
@@ -77,13 +107,50 @@ class Comment(models.Model):
     parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, blank=True)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # 경로 (최상위 댓글부터 자신까지의 id, 10자리 0 채움을 '.' 로 연결)
+    # 경로 순서 = 스레드별 깊이 우선 순서이므로 스레드 하나를 경로 범위 조회 한 번으로 가져옴
+    path = models.CharField(max_length=255, default='', editable=False)
+
+    PATH_WIDTH = 10
+    PATH_SEPARATOR = '.'
+    # 경로 길이 제한 안에서 허용하는 최대 깊이 (넘으면 부모의 형제로 붙임)
+    MAX_DEPTH = 255 // (PATH_WIDTH + 1)
 
     class Meta:
         # 오래된순(오름차순)으로 댓글/리뷰 정렬기준
         ordering = ['created_at']
+        indexes = [
+            # 스레드(답글) 경로 범위 조회
+            models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+            # 최상위 댓글 페이지 (parent IS NULL, id 순)
+            models.Index(fields=['post', 'parent', 'id'], name='comment_root_idx'),
+        ]
 
     def __str__(self):
         return f'{self.author.username} : {self.content[:50]}'
+
+    @classmethod
+    def make_path(cls, parent_path: str, comment_id: int) -> str:
+        segment = str(comment_id).zfill(cls.PATH_WIDTH)
+        return f'{parent_path}{cls.PATH_SEPARATOR}{segment}' if parent_path else segment
+
+    # 깊이 (최상위 댓글 0)
+    @property
+    def depth(self) -> int:
+        return self.path.count(self.PATH_SEPARATOR)
+
+    # 스레드(최상위 댓글) 경로
+    @property
+    def thread_path(self) -> str:
+        return self.path[:self.PATH_WIDTH]
+
+    # 새 댓글은 id 가 정해진 뒤 경로 저장
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if not self.path:
+            parent_path = self.parent.path if self.parent_id else ''
+            self.path = self.make_path(parent_path, self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
     
 # AI 사용횟수 정의 모델
 class AIUsageLog(models.Model):
@@ -95,13 +162,150 @@ class AIUsageLog(models.Model):
     ]
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     feature_type = models.CharField(max_length=20, choices=FEATURE_CHOICES)
+    # 총 토큰 수 (입력 + 출력)
     tokens_used = models.IntegerField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    model = models.CharField(max_length=50, blank=True)
+    latency_ms = models.IntegerField(default=0)
+    # 응답 캐시/요청 병합으로 API 호출 없이 제공된 결과
+    cached = models.BooleanField(default=False)
+    # 실제 사용량이 없어 로컬 토크나이저로 추정한 값
+    estimated = models.BooleanField(default=False)
+    # 버퍼링 후 일괄 저장되므로 실제 사용 시각을 그대로 기록
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # 사용자별 기간 토큰 합계 조회 (토큰 예산)
+        indexes = [models.Index(fields=['user', 'created_at'])]
 
     def __str__(self):
         # 사용자명 - 기능유형
         return f'{self.user.username} - {self.feature_type}'
     
+# AI 응답 캐시 (영속 계층)
+class AIResponseCache(models.Model):
+    # 정규화된 요청의 SHA-256 해시
+    key = models.CharField(max_length=64, unique=True)
+    feature_type = models.CharField(max_length=20, blank=True)
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.feature_type or "-"} : {self.key[:12]}'
+
+# 진행 중인 AI 요청 잠금 (워커 프로세스 간 동일 요청 병합용)
+class AIInflightLock(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    owner = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.key[:12]} ({self.owner})'
+
+# 백그라운드 AI 작업 큐 (DB 기반)
+class AIJob(models.Model):
+    JOB_TYPE_CHOICES = [
+        ('summary', '요약 생성'),
+        ('embedding', '임베딩 생성'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+    job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default='summary')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='ai_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # 작업 생성 시점의 본문 해시 (처리 전 본문이 바뀌었는지 확인)
+    content_hash = models.CharField(max_length=64, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    # 재시도 대기(백오프) 시각
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f'{self.job_type} #{self.post_id} ({self.status})'
+
+# 관련 게시글 계산용 문서 벡터 (문자 n-gram 해시 인덱스 + 가중치, 배열 바이트로 저장)
+class PostVector(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='vector')
+    # int32 특징 인덱스 / float16 가중치 (1 + log(tf))
+    indices = models.BinaryField()
+    weights = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f'vector #{self.post_id}'
+
+# 게시글별 미리 계산된 관련 게시글 (상위 k개)
+class RelatedPost(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['post', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='unique_related_post'),
+        ]
+        # 상세 페이지에서 게시글별 순위 순 조회
+        indexes = [models.Index(fields=['post', 'rank'])]
+
+    def __str__(self):
+        return f'#{self.post_id} -> #{self.related_id} ({self.score:.3f})'
+
+# 게시글 일별 통계 (조회수, 좋아요, 순방문자 HyperLogLog 스케치)
+class PostDailyStats(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    unlikes = models.PositiveIntegerField(default=0)
+    # HyperLogLog 레지스터 (zlib 압축, 기간별 순방문자는 스케치를 합쳐 계산)
+    sketch = models.BinaryField(default=b'')
+    # 해당 일의 순방문자 추정값 (일별 그래프용)
+    uniques = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['post', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'date'], name='unique_post_daily_stats'),
+        ]
+        indexes = [models.Index(fields=['date'])]
+
+    def __str__(self):
+        return f'#{self.post_id} {self.date} (조회 {self.views}, 순방문 {self.uniques})'
+
+# 게시글 인기 점수 (시간 감쇠 - blog/trending.py, log 공간 값이라 시간이 지나도 순서 유지)
+class TrendingScore(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField()
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        # 인기순 목록은 이 인덱스 범위 조회 한 번 (동순위는 게시글 id 역순)
+        indexes = [models.Index(fields=['-score', '-post'], name='trending_score_idx')]
+
+    def __str__(self):
+        return f'#{self.post_id} ({self.score:.3f})'
+
 # 게시글 좋아요 모델
 class Like(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='likes')
@@ -0,0 +1,179 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.html import escape
+
+from . import ai_metrics
+
+# 캐시된 화면에 들어가는 사용자별 값 자리 (응답할 때 요청한 사용자의 값으로 바꿈)
+VIEWER_NAME_PLACEHOLDER = '__smartblog_viewer_name__'
+CSRF_TOKEN_PLACEHOLDER = '__smartblog_csrf_token__'
+
+KEY_PREFIX = 'page'
+
+
+# 게시글 목록/상세 화면 캐시
+# - 키: 화면 종류 + 세대(게시글/목록 변경 시 증가) + 비로그인/로그인 변형 + 경로와 정렬된 쿼리 문자열
+# - 로그인 사용자도 같은 화면(좋아요 여부 등이 빠진 셸)을 받고, 사용자별 상태는 viewer-state API 로 채움
+# - 신선 기간(PAGE_CACHE_TTL)이 지나면 한 요청만 다시 렌더링하고 나머지는 만료된 화면을 그대로 받음
+#   (stale-while-revalidate, cache.add 잠금으로 동시 재계산 방지)
+class PageCache:
+    def __init__(self):
+        self.enabled = getattr(settings, 'PAGE_CACHE_ENABLED', True)
+        self.members = getattr(settings, 'PAGE_CACHE_MEMBERS', True)
+        self.ttl = getattr(settings, 'PAGE_CACHE_TTL', 60)
+        self.stale = getattr(settings, 'PAGE_CACHE_STALE', 5 * 60)
+        self.lock_timeout = getattr(settings, 'PAGE_CACHE_LOCK_TIMEOUT', 10)
+        self.wait = getattr(settings, 'PAGE_CACHE_WAIT', 0.1)
+
+    # 캐시 가능한 요청 (GET, 플래시 메시지가 없는 경우)
+    def cacheable(self, request) -> bool:
+        if not self.enabled or request.method not in ('GET', 'HEAD'):
+            return False
+        if request.user.is_authenticated and not self.members:
+            return False
+        if request.COOKIES.get('messages') or request.session.get('_messages'):
+            return False
+        return True
+
+    def variant(self, request) -> str:
+        return 'member' if request.user.is_authenticated else 'anon'
+
+    def _generation_key(self, scope: str) -> str:
+        return f'{KEY_PREFIX}:gen:{scope}'
+
+    # 세대 값이 캐시에서 밀려나도 이전 값과 겹치지 않도록 현재 시각(ms)으로 시작
+    def generation(self, scope: str) -> int:
+        return cache.get_or_set(self._generation_key(scope), lambda: int(time.time() * 1000), None)
+
+    # 세대를 올려 해당 화면의 기존 캐시를 모두 무효화 (기존 항목은 만료 시간에 정리됨)
+    def _bump(self, scope: str):
+        key = self._generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), None)
+        ai_metrics.incr('page_cache.invalidated')
+
+    # 트랜잭션 안에서 호출되면 커밋 후에 무효화 (커밋 전 데이터로 다시 캐시되지 않도록)
+    def invalidate_post(self, post_id):
+        transaction.on_commit(lambda: self._bump(f'post:{post_id}'))
+
+    def invalidate_list(self):
+        transaction.on_commit(lambda: self._bump('list'))
+
+    def key(self, request, scope: str) -> str:
+        query = '&'.join(sorted(f'{name}={value}' for name, values in request.GET.lists() for value in values))
+        digest = hashlib.blake2b(f'{request.path}?{query}'.encode('utf-8'), digest_size=16).hexdigest()
+        return f'{KEY_PREFIX}:{scope}:{self.generation(scope)}:{self.variant(request)}:{digest}'
+
+    # 캐시 조회/저장 후 사용자별 응답 (render: 캐시가 없을 때 응답을 만드는 함수, on_hit: 캐시 응답 시 실행)
+    def serve(self, request, scope: str, render, on_hit=None):
+        key = self.key(request, scope)
+        lock_key = f'{key}:lock'
+        entry = cache.get(key)
+        now = time.time()
+
+        if entry and now - entry['created'] < self.ttl:
+            ai_metrics.incr('page_cache.hit')
+            return self._respond(request, entry, 'HIT', on_hit)
+
+        if entry:
+            # 만료된 화면: 한 요청만 다시 렌더링, 나머지는 만료된 화면으로 응답
+            if not cache.add(lock_key, 1, self.lock_timeout):
+                ai_metrics.incr('page_cache.stale')
+                return self._respond(request, entry, 'STALE', on_hit)
+            ai_metrics.incr('page_cache.revalidate')
+            return self._render(request, key, lock_key, render)
+
+        if cache.add(lock_key, 1, self.lock_timeout):
+            ai_metrics.incr('page_cache.miss')
+            return self._render(request, key, lock_key, render)
+
+        # 다른 요청이 렌더링 중이면 한 번만 짧게 기다려 그 결과를 쓰고, 아직 없으면 직접 렌더링
+        # (반복 확인으로 워커를 붙잡지 않도록 대기는 PAGE_CACHE_WAIT 1회로 제한)
+        if self.wait:
+            time.sleep(self.wait)
+            entry = cache.get(key)
+            if entry:
+                ai_metrics.incr('page_cache.coalesced')
+                return self._respond(request, entry, 'HIT', on_hit)
+        ai_metrics.incr('page_cache.wait_timeout')
+        return self._personalize(request, self._render_response(render), 'MISS')
+
+    def _render_response(self, render):
+        response = render()
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        return response
+
+    def _render(self, request, key, lock_key, render):
+        try:
+            response = self._render_response(render)
+            if response.status_code == 200 and not response.streaming:
+                entry = {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'created': time.time(),
+                }
+                cache.set(key, entry, self.ttl + self.stale)
+        finally:
+            cache.delete(lock_key)
+        return self._personalize(request, response, 'MISS')
+
+    def _respond(self, request, entry, status, on_hit):
+        if on_hit:
+            on_hit()
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        return self._personalize(request, response, status)
+
+    # 자리 표시값을 요청한 사용자의 이름, CSRF 토큰으로 교체
+    def _personalize(self, request, response, status):
+        if response.status_code == 200 and not response.streaming:
+            content = response.content
+            content = content.replace(CSRF_TOKEN_PLACEHOLDER.encode(), get_token(request).encode())
+            name = escape(request.user.username) if request.user.is_authenticated else ''
+            response.content = content.replace(VIEWER_NAME_PLACEHOLDER.encode(), name.encode('utf-8'))
+        response['X-Page-Cache'] = status
+        return response
+
+
+page_cache = PageCache()
+
+
+# 목록/상세 뷰용 화면 캐시 (page_cache_scope 로 세대 범위 지정)
+class PageCacheMixin:
+    viewer_shell = False
+
+    def get_page_cache_scope(self) -> str:
+        raise NotImplementedError
+
+    # 캐시된 화면으로 응답할 때 실행 (조회수 증가 등)
+    def page_cache_hit(self):
+        pass
+
+    def get(self, request, *args, **kwargs):
+        if not page_cache.cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        self.viewer_shell = True
+        return page_cache.serve(
+            request,
+            self.get_page_cache_scope(),
+            lambda: super(PageCacheMixin, self).get(request, *args, **kwargs),
+            on_hit=self.page_cache_hit,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.viewer_shell:
+            # 사용자별 값은 자리 표시값으로 렌더링 (page_cache._personalize 에서 교체)
+            context['viewer_shell'] = True
+            context['viewer_name'] = VIEWER_NAME_PLACEHOLDER
+            context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+        return context
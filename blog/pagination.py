@@ -0,0 +1,106 @@
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# 정렬 기준별 ORDER BY (마지막은 항상 고유한 id - 같은 값이 많아도 순서가 고정됨)
+SORT_ORDERINGS = {
+    'latest': ('-created_at', '-id'),
+    'oldest': ('created_at', 'id'),
+    'likes': ('-like_count', '-created_at', '-id'),
+    'views': ('-views', '-created_at', '-id'),
+    # 인기순 (trending_score, trending_id 어노테이션 - 점수 테이블 인덱스 순서 그대로)
+    'trending': ('-trending_score', '-trending_id'),
+    # 검색 관련도 (search_rank 어노테이션이 있는 경우)
+    'relevance': ('search_rank', '-created_at', '-id'),
+}
+
+CURSOR_SALT = 'blog.pagination.cursor'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def _field(ordering: str) -> str:
+    return ordering.lstrip('-')
+
+
+# 불투명 커서 (정렬 기준 + 마지막 항목의 정렬 키 값, 서명되어 변조 불가)
+# orderings: 정렬 기준별 ORDER BY (기본은 게시글 목록, 댓글 등 다른 목록은 자체 정렬표 사용)
+def encode_cursor(sort: str, obj, orderings=SORT_ORDERINGS) -> str:
+    values = []
+    for ordering in orderings[sort]:
+        value = getattr(obj, _field(ordering))
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    return signing.dumps([sort, values], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor: str, sort: str, model, orderings=SORT_ORDERINGS) -> list:
+    try:
+        cursor_sort, values = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, ValueError, TypeError) as e:
+        raise InvalidCursor("잘못된 커서입니다.") from e
+    if cursor_sort != sort or len(values) != len(orderings[sort]):
+        raise InvalidCursor("정렬 기준이 다른 커서입니다.")
+
+    decoded = []
+    for ordering, value in zip(orderings[sort], values):
+        name = _field(ordering)
+        try:
+            field = model._meta.get_field(name)
+        except Exception:
+            # 어노테이션 (search_rank, trending_score, trending_id)
+            decoded.append(value)
+            continue
+        decoded.append(field.to_python(value))
+    return decoded
+
+
+# 커서 이후 행 조건: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... (내림차순 키는 <)
+def keyset_filter(sort: str, values: list, orderings=SORT_ORDERINGS) -> Q:
+    condition = Q()
+    equal = {}
+    for ordering, value in zip(orderings[sort], values):
+        name = _field(ordering)
+        lookup = 'lt' if ordering.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+# 커서 기반 페이지: (항목 목록, 다음 커서 또는 None) - 전체 개수를 세지 않고 limit + 1 개만 읽음
+def paginate_keyset(queryset, sort: str, cursor: str = None, limit: int = 10, orderings=SORT_ORDERINGS):
+    queryset = queryset.order_by(*orderings[sort])
+    if cursor:
+        queryset = queryset.filter(
+            keyset_filter(sort, decode_cursor(cursor, sort, queryset.model, orderings), orderings)
+        )
+
+    items = list(queryset[:limit + 1])
+    has_next = len(items) > limit
+    items = items[:limit]
+    next_cursor = encode_cursor(sort, items[-1], orderings) if has_next and items else None
+    return items, next_cursor
+
+
+# 앞쪽 max_pages 페이지만 번호로 보여주는 Paginator
+# 전체 COUNT(*) 대신 max_pages 페이지 + 1 행까지만 세므로 게시글 수와 무관하게 비용이 일정함
+class CappedPaginator(Paginator):
+    def __init__(self, *args, max_pages=5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_pages = max_pages
+
+    @cached_property
+    def count(self):
+        limit = self.max_pages * self.per_page
+        return len(self.object_list.values_list('pk', flat=True)[:limit + 1])
+
+    # 번호 페이지 이후에도 게시글이 남아 있는지 (커서 기반 "더 보기"로 이어서 조회)
+    @property
+    def truncated(self) -> bool:
+        return self.count > self.max_pages * self.per_page
+
+    @cached_property
+    def num_pages(self):
+        return min(super().num_pages, self.max_pages)
@@ -0,0 +1,364 @@
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# 문자 n-gram 크기와 특징 해싱 차원
+NGRAM_SIZES = (2, 3)
+FEATURE_DIM = 2 ** 20
+TITLE_WEIGHT = 3
+MAX_CONTENT_CHARS = 20000
+
+_NON_WORD = re.compile(r'[^0-9a-z가-힣]+')
+
+# 행렬을 다시 만들지 않고 따로 보관할 최대 변경 게시글 수 (넘으면 다음 계산 때 전체 행렬 재구성)
+MAX_PENDING_ROWS = 256
+
+
+# 어절 경계를 포함한 문자 n-gram (" 장고", "장고 " 처럼 앞뒤 공백으로 어절 시작/끝 구분)
+def char_ngrams(text: str) -> Counter:
+    grams = Counter()
+    for word in _NON_WORD.sub(' ', text.lower()).split():
+        padded = f' {word} '
+        for size in NGRAM_SIZES:
+            for i in range(len(padded) - size + 1):
+                grams[padded[i:i + size]] += 1
+    return grams
+
+
+# 게시글 벡터 (정렬된 int32 해시 인덱스, float32 가중치 1 + log(tf))
+def vectorize(title: str, content: str):
+    counts = Counter()
+    for gram, count in char_ngrams(title).items():
+        counts[zlib.crc32(gram.encode('utf-8')) % FEATURE_DIM] += count * TITLE_WEIGHT
+    for gram, count in char_ngrams(content[:MAX_CONTENT_CHARS]).items():
+        counts[zlib.crc32(gram.encode('utf-8')) % FEATURE_DIM] += count
+
+    indices = np.array(sorted(counts), dtype=np.int32)
+    weights = 1 + np.log(np.array([counts[index] for index in indices], dtype=np.float32))
+    return indices, weights
+
+
+# 여러 게시글 벡터화 (rebuild_related_posts 의 작업 프로세스에서 실행)
+def vectorize_rows(rows):
+    return [(post_id, *vectorize(title, content)) for post_id, title, content in rows]
+
+
+def pack(indices, weights):
+    return indices.astype(np.int32).tobytes(), weights.astype(np.float16).tobytes()
+
+
+def unpack(indices, weights):
+    return np.frombuffer(bytes(indices), dtype=np.int32), np.frombuffer(bytes(weights), dtype=np.float16).astype(np.float32)
+
+
+# 문서 빈도로 IDF 계산
+def idf_from(df, count):
+    return (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+
+
+# 벡터 목록을 행 단위 L2 정규화된 TF-IDF CSR 행렬로 변환
+def tfidf_matrix(vectors, idf):
+    lengths = [len(indices) for indices, _ in vectors]
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    if not vectors:
+        return sparse.csr_matrix((0, FEATURE_DIM), dtype=np.float32)
+
+    indices = np.concatenate([indices for indices, _ in vectors])
+    data = np.concatenate([weights for _, weights in vectors]) * idf[indices]
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), FEATURE_DIM))
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags((1 / norms).astype(np.float32)).dot(matrix).tocsr()
+
+
+# 유사도 배열에서 자기 자신을 제외한 상위 k개 (위치, 점수)
+def top_k(similarities, k, exclude=None, min_score=0.0):
+    if exclude is not None:
+        similarities[exclude] = -1
+    k = min(k, len(similarities))
+    if k <= 0:
+        return []
+    candidates = np.argpartition(-similarities, k - 1)[:k]
+    ordered = candidates[np.argsort(-similarities[candidates])]
+    return [(int(position), float(similarities[position])) for position in ordered if similarities[position] > min_score]
+
+
+# 작업 프로세스 공유 상태 (rebuild_related_posts 의 Pool initializer 로 설정)
+_worker_state = {}
+
+
+def init_worker(matrix, ids, k, min_score):
+    _worker_state.update(matrix=matrix, ids=ids, k=k, min_score=min_score)
+
+
+# 행 구간 [start, end) 의 상위 k개 관련 게시글
+def block_neighbors(bounds):
+    start, end = bounds
+    matrix, ids = _worker_state['matrix'], _worker_state['ids']
+    similarities = matrix[start:end].dot(matrix.T).toarray()
+
+    result = []
+    for offset, row in enumerate(similarities):
+        neighbors = top_k(row, _worker_state['k'], exclude=start + offset, min_score=_worker_state['min_score'])
+        result.append((int(ids[start + offset]), [(int(ids[position]), score) for position, score in neighbors]))
+    return result
+
+
+# 관련 게시글 인덱스 (PostVector 의 벡터를 메모리 배열로 유지)
+# - 게시글 저장 시 upsert(): 벡터 저장, 해당 게시글의 상위 k개 계산, 새 게시글이 더 가까운 이웃 게시글 목록 갱신
+# - 다른 프로세스에서 저장된 벡터는 PostVector.updated_at 기준으로 반영
+# - 저장 시 TF-IDF 행렬 전체를 다시 만들지 않음: 바뀐 게시글의 이전 행은 제외 표시하고 새 행만 따로 계산
+#   (IDF 는 행렬을 만들 때 값으로 고정, 변경이 MAX_PENDING_ROWS 개를 넘으면 재구성)
+# - 전체 재계산은 rebuild_related_posts 명령으로 수행
+class RelatedPostIndex:
+    def __init__(self):
+        self.k = getattr(settings, 'RELATED_POSTS_K', 5)
+        self.min_score = getattr(settings, 'RELATED_POSTS_MIN_SCORE', 0.05)
+        self.update_candidates = getattr(settings, 'RELATED_POSTS_UPDATE_CANDIDATES', 50)
+
+        self._lock = threading.RLock()
+        self._vectors = {}
+        self._df = np.zeros(FEATURE_DIM, dtype=np.int32)
+        self._loaded = False
+        self._last_updated = None
+        self._matrix = None
+        self._ids = None
+        self._idf = None
+        self._positions = {}
+        # 행렬에서 제외된 행 (수정/삭제된 게시글의 이전 벡터)
+        self._dead = None
+        # 행렬을 만든 뒤 저장된 게시글의 행 {게시글 id: 1 x FEATURE_DIM 행}
+        self._pending = {}
+
+    def _set(self, post_id, vector):
+        old = self._vectors.pop(post_id, None)
+        if old is not None:
+            self._df[old[0]] -= 1
+        if vector is not None:
+            self._vectors[post_id] = vector
+            self._df[vector[0]] += 1
+        if self._matrix is None:
+            return
+
+        position = self._positions.get(post_id)
+        if position is not None:
+            self._dead[position] = True
+        self._pending.pop(post_id, None)
+        if vector is not None:
+            self._pending[post_id] = tfidf_matrix([vector], self._idf)
+        if len(self._pending) > MAX_PENDING_ROWS:
+            self._matrix = None
+
+    # 저장된 벡터 로드 (처음에는 전체, 이후에는 변경분만)
+    def _refresh(self):
+        from .models import PostVector
+
+        queryset = PostVector.objects.all()
+        if self._loaded and self._last_updated is not None:
+            queryset = queryset.filter(updated_at__gt=self._last_updated)
+
+        for post_id, indices, weights, updated_at in queryset.values_list(
+            'post_id', 'indices', 'weights', 'updated_at'
+        ).iterator(chunk_size=1000):
+            self._set(post_id, unpack(indices, weights))
+            if self._last_updated is None or updated_at > self._last_updated:
+                self._last_updated = updated_at
+        self._loaded = True
+
+    def _current_matrix(self):
+        if self._matrix is None:
+            self._ids = np.array(list(self._vectors), dtype=np.int64)
+            self._idf = idf_from(self._df, len(self._vectors))
+            self._matrix = tfidf_matrix([self._vectors[post_id] for post_id in self._ids], self._idf)
+            self._positions = {int(post_id): position for position, post_id in enumerate(self._ids)}
+            self._dead = np.zeros(len(self._ids), dtype=bool)
+            self._pending = {}
+        return self._matrix
+
+    # 게시글의 TF-IDF 행
+    def _row(self, post_id):
+        if post_id in self._pending:
+            return self._pending[post_id]
+        return self._matrix[self._positions[post_id]]
+
+    # 한 행과 모든 게시글의 유사도 (게시글 id 배열, 점수 배열 - 제외된 행은 -1)
+    def _similarities(self, row):
+        scores = self._current_matrix().dot(row.T).toarray().ravel()
+        scores[self._dead] = -1
+        ids = self._ids
+        if self._pending:
+            pending = sparse.vstack(list(self._pending.values())).dot(row.T).toarray().ravel()
+            ids = np.concatenate([ids, np.array(list(self._pending), dtype=np.int64)])
+            scores = np.concatenate([scores, pending])
+        return ids, scores
+
+    # 게시글 저장 시 벡터와 관련 게시글 갱신
+    def upsert(self, post):
+        from .models import PostVector, RelatedPost
+
+        indices, weights = vectorize(post.title, post.content)
+        packed_indices, packed_weights = pack(indices, weights)
+
+        with self._lock:
+            self._refresh()
+            PostVector.objects.update_or_create(
+                post_id=post.pk, defaults={'indices': packed_indices, 'weights': packed_weights}
+            )
+            self._set(post.pk, unpack(packed_indices, packed_weights))
+            self._current_matrix()
+
+            row = self._row(post.pk)
+            ids, similarities = self._similarities(row)
+            candidates = top_k(similarities, max(self.k, self.update_candidates), exclude=ids == post.pk,
+                               min_score=self.min_score)
+
+            # 수정 전에는 이 게시글을 관련 게시글로 가졌던 게시글도 새 유사도로 다시 판단
+            others = {int(ids[index]): score for index, score in candidates}
+            for other in RelatedPost.objects.filter(related_id=post.pk).values_list('post_id', flat=True):
+                if other not in others and other in self._vectors:
+                    others[other] = float(self._row(other).dot(row.T).toarray()[0, 0])
+
+        own = [(int(ids[index]), score) for index, score in candidates[:self.k]]
+        self._write(post.pk, own, others)
+
+    # 게시글 삭제 전 호출 - 이 게시글을 관련 게시글로 가진 게시글 목록을 다시 계산
+    def remove(self, post_id):
+        from .models import PostVector, RelatedPost
+
+        with self._lock:
+            self._refresh()
+            self._set(post_id, None)
+            affected = list(RelatedPost.objects.filter(related_id=post_id).values_list('post_id', flat=True))
+            PostVector.objects.filter(post_id=post_id).delete()
+            self._current_matrix()
+
+            entries = {}
+            for other in affected:
+                if other not in self._vectors:
+                    continue
+                ids, similarities = self._similarities(self._row(other))
+                entries[other] = [
+                    (int(ids[index]), score)
+                    for index, score in top_k(similarities, self.k, exclude=ids == other, min_score=self.min_score)
+                ]
+
+        with transaction.atomic():
+            RelatedPost.objects.filter(post_id__in=list(entries)).delete()
+            RelatedPost.objects.bulk_create([
+                RelatedPost(post_id=other, related_id=related, score=score, rank=rank)
+                for other, neighbors in entries.items()
+                for rank, (related, score) in enumerate(neighbors)
+            ])
+
+    # 게시글의 관련 게시글 저장 + 새 게시글이 기존 k번째보다 가까운 이웃 게시글 목록에 반영
+    def _write(self, post_id, own, others):
+        from .models import RelatedPost
+
+        with transaction.atomic():
+            current = {}
+            for other, related, score in RelatedPost.objects.filter(post_id__in=list(others)).values_list(
+                'post_id', 'related_id', 'score'
+            ):
+                current.setdefault(other, []).append((related, score))
+
+            changed = {}
+            for other, score in others.items():
+                neighbors = [(related, value) for related, value in current.get(other, []) if related != post_id]
+                if score <= self.min_score or (len(neighbors) >= self.k and score <= min(value for _, value in neighbors)):
+                    # 기존 목록에 이 게시글이 있었다면 빠진 것이므로 갱신
+                    if len(neighbors) != len(current.get(other, [])):
+                        changed[other] = sorted(neighbors, key=lambda item: -item[1])[:self.k]
+                    continue
+                neighbors.append((post_id, score))
+                changed[other] = sorted(neighbors, key=lambda item: -item[1])[:self.k]
+
+            RelatedPost.objects.filter(post_id__in=[post_id, *changed]).delete()
+            RelatedPost.objects.bulk_create([
+                RelatedPost(post_id=owner, related_id=related, score=score, rank=rank)
+                for owner, neighbors in [(post_id, own), *changed.items()]
+                for rank, (related, score) in enumerate(neighbors)
+            ])
+
+    # 메모리 인덱스 초기화 (rebuild 후 다음 호출에서 다시 로드)
+    def reset(self):
+        with self._lock:
+            self._vectors = {}
+            self._df = np.zeros(FEATURE_DIM, dtype=np.int32)
+            self._loaded = False
+            self._last_updated = None
+            self._matrix = None
+            self._ids = None
+            self._idf = None
+            self._positions = {}
+            self._dead = None
+            self._pending = {}
+
+
+related_index = RelatedPostIndex()
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# 전체 게시글 벡터와 관련 게시글 재계산 (여러 프로세스로 벡터화 및 상위 k개 계산)
+def rebuild(workers=None, batch_size=256, log=logger.info) -> dict:
+    from .models import Post, PostVector, RelatedPost
+
+    workers = workers or os.cpu_count() or 1
+    k = related_index.k
+    min_score = related_index.min_score
+    started = time.monotonic()
+
+    rows = list(Post.objects.order_by('pk').values_list('pk', 'title', 'content'))
+    if not rows:
+        return {'posts': 0, 'related': 0, 'seconds': 0.0}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        vectors = [item for chunk in executor.map(vectorize_rows, _batches(rows, batch_size)) for item in chunk]
+    log(f"벡터화 완료 - 게시글 {len(vectors)}개, {time.monotonic() - started:.1f}초")
+
+    ids = np.array([post_id for post_id, _, _ in vectors], dtype=np.int64)
+    df = np.zeros(FEATURE_DIM, dtype=np.int32)
+    for _, indices, _ in vectors:
+        df[indices] += 1
+    # 저장 정밀도(float16)와 같은 값으로 계산
+    arrays = [unpack(*pack(indices, weights)) for _, indices, weights in vectors]
+    matrix = tfidf_matrix(arrays, idf_from(df, len(arrays)))
+
+    bounds = [(start, min(start + batch_size, len(ids))) for start in range(0, len(ids), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(matrix, ids, k, min_score)) as executor:
+        neighbors = [item for block in executor.map(block_neighbors, bounds) for item in block]
+    log(f"관련 게시글 계산 완료 - {time.monotonic() - started:.1f}초")
+
+    with transaction.atomic():
+        PostVector.objects.all().delete()
+        PostVector.objects.bulk_create([
+            PostVector(post_id=post_id, indices=packed[0], weights=packed[1])
+            for post_id, packed in ((post_id, pack(indices, weights)) for post_id, indices, weights in vectors)
+        ], batch_size=1000)
+        RelatedPost.objects.all().delete()
+        related = RelatedPost.objects.bulk_create([
+            RelatedPost(post_id=post_id, related_id=related_id, score=score, rank=rank)
+            for post_id, items in neighbors
+            for rank, (related_id, score) in enumerate(items)
+        ], batch_size=1000)
+
+    related_index.reset()
+    return {'posts': len(vectors), 'related': len(related), 'seconds': round(time.monotonic() - started, 2)}
@@ -0,0 +1,248 @@
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+# 전문 검색 테이블 (SQLite: FTS5 가상 테이블, PostgreSQL: tsvector + GIN 인덱스)
+FTS_TABLE = 'blog_post_fts'
+PG_TABLE = 'blog_post_search'
+
+# BM25 필드 가중치 (제목, 본문, 태그)
+FIELD_WEIGHTS = (10.0, 1.0, 5.0)
+
+SNIPPET_BEFORE = 40
+SNIPPET_LENGTH = 160
+
+# 한중일 문자는 글자 bigram, 그 외에는 영문/숫자 단어
+_CJK = re.compile(r'[가-힣ぁ-ゟ゠-ヿ一-鿿]+')
+_TOKEN = re.compile(r'[가-힣ぁ-ゟ゠-ヿ一-鿿]+|[0-9a-z]+')
+
+
+# 색인/질의 토큰 (조사가 붙은 어절, 복합어 일부로도 찾을 수 있도록 한글은 2글자씩 겹쳐 자름)
+def tokenize(text: str):
+    tokens = []
+    for word in _TOKEN.findall(text.lower()):
+        if _CJK.fullmatch(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def document(text: str) -> str:
+    return ' '.join(tokenize(text))
+
+
+# 검색어 단어별 토큰 목록 (단어 안의 토큰은 연속해서 나와야 함)
+def _query_terms(query: str):
+    terms = []
+    for word in query.split():
+        tokens = tokenize(word)
+        if tokens:
+            terms.append(tokens)
+    return terms
+
+
+# FTS5 질의식: 단어마다 구(phrase), 마지막 토큰은 접두어 일치 (AND 결합)
+def fts5_query(query: str) -> str:
+    return ' '.join(
+        '"' + ' '.join(token.replace('"', '""') for token in tokens) + '"*'
+        for tokens in _query_terms(query)
+    )
+
+
+# PostgreSQL tsquery: 단어 안의 토큰은 <-> (연속), 마지막 토큰은 접두어(:*), 단어끼리는 &
+def tsquery(query: str) -> str:
+    parts = []
+    for tokens in _query_terms(query):
+        lexemes = ["'" + token.replace("'", "''") + "'" for token in tokens]
+        lexemes[-1] += ':*'
+        parts.append('(' + ' <-> '.join(lexemes) + ')')
+    return ' & '.join(parts)
+
+
+def vendor() -> str:
+    return connection.vendor
+
+
+# 전문 검색 사용 가능 여부 (지원 DB 이고 색인 테이블이 있는 경우)
+_available = {}
+
+
+def available() -> bool:
+    key = connection.alias, connection.settings_dict.get('NAME')
+    if key not in _available:
+        table = {'sqlite': FTS_TABLE, 'postgresql': PG_TABLE}.get(vendor())
+        _available[key] = bool(table) and table in connection.introspection.table_names()
+    return _available[key]
+
+
+# --- 스키마 (마이그레이션에서 사용) ---
+
+def create_schema(schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, content, tags, tokenize='unicode61 remove_diacritics 0')"
+        )
+    elif schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            f"post_id bigint PRIMARY KEY REFERENCES blog_post(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            f"document tsvector NOT NULL)"
+        )
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document ON {PG_TABLE} USING GIN (document)")
+    _available.clear()
+
+
+def drop_schema(schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {PG_TABLE}")
+    _available.clear()
+
+
+# --- 색인 갱신 ---
+
+def _write(cursor, post_id, title, content, tag_names):
+    fields = document(title), document(content), document(' '.join(tag_names))
+    if vendor() == 'sqlite':
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)",
+            [post_id, *fields],
+        )
+    else:
+        cursor.execute(
+            f"INSERT INTO {PG_TABLE} (post_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'C') "
+            f"|| setweight(to_tsvector('simple', %s), 'B')) "
+            f"ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+            [post_id, *fields],
+        )
+
+
+# 게시글 색인 (제목, 본문, 태그 이름)
+def index_post(post):
+    if not available():
+        return
+    tag_names = list(post.tags.values_list('name', flat=True)) if post.pk else []
+    with connection.cursor() as cursor:
+        _write(cursor, post.pk, post.title, post.content, tag_names)
+
+
+def remove_post(post_id):
+    if not available():
+        return
+    # PostgreSQL 은 외래 키 ON DELETE CASCADE 로 함께 삭제됨
+    if vendor() == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+
+# 전체 재색인 (post_model 은 마이그레이션의 과거 모델일 수 있음)
+def rebuild(post_model=None, batch_size=500) -> int:
+    if post_model is None:
+        from .models import Post as post_model
+
+    if not available():
+        return 0
+
+    tags = {}
+    for post_id, name in post_model.tags.through.objects.values_list('post_id', 'tag__name').iterator():
+        tags.setdefault(post_id, []).append(name)
+
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE if vendor() == 'sqlite' else PG_TABLE}")
+        for post_id, title, content in post_model.objects.values_list(
+            'id', 'title', 'content'
+        ).order_by().iterator(chunk_size=batch_size):
+            _write(cursor, post_id, title, content, tags.get(post_id, []))
+            count += 1
+    logger.info(f"전문 검색 색인 재구축 - 게시글 {count}개")
+    return count
+
+
+# --- 검색 ---
+
+# 관련도 순 상위 게시글 ID (한 번의 색인 조회)
+def ranked_ids(query: str, limit: int):
+    if vendor() == 'sqlite':
+        weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS)
+        sql = (f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+               f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s")
+        params = [fts5_query(query), limit]
+    else:
+        sql = (f"SELECT post_id FROM {PG_TABLE}, to_tsquery('simple', %s) query WHERE document @@ query "
+               f"ORDER BY ts_rank_cd(document, query, 32) DESC LIMIT %s")
+        params = [tsquery(query), limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+# 검색어와 일치하는 게시글만 남김 (전문 검색을 쓸 수 없는 DB 이거나 토큰이 없는 검색어면 None)
+# ranked=True 이면 관련도 상위 limit 개만 남기고 순위(search_rank, 작을수록 관련 높음)를 붙임 -
+# 순위를 게시글마다 따로 계산하지 않도록 색인에서 한 번에 정렬해 가져옴
+def search(queryset, query: str, ranked: bool = False, limit: int = None):
+    if not available() or not _query_terms(query):
+        return None
+
+    if ranked:
+        ids = ranked_ids(query, limit or getattr(settings, 'SEARCH_MAX_RANKED_RESULTS', 200))
+        if not ids:
+            return queryset.none().annotate(search_rank=Value(0, output_field=IntegerField()))
+        return queryset.filter(pk__in=ids).annotate(
+            search_rank=Case(
+                *[When(pk=post_id, then=rank) for rank, post_id in enumerate(ids)],
+                output_field=IntegerField(),
+            )
+        )
+
+    if vendor() == 'sqlite':
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [fts5_query(query)])
+    else:
+        matches = RawSQL(
+            f"SELECT post_id FROM {PG_TABLE} WHERE document @@ to_tsquery('simple', %s)", [tsquery(query)]
+        )
+    return queryset.filter(pk__in=matches)
+
+
+# 본문에서 검색어가 처음 나오는 부분을 잘라 <mark> 로 강조 (없으면 빈 문자열)
+def highlight(text: str, query: str) -> str:
+    words = sorted({word for word in query.split() if word}, key=len, reverse=True)
+    if not words or not text:
+        return ''
+
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    found = pattern.search(text)
+    if not found:
+        return ''
+
+    start = max(0, found.start() - SNIPPET_BEFORE)
+    # 단어 중간에서 시작하지 않도록 앞쪽 공백까지 이동
+    space = text.rfind(' ', 0, start + 1)
+    if start and 0 <= start - space <= 10:
+        start = space + 1
+    window = text[start:start + SNIPPET_LENGTH]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(window):
+        parts.append(escape(window[position:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        position = match.end()
+    parts.append(escape(window[position:]))
+
+    prefix = '… ' if start else ''
+    suffix = ' …' if start + SNIPPET_LENGTH < len(text) else ''
+    return mark_safe(prefix + ''.join(parts) + suffix)
@@ -0,0 +1,403 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from . import ai_metrics
+from .embeddings import get_provider, post_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: 단일 프로세스 개발 서버 기준
+    fcntl = None
+
+logger = logging.getLogger('ai_service')
+
+META_FILE = 'index.json'
+LOCK_FILE = '.lock'
+MIN_CAPACITY = 1024
+
+# 근사 검색(IVF) 파라미터
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+ASSIGN_BATCH = 8192
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _top(scores: np.ndarray, k: int):
+    if not len(scores):
+        return np.array([], dtype=np.int64)
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+# 구형 k-means (정규화 벡터, 내적 기준) - 근사 검색용 중심점 학습
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        counts = np.bincount(assignment, minlength=nlist)
+        # 비어 있는 군집은 임의의 표본으로 다시 시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    result = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH):
+        block = np.asarray(vectors[start:start + ASSIGN_BATCH])
+        result[start:start + ASSIGN_BATCH] = np.argmax(block @ centroids.T, axis=1)
+    return result
+
+
+# 게시글 임베딩 저장소 + 최근접 이웃 검색
+# - 벡터는 float32 메모리 맵 파일(행 = 게시글), 행 배정/내용 해시/공급자는 index.json 에 저장
+# - 쓰기는 파일 잠금 후 해당 행만 덮어쓰고 index.json 을 원자적으로 교체 (다른 프로세스는 mtime 으로 감지해 다시 읽음)
+# - 삭제는 행을 비우고(0) 다음 추가 때 재사용, 용량이 차면 두 배로 늘림
+# - 게시글 수가 AI_SEMANTIC_EXACT_LIMIT 이하면 전체 내적(brute-force), 그보다 많으면 IVF 근사 검색
+class SemanticIndex:
+    def __init__(self, directory=None):
+        self.directory = Path(directory or getattr(
+            settings, 'AI_EMBEDDING_DIR', Path(settings.BASE_DIR) / 'var' / 'embeddings'
+        ))
+        self.exact_limit = getattr(settings, 'AI_SEMANTIC_EXACT_LIMIT', 20000)
+        self.nprobe = getattr(settings, 'AI_SEMANTIC_NPROBE', 8)
+        self.min_score = getattr(settings, 'AI_SEMANTIC_MIN_SCORE', 0.2)
+        self.query_cache_size = getattr(settings, 'AI_SEMANTIC_QUERY_CACHE_SIZE', 256)
+
+        self._lock = threading.RLock()
+        self._meta = None
+        self._meta_mtime = None
+        self._vectors = None
+        self._live = None
+        self._ivf = None
+        self._queries = OrderedDict()
+
+        ai_metrics.register_gauge('ai_semantic.indexed_posts', lambda: int(self._live.sum()) if self._meta else 0)
+
+    @property
+    def provider(self):
+        return get_provider()
+
+    # --- 파일 ---
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    @contextmanager
+    def _write_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path(LOCK_FILE), 'a') as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _empty_meta(self) -> dict:
+        return {
+            'provider': self.provider.name,
+            'dim': self.provider.dim,
+            'file': f'vectors-{text_hash(self.provider.name)[:8]}.f32',
+            'capacity': 0,
+            'version': 0,
+            # 행 번호 -> 게시글 ID (0 = 빈 행), 행 번호 -> 임베딩 입력 해시
+            'rows': [],
+            'hashes': [],
+        }
+
+    def _write_meta(self, meta: dict):
+        meta['version'] += 1
+        temp = self._path(f'{META_FILE}.{os.getpid()}.tmp')
+        temp.write_text(json.dumps(meta), encoding='utf-8')
+        os.replace(temp, self._path(META_FILE))
+
+    # index.json 이 바뀌었으면 다시 읽음 (다른 프로세스의 갱신 반영)
+    def _refresh(self):
+        path = self._path(META_FILE)
+        try:
+            stat = path.stat()
+            # os.replace 로 교체하므로 inode 가 바뀜 (mtime 해상도가 낮은 파일 시스템 대비)
+            mtime = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            self._meta, self._vectors, self._ivf, self._meta_mtime = None, None, None, None
+            return
+        if mtime == self._meta_mtime:
+            return
+
+        meta = json.loads(path.read_text(encoding='utf-8'))
+        if meta['provider'] != self.provider.name:
+            # 공급자/차원이 바뀐 인덱스는 사용하지 않음 (build_embeddings 로 다시 구축)
+            logger.warning(f"임베딩 인덱스 공급자 불일치 - 인덱스: {meta['provider']}, 설정: {self.provider.name}")
+            self._meta, self._vectors, self._ivf, self._meta_mtime = None, None, None, mtime
+            return
+
+        vectors = None
+        if meta['capacity']:
+            vectors = np.memmap(self._path(meta['file']), dtype=np.float32, mode='r',
+                                shape=(meta['capacity'], meta['dim']))
+        previous = self._meta
+        self._meta, self._vectors, self._meta_mtime = meta, vectors, mtime
+        self._live = np.array(meta['rows'], dtype=np.int64) != 0
+        self._update_ivf(previous)
+
+    def _row_of(self) -> dict:
+        return {post_id: row for row, post_id in enumerate(self._meta['rows']) if post_id}
+
+    # --- 쓰기 ---
+
+    # 게시글 임베딩 추가/갱신 (입력이 바뀌지 않았으면 건너뜀)
+    def upsert(self, post) -> bool:
+        return self.upsert_many([(post.pk, post.title, post.content)]) > 0
+
+    # (게시글 ID, 제목, 본문) 목록을 한 번의 임베딩 호출로 반영
+    def upsert_many(self, items) -> int:
+        with self._lock:
+            self._refresh()
+            known = {}
+            if self._meta:
+                known = {post_id: self._meta['hashes'][row] for post_id, row in self._row_of().items()}
+
+        texts, pending = [], []
+        for post_id, title, content in items:
+            text = post_text(title, content)
+            digest = text_hash(text)
+            if known.get(post_id) != digest:
+                texts.append(text)
+                pending.append((post_id, digest))
+        if not pending:
+            return 0
+
+        started = time.monotonic()
+        vectors = self.provider.embed(texts)
+
+        with self._lock, self._write_lock():
+            self._refresh()
+            meta = self._meta or self._empty_meta()
+            meta = {**meta, 'rows': list(meta['rows']), 'hashes': list(meta['hashes'])}
+            row_of = {post_id: row for row, post_id in enumerate(meta['rows']) if post_id}
+            free = [row for row, post_id in enumerate(meta['rows']) if not post_id]
+            free.reverse()
+
+            assignments = []
+            for post_id, digest in pending:
+                row = row_of.get(post_id)
+                if row is None:
+                    if free:
+                        row = free.pop()
+                    else:
+                        row = len(meta['rows'])
+                        meta['rows'].append(0)
+                        meta['hashes'].append('')
+                meta['rows'][row] = post_id
+                meta['hashes'][row] = digest
+                assignments.append(row)
+
+            if len(meta['rows']) > meta['capacity']:
+                self._grow(meta, max(MIN_CAPACITY, meta['capacity'] * 2, len(meta['rows'])))
+
+            matrix = np.memmap(self._path(meta['file']), dtype=np.float32, mode='r+',
+                               shape=(meta['capacity'], meta['dim']))
+            matrix[assignments] = vectors
+            matrix.flush()
+            del matrix
+            self._write_meta(meta)
+            self._refresh()
+
+        ai_metrics.incr('ai_semantic.upserted', len(pending))
+        logger.info(f"임베딩 갱신 - 게시글 {len(pending)}개, {(time.monotonic() - started) * 1000:.1f}ms")
+        return len(pending)
+
+    # 파일 크기만 늘림 (기존 행은 그대로, 읽는 쪽은 자기 용량만큼만 매핑)
+    def _grow(self, meta: dict, capacity: int):
+        path = self._path(meta['file'])
+        with open(path, 'ab') as handle:
+            handle.truncate(capacity * meta['dim'] * 4)
+        meta['capacity'] = capacity
+
+    def remove(self, post_id):
+        with self._lock, self._write_lock():
+            self._refresh()
+            if not self._meta:
+                return
+            row = self._row_of().get(post_id)
+            if row is None:
+                return
+            meta = {**self._meta, 'rows': list(self._meta['rows']), 'hashes': list(self._meta['hashes'])}
+            meta['rows'][row] = 0
+            meta['hashes'][row] = ''
+            self._write_meta(meta)
+            self._refresh()
+
+    # 전체 재구축 (새 벡터 파일에 쓴 뒤 index.json 교체 - 검색은 끝날 때까지 기존 인덱스 사용)
+    def rebuild(self, batch_size=256, log=logger.info) -> dict:
+        from .models import Post
+
+        started = time.monotonic()
+        provider = self.provider
+        ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        capacity = max(MIN_CAPACITY, 2 ** math.ceil(math.log2(max(len(ids), 1))))
+
+        with self._lock, self._write_lock():
+            self._refresh()
+            version = (self._meta or {}).get('version', 0)
+            meta = {**self._empty_meta(), 'file': f'vectors-{version + 1}.f32',
+                    'capacity': capacity, 'version': version}
+            path = self._path(meta['file'])
+            with open(path, 'wb') as handle:
+                handle.truncate(capacity * provider.dim * 4)
+            matrix = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, provider.dim))
+
+            for start in range(0, len(ids), batch_size):
+                batch = Post.objects.filter(pk__in=ids[start:start + batch_size]).order_by('pk').values_list(
+                    'pk', 'title', 'content'
+                )
+                texts = []
+                for post_id, title, content in batch:
+                    text = post_text(title, content)
+                    texts.append(text)
+                    meta['rows'].append(post_id)
+                    meta['hashes'].append(text_hash(text))
+                if texts:
+                    matrix[len(meta['rows']) - len(texts):len(meta['rows'])] = provider.embed(texts)
+                log(f"  {len(meta['rows'])}/{len(ids)}")
+
+            matrix.flush()
+            del matrix
+            old_file = self._meta['file'] if self._meta else None
+            self._write_meta(meta)
+            self._refresh()
+            # 이미 매핑한 프로세스는 열린 파일을 계속 읽을 수 있음 (POSIX)
+            if old_file and old_file != meta['file'] and fcntl:
+                self._path(old_file).unlink(missing_ok=True)
+
+        elapsed = time.monotonic() - started
+        ai_metrics.incr('ai_semantic.rebuild')
+        return {'posts': len(meta['rows']), 'provider': provider.name, 'seconds': round(elapsed, 2)}
+
+    # --- 근사 검색 (IVF) ---
+
+    # 역색인 갱신: 처음이거나 게시글 수가 학습 시점의 두 배가 되면 다시 학습,
+    # 그 외에는 바뀐 행만 가장 가까운 군집에 다시 배정
+    def _update_ivf(self, previous):
+        meta = self._meta
+        count = int(self._live.sum())
+        if count <= self.exact_limit:
+            self._ivf = None
+            return
+
+        used = len(meta['rows'])
+        vectors = self._vectors[:used]
+        ivf = self._ivf
+        if ivf is None or count >= ivf['trained_count'] * 2 or previous is None or previous['file'] != meta['file']:
+            started = time.monotonic()
+            nlist = max(16, int(math.sqrt(count)))
+            centroids = train_centroids(np.asarray(vectors[np.flatnonzero(self._live)]), nlist)
+            self._ivf = {
+                'centroids': centroids,
+                'assignment': assign(vectors, centroids),
+                'trained_count': count,
+            }
+            ai_metrics.incr('ai_semantic.ivf_trained')
+            logger.info(f"임베딩 근사 색인 학습 - 게시글 {count}개, 군집 {nlist}개, "
+                        f"{time.monotonic() - started:.2f}초")
+            return
+
+        changed = [
+            row for row in range(used)
+            if row >= len(previous['hashes']) or previous['hashes'][row] != meta['hashes'][row]
+        ]
+        assignment = ivf['assignment']
+        if len(assignment) < used:
+            assignment = np.concatenate([assignment, np.zeros(used - len(assignment), dtype=np.int32)])
+        if changed:
+            assignment[changed] = assign(np.asarray(vectors[changed]), ivf['centroids'])
+        ivf['assignment'] = assignment
+
+    # 질의 벡터와 가까운 행 (행 번호, 점수)
+    def _nearest(self, query: np.ndarray, k: int):
+        meta = self._meta
+        used = len(meta['rows'])
+        live = self._live
+
+        if self._ivf is None:
+            candidates = np.flatnonzero(live)
+            scores = np.asarray(self._vectors[:used]) @ query
+            scores = scores[candidates]
+        else:
+            ivf = self._ivf
+            lists = _top(ivf['centroids'] @ query, self.nprobe)
+            candidates = np.flatnonzero(np.isin(ivf['assignment'][:used], lists) & live)
+            scores = np.asarray(self._vectors[candidates]) @ query
+            ai_metrics.incr('ai_semantic.ivf_search')
+
+        top = _top(scores, k)
+        return candidates[top], scores[top]
+
+    def _embed_query(self, text: str) -> np.ndarray:
+        key = text.strip().lower()
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                ai_metrics.incr('ai_semantic.query_cache_hit')
+                return self._queries[key]
+
+        vector = self.provider.embed([text])[0]
+        with self._lock:
+            self._queries[key] = vector
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+        return vector
+
+    # 의미 검색: 질의와 가까운 게시글 (ID, 점수) 목록 - 인덱스가 없으면 빈 목록
+    def search(self, text: str, k: int = 100):
+        started = time.monotonic()
+        with self._lock:
+            self._refresh()
+            if not self._meta or self._vectors is None:
+                return []
+
+        query = self._embed_query(text)
+        with self._lock:
+            self._refresh()
+            if not self._meta or self._vectors is None:
+                return []
+            rows, scores = self._nearest(query, k)
+            rows_to_ids = self._meta['rows']
+            results = [
+                (rows_to_ids[row], round(float(score), 4))
+                for row, score in zip(rows, scores) if score >= self.min_score
+            ]
+
+        ai_metrics.incr('ai_semantic.search')
+        logger.info(f"의미 검색 - 결과 {len(results)}개, {(time.monotonic() - started) * 1000:.1f}ms")
+        return results
+
+
+semantic_index = SemanticIndex()
@@ -0,0 +1,66 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import search, trending
+from .models import Post, Tag
+from .page_cache import page_cache
+
+
+# 게시글 상세 화면과 목록 화면 캐시 무효화
+def invalidate_pages(post_id):
+    page_cache.invalidate_post(post_id)
+    page_cache.invalidate_list()
+
+
+# 전문 검색 색인, 화면 캐시, 인기 점수 동기화 (관리자 화면 등 뷰 밖에서의 변경도 반영)
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        search.index_post(instance)
+        invalidate_pages(instance.pk)
+        # 새 글은 인기 점수 테이블에 추가 (작성 직후에도 인기순 목록에 나오도록)
+        if created:
+            trending.safe_record(instance.pk, 'post')
+
+
+@receiver(post_delete, sender=Post)
+def remove_post(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+    invalidate_pages(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        search.index_post(instance)
+        invalidate_pages(instance.pk)
+        return
+    # tag.post_set 쪽에서 변경한 경우
+    posts = Post.objects.filter(pk__in=pk_set) if pk_set else Post.objects.none()
+    for post in posts:
+        search.index_post(post)
+        invalidate_pages(post.pk)
+
+
+# 태그 이름 변경 시 해당 태그를 쓰는 게시글 재색인
+@receiver(post_save, sender=Tag)
+def reindex_tag(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for post in instance.post_set.all():
+        search.index_post(post)
+        invalidate_pages(post.pk)
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_posts(sender, instance, **kwargs):
+    instance._search_post_ids = list(instance.post_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def reindex_deleted_tag(sender, instance, **kwargs):
+    for post in Post.objects.filter(pk__in=getattr(instance, '_search_post_ids', [])):
+        search.index_post(post)
+        invalidate_pages(post.pk)
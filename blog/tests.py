@@ -1,3 +1,1488 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import math
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Follow
+
+from . import (
+    ai_async_views, ai_budget, ai_ratelimit, ai_streaming, ai_tokens, ai_views, comment_threads, search, trending, views,
+)
+from .ai_tags import LocalTagSuggester
+from .analytics import HyperLogLog, PostAnalytics, unique_readers
+from .ai_jobs import AIJobWorker, content_hash, enqueue_summary_job
+from .ai_cache import DatabaseCacheBackend, LRUCacheBackend, ResponseCache, make_cache_key
+from .ai_resilience import CircuitBreaker
+from .ai_service import AIResult, OpenAIService, SingleFlight
+from .ai_usage import UsageRecorder
+from .embeddings import LocalEmbeddingProvider
+from .models import (
+    AIInflightLock, AIJob, AIResponseCache, AIUsageLog, Comment, Like, Post, PostDailyStats, RelatedPost, Tag,
+    TrendingScore,
+)
+from .page_cache import PageCache
+from .pagination import SORT_ORDERINGS, InvalidCursor, decode_cursor, encode_cursor, paginate_keyset
+from .related import RelatedPostIndex
+from .semantic import SemanticIndex
+from .view_counter import ViewCounter
+
+
+# 서킷 브레이커 half-open 시험 요청
+class CircuitBreakerProbeTests(SimpleTestCase):
+    def setUp(self):
+        self.service = OpenAIService()
+        self.breaker = self.service.breaker = CircuitBreaker(
+            'test', failure_threshold=0.5, min_requests=1, reset_timeout=0
+        )
+        self.breaker.record_failure()
+
+    # 시험 요청이 취소되면 다음 요청이 새 시험 요청으로 허용됨
+    def test_cancelled_probe_is_released(self):
+        async def scenario():
+            started = asyncio.Event()
+
+            async def hang(timeout):
+                started.set()
+                await asyncio.sleep(60)
+
+            task = asyncio.create_task(self.service._acall_provider('autocomplete', hang))
+            await started.wait()
+            self.assertFalse(self.breaker.allow())
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        self.assertEqual(self.breaker.current_state(), CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+    # 이전 시험 요청 번호로는 다른 요청의 시험 요청을 반환하지 않음
+    def test_stale_ticket_does_not_release_current_probe(self):
+        first = self.breaker.acquire()
+        self.breaker.release(first)
+        second = self.breaker.acquire()
+        self.assertNotEqual(first, second)
+        self.breaker.release(first)
+        self.assertFalse(self.breaker.allow())
+
+    # 결과가 기록된 시험 요청은 반환해도 상태가 바뀌지 않음
+    def test_successful_probe_closes_breaker(self):
+        async def ok(timeout):
+            return 'ok'
+
+        self.assertEqual(asyncio.run(self.service._acall_provider('autocomplete', ok)), 'ok')
+        self.assertEqual(self.breaker.current_state(), CircuitBreaker.CLOSED)
+
+
+# AI 사용량 기록 (비동기 뷰)
+class UsageRecorderAsyncTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='usage', password='pw')
+        # 백그라운드 flush 가 테스트 중에 실행되지 않도록 주기를 길게
+        self.recorder = UsageRecorder(flush_interval=3600, buffered=False)
+
+    # 즉시 저장 설정이어도 이벤트 루프에서는 DB 에 접근하지 않고 버퍼에 넣음
+    def test_async_view_buffers_even_when_unbuffered(self):
+        view = ai_async_views.AsyncTitleSuggestionView()
+        result = AIResult(model='gpt-4o-mini', prompt_tokens=10, completion_tokens=5, total_tokens=15)
+
+        async def log():
+            view.log_usage(self.user, result)
+
+        with mock.patch.object(ai_async_views, 'usage_recorder', self.recorder):
+            asyncio.run(log())
+
+        self.assertEqual(self.recorder.pending_count(self.user.pk), 1)
+        self.assertEqual(self.recorder.flush(), 1)
+        self.assertEqual(AIUsageLog.objects.get(user=self.user).tokens_used, 15)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.ai_usage_count, 1)
+
+    # 통계의 토큰 사용량에도 아직 저장되지 않은 버퍼 기록 포함 (토큰 예산 확인과 같은 값)
+    def test_usage_stats_include_buffered_tokens(self):
+        self.recorder.record(self.user, 'summary', AIResult(total_tokens=7))
+        self.recorder.record(self.user, 'title_suggest', AIResult(total_tokens=15), buffered=True)
+        self.recorder.record(self.user, 'title_suggest', AIResult(total_tokens=40, cached=True), buffered=True)
+
+        request = RequestFactory().get('/blog/ai/usage-stats/')
+        request.user = self.user
+        with mock.patch.object(ai_views, 'usage_recorder', self.recorder):
+            stats = json.loads(ai_views.ai_usage_stats(request).content)['stats']
+        self.assertEqual(stats['tokens_used'], 22)
+        self.assertEqual(stats['title_suggestions'], 2)
+
+    # 동기 경로는 설정대로 즉시 저장
+    def test_sync_record_writes_immediately_when_unbuffered(self):
+        self.recorder.record(self.user, 'summary', AIResult(total_tokens=3))
+        self.assertEqual(self.recorder.pending_count(self.user.pk), 0)
+        self.assertEqual(AIUsageLog.objects.filter(user=self.user).count(), 1)
+
+
+# 요청 한도 - 입력 검증에 실패한 요청은 버킷 토큰을 소모하지 않음
+class RateLimitValidationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='limited', password='pw')
+        self.factory = RequestFactory()
+
+    def request(self, content):
+        request = self.factory.post('/blog/ai/suggest-title/', json.dumps({'content': content}),
+                                    content_type='application/json')
+        request.user = self.user
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        return request
+
+    def allowed(self):
+        return mock.patch.object(ai_ratelimit.rate_limiter, 'check',
+                                 return_value=ai_ratelimit.Decision(True, 0, ''))
+
+    # 동기 뷰: 검증 실패 시 한도를 확인하지 않고, 통과하면 API 호출 전에 확인
+    def test_sync_view_checks_limit_after_validation(self):
+        view = ai_views.TitleSuggestionView.as_view()
+        with self.allowed() as check:
+            response = view(self.request('짧은 글'))
+            self.assertFalse(json.loads(response.content)['success'])
+            check.assert_not_called()
+
+            with mock.patch.object(ai_views, 'get_title_suggestions', return_value=AIResult(value=[])):
+                view(self.request('충분히 긴 본문입니다. ' * 5))
+            check.assert_called_once_with(self.user, 'title_suggest')
+
+    # 비동기 뷰도 validate 를 통과한 요청만 한도 확인
+    def test_async_view_checks_limit_after_validation(self):
+        view = ai_async_views.AsyncTitleSuggestionView.as_view()
+        with self.allowed() as check:
+            response = asyncio.run(view(self.request('짧은 글')))
+            self.assertFalse(json.loads(response.content)['success'])
+            check.assert_not_called()
+
+            async def empty(*args, **kwargs):
+                return AIResult(value=[])
+
+            with mock.patch.object(ai_async_views, 'aget_title_suggestions', empty):
+                asyncio.run(view(self.request('충분히 긴 본문입니다. ' * 5)))
+            check.assert_called_once_with(self.user, 'title_suggest')
+
+
+# 동기/비동기 AI 뷰가 같은 검증 함수를 사용
+class AIValidationTests(TestCase):
+    VIEWS = [
+        (ai_views.TitleSuggestionView, ai_async_views.AsyncTitleSuggestionView),
+        (ai_views.ContentCompletionView, ai_async_views.AsyncContentCompletionView),
+        (ai_views.ContentCompletionStreamView, ai_async_views.AsyncContentCompletionStreamView),
+        (ai_views.TagSuggestionView, ai_async_views.AsyncTagSuggestionView),
+        (ai_views.SummaryGenerationView, ai_async_views.AsyncSummaryGenerationView),
+        (ai_views.AssistBundleView, ai_async_views.AsyncAssistBundleView),
+    ]
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='validator', password='pw')
+        self.factory = RequestFactory()
+
+    def request(self, data):
+        request = self.factory.post('/', json.dumps(data), content_type='application/json')
+        request.user = self.user
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        return request
+
+    # 잘못된 요청에는 두 경로가 같은 오류 응답
+    def test_sync_and_async_errors_match(self):
+        for data in ({}, {'content': '   '}, {'content': '짧은 글'}, {'content': '가' * 25}, {'content': '가' * 150}):
+            for sync_view, async_view in self.VIEWS:
+                invalid = ai_views.validate_request(async_view.feature_type, data)
+                if invalid is None:
+                    continue
+                with self.subTest(view=sync_view.__name__, data=data):
+                    expected = json.loads(sync_view.as_view()(self.request(data)).content)
+                    actual = json.loads(asyncio.run(async_view.as_view()(self.request(data))).content)
+                    self.assertEqual(expected, json.loads(invalid.content))
+                    self.assertEqual(actual, expected)
+
+    # 최소 길이는 기능별 설정 하나로 확인하고 안내 문구에 같은 값을 표시
+    def test_min_length_message(self):
+        for feature, (minimum, _) in ai_views.MIN_CONTENT_LENGTH.items():
+            error = json.loads(ai_views.validate_request(feature, {'content': '가' * (minimum - 1)}).content)['error']
+            self.assertIn(f'(현재: {minimum - 1}자, 최소: {minimum}자)', error)
+            self.assertIsNone(ai_views.validate_request(feature, {'content': '가' * minimum}))
+        self.assertIsNone(ai_views.validate_request('tag_suggest', {'title': '제목만'}))
+        self.assertIsNotNone(ai_views.validate_request('tag_suggest', {'title': ' ', 'content': ''}))
+
+
+# 관련 게시글 증분 갱신
+class RelatedPostIndexTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='related', password='pw')
+        self.index = RelatedPostIndex()
+        self.index.k = 2
+        self.index.min_score = 0.01
+
+    def post(self, title, content):
+        post = Post.objects.create(author=self.user, title=title, content=content)
+        self.index.upsert(post)
+        return post
+
+    def related(self, post):
+        return list(RelatedPost.objects.filter(post=post).order_by('rank').values_list('related_id', flat=True))
+
+    # 저장할 때 TF-IDF 행렬을 다시 만들지 않고 바뀐 행만 계산
+    def test_upsert_keeps_matrix(self):
+        django = self.post('장고 모델 정리', '장고 ORM 모델 필드와 쿼리셋 사용법')
+        self.post('파이썬 기초', '파이썬 리스트와 딕셔너리 반복문')
+        matrix = self.index._matrix
+
+        orm = self.post('장고 ORM 쿼리', '장고 쿼리셋 필터와 모델 관계 조회')
+        self.assertIs(self.index._matrix, matrix)
+        self.assertEqual(self.related(orm)[0], django.pk)
+        # 새 게시글이 기존 게시글의 관련 게시글 목록에도 반영됨
+        self.assertIn(orm.pk, self.related(django))
+
+    # 수정된 게시글의 이전 행은 유사도 계산에서 제외
+    def test_updated_post_replaces_old_row(self):
+        django = self.post('장고 모델 정리', '장고 ORM 모델 필드와 쿼리셋 사용법')
+        python = self.post('파이썬 기초', '파이썬 리스트와 딕셔너리 반복문')
+        python.title, python.content = '장고 모델 관계', '장고 ORM 모델 관계와 쿼리셋'
+        python.save()
+        self.index.upsert(python)
+
+        self.assertEqual(self.related(python), [django.pk])
+        self.assertEqual(self.related(django), [python.pk])
+        ids, scores = self.index._similarities(self.index._row(django.pk))
+        self.assertEqual(int((scores > 0.01).sum()), 2)
+
+    # 변경이 쌓이면 다음 계산 때 행렬을 다시 만듦
+    def test_pending_rows_trigger_rebuild(self):
+        self.post('장고 모델 정리', '장고 ORM 모델 필드와 쿼리셋 사용법')
+        matrix = self.index._matrix
+        with mock.patch('blog.related.MAX_PENDING_ROWS', 1):
+            self.post('파이썬 기초', '파이썬 리스트와 딕셔너리 반복문')
+            self.post('장고 ORM 쿼리', '장고 쿼리셋 필터와 모델 관계 조회')
+        self.assertIsNot(self.index._matrix, matrix)
+        self.assertEqual(len(self.index._ids), 3)
+
+
+# 로컬 태그 추천 (비슷한 태그 게시글이 충분하면 로컬, 아니면 OpenAI 로 넘김)
+@override_settings(AI_TAG_LOCAL_MIN_POSTS=4)
+class LocalTagSuggesterTests(TestCase):
+    DJANGO = '장고 ORM 모델 쿼리셋 필터와 마이그레이션, 뷰와 템플릿 사용법'
+    COOKING = '김치찌개 끓이는 법, 돼지고기와 묵은지 양념 레시피'
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='tagger', password='pw')
+        for i in range(4):
+            self.post(f'장고 정리 {i}', self.DJANGO, ['장고', '파이썬', '웹'])
+            self.post(f'집밥 기록 {i}', self.COOKING, ['요리', '레시피', '한식'])
+        self.suggester = LocalTagSuggester()
+        self.suggester.build()
+        self.factory = RequestFactory()
+
+    def post(self, title, content, tags):
+        post = Post.objects.create(author=self.user, title=title, content=content)
+        post.tags.set([Tag.objects.get_or_create(name=name)[0] for name in tags])
+        return post
+
+    def request(self, title, content):
+        request = self.factory.post('/blog/ai/suggest-tags/', json.dumps({'title': title, 'content': content}),
+                                    content_type='application/json')
+        request.user = self.user
+        return request
+
+    # 기존 태그 게시글과 비슷한 글은 그 태그로 확신
+    def test_confident_for_similar_post(self):
+        result = self.suggester.suggest('장고 쿼리셋 메모', self.DJANGO, max_tags=5)
+        self.assertTrue(result.confident)
+        self.assertEqual(set(result.tags[:3]), {'장고', '파이썬', '웹'})
+
+    # 비슷한 게시글이 없으면 확신하지 않음
+    def test_not_confident_for_unrelated_post(self):
+        result = self.suggester.suggest('우주 망원경', '허블 우주 망원경으로 본 은하와 성운 관측', max_tags=5)
+        self.assertFalse(result.confident)
+
+    # 본문에 나온 태그 이름은 유사 게시글이 없어도 후보에 포함
+    def test_mentioned_tag_names(self):
+        self.assertEqual(sorted(self.suggester._mentioned_tags('오늘은 한식 요리를 했다')), ['요리', '한식'])
+
+    # 뷰: 확신하면 로컬 응답, 아니면 OpenAI 로 추천
+    def test_view_falls_through_to_openai(self):
+        view = ai_views.TagSuggestionView.as_view()
+        allowed = ai_ratelimit.Decision(True, 0, '')
+        with mock.patch.object(ai_views, 'tag_suggester', self.suggester), \
+                mock.patch.object(ai_ratelimit.rate_limiter, 'check', return_value=allowed), \
+                mock.patch.object(ai_views, 'get_tag_suggestions', return_value=AIResult(value=['천문'])) as remote, \
+                mock.patch.object(ai_views.usage_recorder, 'record'):
+            data = json.loads(view(self.request('장고 쿼리셋 메모', self.DJANGO)).content)
+            self.assertEqual(data['source'], 'local')
+            remote.assert_not_called()
+
+            data = json.loads(view(self.request('우주 망원경', '허블 우주 망원경으로 본 은하와 성운 관측')).content)
+            self.assertEqual(data['source'], 'ai')
+            self.assertEqual(data['tags'], ['천문'])
+            remote.assert_called_once()
+
+    # 갱신 주기가 지나도 요청 중에는 동기화하지 않고 백그라운드로 넘김
+    def test_sync_runs_in_background(self):
+        self.suggester._synced_at -= self.suggester.refresh_interval
+        with mock.patch.object(self.suggester, 'sync') as sync, \
+                mock.patch('blog.ai_tags.threading.Thread') as thread:
+            self.suggester.suggest('장고 쿼리셋 메모', self.DJANGO)
+        sync.assert_not_called()
+        thread.assert_called_once()
+        self.assertEqual(thread.call_args.kwargs['args'], (False,))
+        self.suggester._building = False
+
+
+# 댓글 스레드 (경로 범위, 스레드별 답글 수 제한, 답글 커서, 삭제, 최대 깊이)
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='commenter', password='pw')
+        self.post = Post.objects.create(author=self.user, title='댓글 테스트', content='본문')
+        self.client.force_login(self.user)
+
+    def comment(self, content, parent=None):
+        return Comment.objects.create(post=self.post, author=self.user, content=content, parent=parent)
+
+    def create(self, content, parent=None):
+        response = self.client.post(
+            f'/blog/comment/{self.post.pk}/create/',
+            json.dumps({'content': content, 'parent_id': parent.pk if parent else None}),
+            content_type='application/json',
+        )
+        return response.json()
+
+    @staticmethod
+    def flatten(nodes):
+        for node in nodes:
+            yield node['id']
+            yield from CommentThreadTests.flatten(node['replies'])
+
+    # 하위 댓글 범위 (path + '.', path + '/') 는 다른 스레드를 포함하지 않음
+    def test_subtree_range_stays_inside_thread(self):
+        first = self.comment('첫 댓글')
+        reply = self.comment('답글', first)
+        nested = self.comment('답글의 답글', reply)
+        second = self.comment('둘째 댓글')
+        other = self.comment('다른 스레드 답글', second)
+
+        self.assertEqual(nested.path, Comment.make_path(reply.path, nested.pk))
+        self.assertEqual(nested.depth, 2)
+        self.assertEqual(sorted(comment_threads.subtree_ids(first)), [first.pk, reply.pk, nested.pk])
+        self.assertEqual(sorted(comment_threads.subtree_ids(second)), [second.pk, other.pk])
+        self.assertEqual(comment_threads.subtree_ids(nested), [nested.pk])
+
+    # 스레드마다 replies_limit 개의 답글만 포함하고, 더 있으면 replies_cursor
+    def test_thread_page_limits_replies_per_thread(self):
+        first = self.comment('첫 댓글')
+        reply = self.comment('답글 1', first)
+        nested = self.comment('답글 1-1', reply)
+        self.comment('답글 2', first)
+        second = self.comment('둘째 댓글')
+        self.comment('둘째 답글', second)
+        third = self.comment('셋째 댓글')
+
+        page = comment_threads.thread_page(self.post, AnonymousUser(), limit=2, replies_limit=2)
+        threads = page['comments']
+        self.assertEqual([thread['id'] for thread in threads], [first.pk, second.pk])
+        self.assertEqual(list(self.flatten(threads[:1])), [first.pk, reply.pk, nested.pk])
+        self.assertEqual(threads[0]['replies'][0]['replies'][0]['depth'], 2)
+        self.assertIsNotNone(threads[0]['replies_cursor'])
+        self.assertIsNone(threads[1]['replies_cursor'])
+
+        page = comment_threads.thread_page(self.post, AnonymousUser(), page['next_cursor'], limit=2, replies_limit=2)
+        self.assertEqual([thread['id'] for thread in page['comments']], [third.pk])
+        self.assertIsNone(page['next_cursor'])
+
+    # 답글 더 보기는 커서 이후 답글을 경로 순으로 이어서 반환
+    @override_settings(COMMENT_REPLIES_PER_THREAD=2, COMMENT_REPLIES_PAGE_SIZE=1)
+    def test_reply_page_continues_after_cursor(self):
+        root = self.comment('댓글')
+        replies = [self.comment('답글 1', root)]
+        replies.append(self.comment('답글 1-1', replies[0]))
+        replies.append(self.comment('답글 2', root))
+        replies.append(self.comment('답글 2-1', replies[2]))
+        replies.append(self.comment('답글 3', root))
+
+        thread = self.client.get(f'/blog/comments/{self.post.pk}/').json()['comments'][0]
+        seen = list(self.flatten(thread['replies']))
+        cursor = thread['replies_cursor']
+        while cursor:
+            page = self.client.get(
+                f'/blog/comments/{self.post.pk}/replies/{root.pk}/', {'cursor': cursor}
+            ).json()
+            self.assertTrue(page['success'])
+            seen.extend(self.flatten(page['replies']))
+            cursor = page['next_cursor']
+
+        self.assertEqual(seen, [reply.pk for reply in replies])
+        response = self.client.get(f'/blog/comments/{self.post.pk}/replies/{root.pk}/', {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 400)
+
+    # 삭제 응답의 deleted_ids 에 하위 답글 포함
+    def test_delete_returns_descendant_ids(self):
+        root = self.create('댓글')['comment']
+        reply = self.create('답글', Comment.objects.get(pk=root['id']))['comment']
+        nested = self.create('답글의 답글', Comment.objects.get(pk=reply['id']))
+        self.assertEqual(nested['total_count'], 3)
+        self.assertEqual(self.create('다른 댓글')['total_count'], 4)
+
+        data = self.client.post(f'/blog/comment/{root["id"]}/delete/').json()
+        self.assertEqual(sorted(data['deleted_ids']), [root['id'], reply['id'], nested['comment']['id']])
+        self.assertEqual(data['total_count'], 1)
+        self.assertFalse(Comment.objects.filter(pk__in=data['deleted_ids']).exists())
+
+    # 최대 깊이의 댓글에 단 답글은 부모 댓글의 형제로 붙음
+    def test_reply_beyond_max_depth_attaches_to_parent(self):
+        parent = None
+        for depth in range(Comment.MAX_DEPTH):
+            parent = self.comment(f'깊이 {depth}', parent)
+        self.assertEqual(parent.depth, Comment.MAX_DEPTH - 1)
+
+        data = self.create('더 깊은 답글', parent)['comment']
+        self.assertEqual(data['parent_id'], parent.parent_id)
+        self.assertEqual(data['depth'], Comment.MAX_DEPTH - 1)
+        self.assertLessEqual(len(Comment.objects.get(pk=data['id']).path), 255)
+
+
+# 댓글 작성/수정/삭제 응답 (화면에 반영할 변경분만 반환)
+class CommentViewTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(username='owner', password='pw')
+        self.reader = User.objects.create_user(username='reader', password='pw')
+        self.post = Post.objects.create(author=self.owner, title='댓글 글', content='본문')
+        self.factory = RequestFactory()
+
+    def call(self, view, user, data=None, **kwargs):
+        request = self.factory.post('/', json.dumps(data or {}), content_type='application/json')
+        request.user = user
+        return json.loads(view.as_view()(request, **kwargs).content)
+
+    def create(self, user, content, parent=None):
+        data = {'content': content, 'parent_id': parent['id'] if parent else None}
+        return self.call(views.CommentCreateView, user, data, post_id=self.post.pk)
+
+    # 새 댓글과 답글은 직렬화된 댓글 하나와 댓글 수만 반환
+    def test_create_returns_comment_delta(self):
+        root = self.create(self.reader, '첫 댓글')
+        self.assertTrue(root['success'])
+        self.assertEqual(root['total_count'], 1)
+        self.assertEqual(root['comment']['depth'], 0)
+        self.assertIsNone(root['comment']['parent_id'])
+        self.assertEqual(root['comment']['replies'], [])
+
+        reply = self.create(self.owner, '답글', parent=root['comment'])
+        self.assertEqual(reply['total_count'], 2)
+        self.assertEqual(reply['comment']['depth'], 1)
+        self.assertEqual(reply['comment']['parent_id'], root['comment']['id'])
+        self.assertTrue(reply['comment']['can_delete'])
+        parent_path = Comment.objects.get(pk=root['comment']['id']).path
+        self.assertEqual(Comment.objects.get(pk=reply['comment']['id']).path,
+                         Comment.make_path(parent_path, reply['comment']['id']))
+
+    # 수정은 댓글과 게시글을 한 번에 조회하고 수정된 댓글만 반환
+    def test_update_returns_comment(self):
+        comment = self.create(self.reader, '수정 전')['comment']
+        with CaptureQueriesContext(connection) as queries:
+            data = self.call(views.CommentUpdateView, self.reader, {'content': '수정 후'}, comment_id=comment['id'])
+        self.assertTrue(data['success'])
+        self.assertEqual(data['comment']['content'], '수정 후')
+        self.assertEqual(data['comment']['id'], comment['id'])
+        post_queries = [query['sql'] for query in queries.captured_queries
+                        if query['sql'].startswith('SELECT') and 'FROM "blog_post"' in query['sql']]
+        self.assertEqual(post_queries, [])
+
+        denied = self.call(views.CommentUpdateView, self.owner, {'content': '남의 댓글'}, comment_id=comment['id'])
+        self.assertFalse(denied['success'])
+
+    # 삭제는 함께 삭제된 답글 ID 까지 반환
+    def test_delete_returns_deleted_ids(self):
+        root = self.create(self.reader, '댓글')['comment']
+        reply = self.create(self.reader, '답글', parent=root)['comment']
+        nested = self.create(self.owner, '답글의 답글', parent=reply)['comment']
+        sibling = self.create(self.owner, '다른 답글', parent=root)['comment']
+
+        # 게시글 작성자는 다른 사람의 댓글도 삭제 가능
+        data = self.call(views.CommentDeleteView, self.owner, comment_id=reply['id'])
+        self.assertTrue(data['success'])
+        self.assertEqual(data['comment_id'], reply['id'])
+        self.assertEqual(sorted(data['deleted_ids']), sorted([reply['id'], nested['id']]))
+        self.assertEqual(data['total_count'], 2)
+        self.assertEqual(set(Comment.objects.values_list('id', flat=True)), {root['id'], sibling['id']})
+
+
+# AI 응답 캐시 키 정규화
+class CacheKeyTests(SimpleTestCase):
+    messages = [{'role': 'system', 'content': '제목을 추천하세요.'}, {'role': 'user', 'content': '장고 글\n본문'}]
+
+    # 줄바꿈 형식, 앞뒤 공백, temperature 표기, 추가 인자 순서가 달라도 같은 키
+    def test_equivalent_requests_share_key(self):
+        key = make_cache_key('gpt-4o-mini', self.messages, 100, 0.7, n=1, style='friendly')
+        variant = [
+            {'role': 'system', 'content': '  제목을 추천하세요.\r\n'},
+            {'role': 'user', 'content': '장고 글\r\n본문 '},
+        ]
+        self.assertEqual(make_cache_key('gpt-4o-mini', variant, '100', 0.7000001, style='friendly', n=1), key)
+
+    # 모델, 내용, 역할, 생성 옵션이 다르면 다른 키
+    def test_different_requests_get_different_keys(self):
+        key = make_cache_key('gpt-4o-mini', self.messages, 100, 0.7)
+        self.assertNotEqual(make_cache_key('gpt-4o', self.messages, 100, 0.7), key)
+        self.assertNotEqual(make_cache_key('gpt-4o-mini', self.messages[:1], 100, 0.7), key)
+        self.assertNotEqual(make_cache_key('gpt-4o-mini', [{**self.messages[0], 'role': 'user'}, self.messages[1]], 100, 0.7), key)
+        self.assertNotEqual(make_cache_key('gpt-4o-mini', self.messages, 200, 0.7), key)
+        self.assertNotEqual(make_cache_key('gpt-4o-mini', self.messages, 100, 0.2), key)
+
+
+# AI 응답 캐시 TTL 만료와 계층 승격
+class ResponseCacheTests(TestCase):
+    # LRU 는 TTL 이 지나면 없는 것으로 처리하고, 크기를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+    def test_lru_expiry_and_eviction(self):
+        lru = LRUCacheBackend(max_size=2)
+        with mock.patch('blog.ai_cache.time.monotonic', return_value=1000.0):
+            lru.set('a', {'content': 'A'}, ttl=10)
+            lru.set('b', {'content': 'B'}, ttl=100)
+            self.assertEqual(lru.get('a'), {'content': 'A'})
+            lru.set('c', {'content': 'C'}, ttl=100)
+            self.assertIsNone(lru.get('b'))
+        with mock.patch('blog.ai_cache.time.monotonic', return_value=1010.0):
+            self.assertIsNone(lru.get('a'))
+            self.assertEqual(lru.get('c'), {'content': 'C'})
+
+    # DB 계층은 만료 시각이 지난 행을 조회 시 삭제
+    def test_database_expiry(self):
+        backend = DatabaseCacheBackend()
+        backend.set('key', {'content': '요약'}, ttl=60, feature='summary')
+        self.assertEqual(backend.get('key'), {'content': '요약'})
+
+        later = timezone.now() + timedelta(seconds=61)
+        with mock.patch('blog.ai_cache.timezone.now', return_value=later):
+            self.assertIsNone(backend.get('key'))
+        self.assertFalse(AIResponseCache.objects.filter(key='key').exists())
+
+    # 하위 계층 적중은 상위 계층으로 승격, TTL 0 인 기능은 저장하지 않음
+    def test_promotion_and_disabled_ttl(self):
+        lru, db = LRUCacheBackend(), DatabaseCacheBackend()
+        cache = ResponseCache([lru, db], ttls={'autocomplete': 0})
+        db.set('key', {'content': '제목'}, ttl=60)
+
+        self.assertEqual(cache.get('key', 'title_suggest'), {'content': '제목'})
+        self.assertEqual(lru.get('key'), {'content': '제목'})
+
+        cache.set('other', {'content': '자동완성'}, 'autocomplete')
+        self.assertIsNone(cache.get('other', 'autocomplete'))
+
+
+# 동일 요청 병합 (single-flight)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.flight = SingleFlight(wait_timeout=5)
+
+    # 동시에 들어온 같은 키의 요청은 호출 한 번의 결과를 공유 (대기 측에만 share 적용)
+    def test_threads_share_one_call(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        results = []
+
+        def request():
+            results.append(self.flight.do('key', func, share=lambda value: f'shared:{value}'))
+
+        leader = threading.Thread(target=request)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=request) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), ['result'] + ['shared:result'] * 4)
+        self.assertEqual(self.flight.inflight_count(), 0)
+
+    # 대표 요청의 예외는 대기 중인 요청에도 전달
+    def test_thread_error_is_shared(self):
+        started, release = threading.Event(), threading.Event()
+
+        def func():
+            started.set()
+            release.wait(5)
+            raise ValueError('실패')
+
+        errors = []
+
+        def request():
+            try:
+                self.flight.do('key', func)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=request)]
+        threads[0].start()
+        started.wait(5)
+        threads.append(threading.Thread(target=request))
+        threads[1].start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(errors, ['실패', '실패'])
+
+    # asyncio 태스크도 같은 키는 한 번만 호출, 다른 키는 따로 호출
+    def test_async_tasks_share_one_call(self):
+        calls = []
+
+        async def call(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value
+
+        async def scenario():
+            return await asyncio.gather(
+                *[self.flight.ado('key', lambda: call('a'), share=str.upper) for _ in range(5)],
+                self.flight.ado('other', lambda: call('b')),
+            )
+
+        results = asyncio.run(scenario())
+        self.assertEqual(sorted(calls), ['a', 'b'])
+        self.assertEqual(sorted(results), ['A', 'A', 'A', 'A', 'a', 'b'])
+
+    # 대표 태스크가 취소되면 대기 중인 태스크는 직접 호출
+    def test_async_follower_recovers_from_cancelled_leader(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return 'result'
+
+        async def scenario():
+            leader = asyncio.create_task(self.flight.ado('key', call))
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(self.flight.ado('key', call))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        self.assertEqual(asyncio.run(scenario()), 'result')
+        self.assertEqual(len(calls), 2)
+
+
+# 프로세스 간 요청 병합 (AIInflightLock)
+class SharedSingleFlightTests(TestCase):
+    # 다른 프로세스가 처리 중이면 공유 캐시의 결과를 사용
+    def test_waits_for_other_process_result(self):
+        flight = SingleFlight(shared=True, wait_timeout=5, poll_interval=0.01)
+        AIInflightLock.objects.create(key='key', owner='other:1', expires_at=timezone.now() + timedelta(seconds=30))
+        results = iter([None, 'shared'])
+
+        func = mock.Mock(return_value='own')
+        self.assertEqual(flight.do('key', func, fetch_shared=lambda: next(results)), 'shared')
+        func.assert_not_called()
+
+    # 잠금을 얻은 요청은 직접 호출하고 끝나면 잠금 해제, 만료된 잠금은 무시
+    def test_leader_releases_lock(self):
+        flight = SingleFlight(shared=True, wait_timeout=5)
+        AIInflightLock.objects.create(key='key', owner='other:1', expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(flight.do('key', lambda: 'own', fetch_shared=lambda: None), 'own')
+        self.assertFalse(AIInflightLock.objects.filter(key='key').exists())
+
+
+# 커서 기반 페이지네이션
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='paging', password='pw')
+        posts = [Post.objects.create(author=self.user, title=f'글 {i}', content='본문') for i in range(7)]
+        # 정렬 키가 같은 게시글이 많아도 id 로 순서가 고정되는지 확인하기 위해 값을 겹치게 설정
+        same_time = timezone.now()
+        Post.objects.filter(pk__in=[post.pk for post in posts[:5]]).update(created_at=same_time)
+        Post.objects.filter(pk__in=[post.pk for post in posts[::2]]).update(like_count=3)
+
+    def walk(self, sort, limit):
+        ids, cursor = [], None
+        while True:
+            posts, cursor = paginate_keyset(Post.objects.all(), sort, cursor, limit)
+            ids.extend(post.pk for post in posts)
+            if cursor is None:
+                return ids
+
+    # 커서로 이어 읽은 결과가 전체 정렬 결과와 같음 (중복, 누락 없음)
+    def test_pages_match_full_ordering(self):
+        for sort in ('latest', 'oldest', 'likes', 'views'):
+            for limit in (1, 2, 3):
+                with self.subTest(sort=sort, limit=limit):
+                    expected = list(Post.objects.order_by(*SORT_ORDERINGS[sort]).values_list('pk', flat=True))
+                    self.assertEqual(self.walk(sort, limit), expected)
+
+    # 커서 값은 원래 타입으로 복원되고, 변조되거나 다른 정렬의 커서는 거부
+    def test_cursor_round_trip_and_validation(self):
+        post = Post.objects.order_by('-like_count').first()
+        cursor = encode_cursor('likes', post)
+        self.assertEqual(decode_cursor(cursor, 'likes', Post), [post.like_count, post.created_at, post.pk])
+
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, 'latest', Post)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor[:-2] + 'xx', 'likes', Post)
+
+    # 피드 API 는 next_cursor 로 이어지고 잘못된 커서는 400
+    def test_feed_view(self):
+        seen, cursor = [], None
+        while True:
+            params = {'sort': 'likes', 'limit': 3, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get('/blog/feed/', params).json()
+            seen.extend(post['id'] for post in data['posts'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, list(Post.objects.order_by(*SORT_ORDERINGS['likes']).values_list('pk', flat=True)))
+        self.assertEqual(self.client.get('/blog/feed/', {'cursor': 'invalid'}).status_code, 400)
+
+
+# 조회수 집계 (중복 제거, 일괄 저장)
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='reader', password='pw')
+        self.post = Post.objects.create(author=self.user, title='조회수', content='본문')
+        self.factory = RequestFactory()
+        # 백그라운드 flush 가 테스트 중에 실행되지 않도록 주기를 길게
+        self.counter = ViewCounter(flush_interval=3600, buffered=True)
+        patcher = mock.patch('blog.view_counter.post_analytics')
+        self.analytics = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, address='10.0.0.1', user=None):
+        request = self.factory.get('/', REMOTE_ADDR=address, HTTP_USER_AGENT='test')
+        request.user = user or AnonymousUser()
+        return request
+
+    # 같은 방문자의 재조회는 세지 않고, 읽기 경로에서는 DB 에 쓰지 않음
+    def test_dedupes_same_visitor(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(self.counter.record(self.request(), self.post.pk))
+            self.assertFalse(self.counter.record(self.request(), self.post.pk))
+            self.assertTrue(self.counter.record(self.request('10.0.0.2'), self.post.pk))
+            self.assertTrue(self.counter.record(self.request(user=self.user), self.post.pk))
+            self.assertFalse(self.counter.record(self.request('10.0.0.9', user=self.user), self.post.pk))
+
+        self.assertEqual(self.counter.pending(self.post.pk), 3)
+        # 중복 조회도 순방문자 통계에는 전달
+        self.assertEqual(self.analytics.record_view.call_count, 5)
+
+    # 중복 제거 기간이 0 이면 모든 조회를 셈
+    @override_settings(VIEW_COUNT_DEDUPE_WINDOW=0)
+    def test_dedupe_disabled(self):
+        counter = ViewCounter(flush_interval=3600, buffered=True)
+        self.assertTrue(counter.record(self.request(), self.post.pk))
+        self.assertTrue(counter.record(self.request(), self.post.pk))
+        self.assertEqual(counter.pending(self.post.pk), 2)
+
+    # flush 는 게시글 묶음마다 UPDATE 한 번으로 저장하고 버퍼를 비움
+    def test_flush_writes_batched_counts(self):
+        other = Post.objects.create(author=self.user, title='다른 글', content='본문')
+        for address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            self.counter.record(self.request(address), self.post.pk)
+        self.counter.record(self.request(), other.pk)
+
+        self.assertEqual(self.counter.flush(), 4)
+        self.assertEqual(self.counter.pending(self.post.pk), 0)
+        self.post.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.post.views, other.views), (3, 1))
+        self.assertEqual(self.counter.flush(), 0)
+
+    # 저장에 실패한 조회수는 버퍼로 되돌려 다음 flush 에서 저장
+    def test_failed_flush_keeps_counts(self):
+        self.counter.record(self.request(), self.post.pk)
+        with mock.patch.object(self.counter, '_write', side_effect=RuntimeError('db down')):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(self.post.pk), 1)
+
+        self.assertEqual(self.counter.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    # 인기 점수 갱신이 실패해도 조회수 저장은 유지
+    def test_trending_failure_does_not_block_flush(self):
+        self.counter.record(self.request(), self.post.pk)
+        with mock.patch('blog.view_counter.trending.record_many', side_effect=RuntimeError('underflow')):
+            self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.counter.pending(self.post.pk), 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    # 버퍼링하지 않으면 바로 저장
+    def test_unbuffered_writes_immediately(self):
+        counter = ViewCounter(buffered=False)
+        counter.record(self.request(), self.post.pk)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+        self.assertEqual(counter.pending(self.post.pk), 0)
+
+
+# 화면 캐시 - 다른 요청이 렌더링 중이고 캐시가 없을 때
+class PageCacheWaitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.page_cache = PageCache()
+        self.request = RequestFactory().get('/blog/')
+        self.request.user = AnonymousUser()
+        self.key = self.page_cache.key(self.request, 'list')
+        cache.add(f'{self.key}:lock', 1, 10)
+        self.render = mock.Mock(return_value=HttpResponse('rendered'))
+
+    def tearDown(self):
+        cache.clear()
+
+    # 한 번만 짧게 기다린 뒤 직접 렌더링 (반복 확인하지 않음)
+    def test_renders_after_single_bounded_wait(self):
+        with mock.patch('blog.page_cache.time.sleep') as sleep:
+            response = self.page_cache.serve(self.request, 'list', self.render)
+        sleep.assert_called_once_with(self.page_cache.wait)
+        self.render.assert_called_once()
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertEqual(response.content, b'rendered')
+
+    # 기다리는 동안 렌더링이 끝나면 그 결과 사용
+    def test_uses_entry_rendered_during_wait(self):
+        def finish_render(seconds):
+            cache.set(self.key, {'content': b'shared', 'content_type': 'text/html', 'created': time.time()})
+
+        with mock.patch('blog.page_cache.time.sleep', side_effect=finish_render):
+            response = self.page_cache.serve(self.request, 'list', self.render)
+        self.render.assert_not_called()
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        self.assertEqual(response.content, b'shared')
+
+
+# 바이트 단위 토크나이저 (tiktoken 처럼 토큰 경계가 멀티바이트 글자 중간에 올 수 있음)
+class ByteEncoding:
+    def encode(self, text, disallowed_special=()):
+        return list(text.encode('utf-8'))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode('utf-8', errors='replace')
+
+
+# 토큰 수 기준 자르기
+class TruncateTokensTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ai_tokens, '_get_encoding', return_value=ByteEncoding())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # 한글 글자 중간에서 잘려도 깨진 글자(U+FFFD) 없이 온전한 글자까지만 남김
+    def test_strips_split_hangul(self):
+        self.assertEqual(ai_tokens.truncate_tokens('한국어', 4), '한')
+        self.assertEqual(ai_tokens.truncate_tokens('한국어', 4, from_end=True), '어')
+        self.assertEqual(ai_tokens.truncate_tokens('한국어', 6), '한국')
+        self.assertEqual(ai_tokens.truncate_tokens('한', 2), '')
+
+    # 긴 문장을 나눌 때 글자가 빠지거나 겹치지 않음
+    def test_chunk_keeps_every_character(self):
+        sentence = '가나다라마바사아자차카타파하' * 3
+        chunks = ai_budget.PromptBudget().chunk(sentence, 'gpt-4o-mini', 10)
+        self.assertEqual(''.join(chunks), sentence)
+        self.assertTrue(all('\ufffd' not in chunk and chunk for chunk in chunks))
+
+    # 잘린 앞부분에 깨진 글자가 남아 있어도 원문 기준 위치에서 나눔
+    def test_chunk_ignores_replacement_character_in_head(self):
+        def raw_truncate(text, max_tokens, model):
+            return ByteEncoding().decode(ByteEncoding().encode(text)[:max_tokens])
+
+        sentence = '가나다라마바사아자차카타파하' * 3
+        with mock.patch.object(ai_tokens, 'truncate_tokens', raw_truncate):
+            chunks = ai_budget.PromptBudget().chunk(sentence, 'gpt-4o-mini', 10)
+        self.assertEqual(''.join(chunks), sentence)
+
+
+# 토크나이저 인코딩 로드 실패 시 대기 후 재시도
+@mock.patch.object(ai_tokens, 'TIKTOKEN_AVAILABLE', True)
+class EncodingLoaderTests(SimpleTestCase):
+    def setUp(self):
+        for name in ('_encodings', '_failures'):
+            patcher = mock.patch.dict(getattr(ai_tokens, name), clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.now = 1000.0
+        for patcher in (
+            mock.patch.object(ai_tokens.time, 'monotonic', lambda: self.now),
+            # 백그라운드 재시도를 바로 실행
+            mock.patch.object(ai_tokens, '_load_in_background', ai_tokens._load_encoding),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    # 실패는 영구히 기억하지 않고 대기 시간이 지나면 다시 로드
+    def test_retries_after_backoff(self):
+        encoding = ByteEncoding()
+        tiktoken = mock.Mock()
+        tiktoken.encoding_for_model.side_effect = [OSError('network'), OSError('network'), encoding]
+        with mock.patch.object(ai_tokens, 'tiktoken', tiktoken, create=True):
+            self.assertIsNone(ai_tokens._get_encoding('gpt-4o-mini'))
+            self.assertEqual(ai_tokens.count_tokens('abcdefgh'), 2)
+
+            # 대기 시간 동안은 다시 로드하지 않음
+            self.now += ai_tokens.LOAD_RETRY_SECONDS - 1
+            self.assertIsNone(ai_tokens._get_encoding('gpt-4o-mini'))
+            self.assertEqual(tiktoken.encoding_for_model.call_count, 1)
+
+            # 대기 후 재시도, 다시 실패하면 대기 시간이 두 배
+            self.now += 1
+            self.assertIsNone(ai_tokens._get_encoding('gpt-4o-mini'))
+            self.now += ai_tokens.LOAD_RETRY_SECONDS * 2 - 1
+            self.assertIsNone(ai_tokens._get_encoding('gpt-4o-mini'))
+            self.assertEqual(tiktoken.encoding_for_model.call_count, 2)
+
+            self.now += 1
+            ai_tokens._get_encoding('gpt-4o-mini')
+            self.assertIs(ai_tokens._get_encoding('gpt-4o-mini'), encoding)
+            self.assertEqual(ai_tokens.count_tokens('abcdefgh'), 8)
+            self.assertNotIn('gpt-4o-mini', ai_tokens._failures)
+
+    # 앱 시작 시 미리 로드
+    def test_warm_up(self):
+        encoding = ByteEncoding()
+        tiktoken = mock.Mock()
+        tiktoken.encoding_for_model.return_value = encoding
+        with mock.patch.object(ai_tokens, 'tiktoken', tiktoken, create=True):
+            ai_tokens.warm_up()
+        self.assertIs(ai_tokens._encodings['gpt-4o-mini'], encoding)
+
+
+# 중단된 스트림의 사용량 추정
+class StreamUsageTests(SimpleTestCase):
+    # 입력 토큰은 글 내용만이 아니라 시스템 프롬프트를 포함한 실제 요청 메시지로 추정
+    def test_aborted_stream_estimates_full_prompt(self):
+        service = OpenAIService()
+        content = '오늘은 장고 캐시에 대해 정리해 보려고 합니다. ' * 3
+        recorder = mock.Mock()
+
+        with mock.patch.object(ai_streaming, 'ai_service', service), \
+                mock.patch.object(ai_streaming, 'usage_recorder', recorder):
+            ai_streaming.log_stream_usage(None, content, 'professional', '이어지는 글', None, buffered=True)
+
+        result = recorder.record.call_args.args[2]
+        messages = service._completion_messages(content, 'professional')
+        self.assertTrue(result.estimated)
+        self.assertEqual(result.prompt_tokens, ai_tokens.count_message_tokens(messages, service.model))
+        self.assertGreater(result.prompt_tokens, ai_tokens.count_message_tokens([{'content': content}], service.model))
+
+
+# 인기 점수 (log 공간 감쇠 점수)
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='trend', password='pw')
+        self.post = Post.objects.create(author=self.user, title='인기 글', content='본문')
+        self.other = Post.objects.create(author=self.user, title='새 글', content='본문')
+        # 작성 시 자동으로 추가된 점수는 지우고 시각을 지정한 이벤트로만 계산
+        TrendingScore.objects.all().delete()
+        self.now = timezone.now()
+
+    def score(self, post):
+        return TrendingScore.objects.get(post=post).score
+
+    # 첫 이벤트는 이벤트 점수 그대로 저장 (빈 점수를 exp 에 넣지 않음)
+    def test_first_event_stores_event_score(self):
+        with CaptureQueriesContext(connection) as queries:
+            trending.record_many({self.post.pk: 5.0}, at=self.now)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+        self.assertAlmostEqual(self.score(self.post), trending.event_score(5.0, self.now))
+
+    # 이후 이벤트는 log(sum(exp(이벤트 점수))) 로 합산
+    def test_later_events_add_in_log_space(self):
+        events = [(1.0, self.now - timedelta(hours=30)), (5.0, self.now - timedelta(hours=2)), (8.0, self.now)]
+        for event_weight, at in events:
+            trending.record_many({self.post.pk: event_weight}, at=at)
+
+        values = [trending.event_score(w, at) for w, at in events]
+        # 점수가 커서 exp 가 넘치지 않도록 최댓값을 빼고 계산한 log(sum(exp(...)))
+        expected = max(values) + math.log(sum(math.exp(value - max(values)) for value in values))
+        self.assertAlmostEqual(self.score(self.post), expected, places=6)
+        expected_decayed = sum(w * math.exp(-(self.now - at).total_seconds() / trending.tau()) for w, at in events)
+        self.assertAlmostEqual(trending.decayed(self.score(self.post), self.now), expected_decayed, places=6)
+
+    # 점수 차이가 매우 커도 (오래된 점수 + 새 이벤트) 합산이 실패하지 않음
+    def test_large_score_gap_is_clamped(self):
+        trending.record_many({self.post.pk: 1.0}, at=self.now - timedelta(days=1500))
+        trending.record_many({self.post.pk: 1.0}, at=self.now)
+        self.assertAlmostEqual(self.score(self.post), trending.event_score(1.0, self.now))
+
+    # 오래전에 인기 있던 글은 감쇠되어 방금 활동이 있는 글보다 아래
+    def test_decay_orders_old_popular_post_below_fresh_one(self):
+        trending.record_many({self.post.pk: 100.0}, at=self.now - timedelta(days=7))
+        trending.record_many({self.other.pk: 10.0}, at=self.now)
+        self.assertLess(self.score(self.post), self.score(self.other))
+
+        response = self.client.get('/blog/', {'sort': 'trending'})
+        self.assertEqual([post.pk for post in response.context['posts']], [self.other.pk, self.post.pk])
+
+    # 재계산은 원본 이벤트로 점수를 만들고 최소 점수보다 낮은 글은 제외
+    @override_settings(TRENDING_MIN_SCORE=1.0)
+    def test_rebuild_drops_cold_posts(self):
+        Post.objects.filter(pk=self.post.pk).update(created_at=self.now - timedelta(days=10))
+        Like.objects.create(user=self.user, post=self.other)
+        trending.record_many({self.post.pk: 1.0}, at=self.now)
+
+        result = trending.rebuild()
+
+        self.assertFalse(TrendingScore.objects.filter(post=self.post).exists())
+        self.assertEqual(result['dropped_cold'], 1)
+        self.assertGreaterEqual(trending.decayed(self.score(self.other)), 1.0)
+
+
+# 좋아요/팔로워 카운터 (비정규화 컬럼)
+class CounterTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user(username='writer', password='pw')
+        self.reader = User.objects.create_user(username='fan', password='pw')
+        self.post = Post.objects.create(author=self.author, title='카운터', content='본문')
+
+    def counts(self):
+        self.post.refresh_from_db()
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        return self.post.like_count, self.author.follower_count, self.reader.following_count
+
+    # 좋아요/취소, 팔로우/언팔로우를 두 번 반복해도 카운터가 실제 개수와 같음
+    def test_toggle_like_and_follow_twice(self):
+        for _ in range(2):
+            self.assertEqual(self.post.toggle_like(self.reader), (True, 1))
+            self.assertEqual(self.reader.toggle_follow(self.author), (True, 1))
+            self.assertEqual(self.counts(), (1, 1, 1))
+
+            self.assertEqual(self.post.toggle_like(self.reader), (False, 0))
+            self.assertEqual(self.reader.toggle_follow(self.author), (False, 0))
+            self.assertEqual(self.counts(), (0, 0, 0))
+
+    # 이미 0 인 카운터를 줄이는 경쟁 상황에서도 음수가 되지 않음
+    def test_decrement_floors_at_zero(self):
+        # 카운터를 거치지 않고 만든 좋아요/팔로우 (다른 요청이 먼저 카운터를 줄인 상황)
+        Like.objects.create(user=self.reader, post=self.post)
+        Follow.objects.create(follower=self.reader, following=self.author)
+
+        self.assertEqual(self.post.toggle_like(self.reader), (False, 0))
+        self.assertEqual(self.reader.toggle_follow(self.author), (False, 0))
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    # reconcile_counters 는 어긋난 카운터를 실제 개수로 보정 (--dry-run 은 확인만)
+    def test_reconcile_command_repairs_drift(self):
+        self.post.toggle_like(self.reader)
+        Post.objects.filter(pk=self.post.pk).update(like_count=7, comment_count=3)
+        get_user_model().objects.filter(pk=self.author.pk).update(follower_count=5)
+
+        call_command('reconcile_counters', '--dry-run', stdout=io.StringIO())
+        self.assertEqual(self.counts(), (7, 5, 0))
+
+        call_command('reconcile_counters', stdout=io.StringIO())
+        self.assertEqual(self.counts(), (1, 0, 0))
+        self.assertEqual(self.post.comment_count, 0)
+
+
+# 전문 검색 (SQLite FTS5 색인)
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='searcher', password='pw')
+
+    def post(self, title, content):
+        return Post.objects.create(author=self.user, title=title, content=content)
+
+    def found(self, query, ranked=False):
+        return list(search.search(Post.objects.all(), query, ranked=ranked).order_by(
+            'search_rank' if ranked else 'pk').values_list('pk', flat=True))
+
+    # 한글은 2글자씩 잘라 색인하므로 어절 안의 일부(부분 문자열)로도 검색됨
+    def test_korean_bigram_matches_substring(self):
+        self.assertEqual(search.tokenize('데이터베이스를'), ['데이', '이터', '터베', '베이', '이스', '스를'])
+        post = self.post('정리', '관계형 데이터베이스를 공부했습니다')
+        self.post('다른 글', '오늘의 날씨')
+
+        self.assertEqual(self.found('베이스'), [post.pk])
+        self.assertEqual(self.found('데이터 공부'), [post.pk])
+        self.assertEqual(self.found('베이스 날씨'), [])
+
+    # 수정한 글은 새 내용으로, 삭제한 글은 색인에서 빠짐
+    def test_edit_and_delete_update_index(self):
+        post = self.post('장고 캐시', '캐시 무효화')
+        post.title = '파이썬 비동기'
+        post.content = '이벤트 루프'
+        post.save()
+
+        self.assertEqual(self.found('장고'), [])
+        self.assertEqual(self.found('비동기'), [post.pk])
+
+        post.delete()
+        self.assertEqual(self.found('비동기'), [])
+
+    # BM25 순위 (제목 가중치가 본문보다 큼) + 관련도 검색 결과 개수 제한
+    def test_bm25_order_and_result_cap(self):
+        in_content = self.post('오늘의 일기', '점심에 파스타를 먹었다')
+        in_title = self.post('파스타 만들기', '면을 삶는다')
+        self.assertEqual(self.found('파스타', ranked=True), [in_title.pk, in_content.pk])
+
+        Post.objects.bulk_create([Post(author=self.user, title=f'검색 {i}', content='반복 본문') for i in range(205)])
+        search.rebuild()
+        self.assertEqual(len(self.found('반복', ranked=True)), 200)
+        with self.settings(SEARCH_MAX_RANKED_RESULTS=10):
+            self.assertEqual(len(self.found('반복', ranked=True)), 10)
+
+    # 검색어가 처음 나오는 부분을 잘라 강조 (HTML 은 이스케이프)
+    def test_highlight_marks_query(self):
+        snippet = search.highlight('<b>장고</b> 캐시를 쓰면 빨라집니다', '캐시')
+        self.assertEqual(snippet, '&lt;b&gt;장고&lt;/b&gt; <mark>캐시</mark>를 쓰면 빨라집니다')
+
+
+# 임베딩 인덱스 (로컬 임베딩 공급자, 임시 디렉터리)
+class SemanticIndexTests(SimpleTestCase):
+    TOPICS = ['장고 ORM 쿼리셋', '파이썬 비동기 asyncio', '김치찌개 레시피', '제주도 여행 일정', '리액트 상태 관리',
+              '주식 배당 투자', '마라톤 훈련 기록', '커피 원두 로스팅']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = self.settings(AI_EMBEDDING_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        provider = mock.patch('blog.semantic.get_provider', return_value=LocalEmbeddingProvider())
+        provider.start()
+        self.addCleanup(provider.stop)
+
+    def items(self, count):
+        return [
+            (post_id, f'{self.TOPICS[post_id % len(self.TOPICS)]} {post_id}번째 글',
+             f'{self.TOPICS[post_id % len(self.TOPICS)]} 정리와 메모 {post_id}')
+            for post_id in range(1, count + 1)
+        ]
+
+    def rows(self, index):
+        index._refresh()
+        return index._meta['rows']
+
+    # 추가한 게시글이 검색되고, 내용이 같으면 다시 임베딩하지 않음
+    def test_upsert_and_search(self):
+        index = SemanticIndex()
+        items = self.items(8)
+        self.assertEqual(index.upsert_many(items), 8)
+        self.assertEqual(index.upsert_many(items), 0)
+
+        post_id, title, content = items[2]
+        self.assertEqual(index.search(f'{title}\n\n{content}', k=3)[0][0], post_id)
+
+    # 삭제한 행은 검색에서 빠지고 다음 추가 때 재사용
+    def test_remove_frees_row(self):
+        index = SemanticIndex()
+        index.upsert_many(self.items(3))
+        index.remove(2)
+        self.assertEqual(self.rows(index), [1, 0, 3])
+        self.assertNotIn(2, [post_id for post_id, _ in index.search('파이썬 비동기 asyncio 2번째 글', k=3)])
+
+        index.upsert_many([(9, '새 글', '새 글 본문')])
+        self.assertEqual(self.rows(index), [1, 9, 3])
+
+    # 다른 프로세스가 index.json 을 교체하면 다음 검색 때 다시 읽음
+    def test_picks_up_other_process_writes(self):
+        reader, writer = SemanticIndex(), SemanticIndex()
+        writer.upsert_many(self.items(2))
+        self.assertEqual(reader.search('장고 ORM 쿼리셋 8번째 글', k=5), [])
+
+        writer.upsert_many([(8, '장고 ORM 쿼리셋 8번째 글', '장고 ORM 쿼리셋 정리와 메모 8')])
+        self.assertEqual(reader.search('장고 ORM 쿼리셋 8번째 글', k=1)[0][0], 8)
+
+        writer.remove(8)
+        self.assertNotIn(8, [post_id for post_id, _ in reader.search('장고 ORM 쿼리셋 8번째 글', k=5)])
+
+    # 게시글 수가 AI_SEMANTIC_EXACT_LIMIT 를 넘으면 IVF 검색 - 모든 군집을 살피면 전체 내적과 같은 결과
+    @override_settings(AI_SEMANTIC_EXACT_LIMIT=10, AI_SEMANTIC_NPROBE=16, AI_SEMANTIC_MIN_SCORE=-1)
+    def test_ivf_matches_brute_force(self):
+        ivf = SemanticIndex()
+        ivf.upsert_many(self.items(40))
+        with self.settings(AI_SEMANTIC_EXACT_LIMIT=1000):
+            exact = SemanticIndex()
+
+        queries = ['김치찌개 레시피 정리', '파이썬 비동기 asyncio 메모', '제주도 여행 일정 3번째 글']
+        for query in queries:
+            self.assertEqual(ivf.search(query, k=5), exact.search(query, k=5))
+        self.assertIsNotNone(ivf._ivf)
+        self.assertIsNone(exact._ivf)
+
+        # 재학습 없이 바뀐 행만 다시 배정해도 같은 결과
+        trained = ivf._ivf['centroids']
+        ivf.upsert_many([(41, '커피 원두 로스팅 새 글', '커피 원두 로스팅 정리'), (3, '마라톤 훈련 기록', '마라톤')])
+        self.assertIs(ivf._ivf['centroids'], trained)
+        for query in queries + ['커피 원두 로스팅 새 글']:
+            self.assertEqual(ivf.search(query, k=5), exact.search(query, k=5))
+
+
+# 순방문자 HyperLogLog 스케치와 일별 통계 저장
+class AnalyticsTests(TestCase):
+    def sketch(self, visitors):
+        sketch = HyperLogLog()
+        for visitor in visitors:
+            sketch.add(f'visitor-{visitor}')
+        return sketch
+
+    # 추정값이 표준 오차(약 1.6%)의 3배 안, 같은 방문자를 다시 넣어도 그대로
+    def test_estimate_within_expected_error(self):
+        for n in (100, 5000, 50000):
+            sketch = self.sketch(range(n))
+            self.assertLess(abs(sketch.count() - n) / n, 3 * 1.04 / math.sqrt(sketch.size), n)
+        self.assertEqual(self.sketch(list(range(100)) * 3).count(), self.sketch(range(100)).count())
+
+    # 이틀치 레지스터를 합치면 합집합 (두 날의 합이 아님)
+    def test_merge_is_union(self):
+        first, second = self.sketch(range(0, 6000)), self.sketch(range(3000, 9000))
+        merged = HyperLogLog.merge([first.to_bytes(), second.to_bytes()])
+        self.assertLess(abs(merged.count() - 9000) / 9000, 0.05)
+        self.assertEqual(merged.count(), self.sketch(range(9000)).count())
+
+    # flush 는 조회수를 더하고 스케치는 합쳐 순방문자를 저장
+    def test_flush_accumulates_daily_stats(self):
+        user = get_user_model().objects.create_user(username='stats', password='pw')
+        post = Post.objects.create(author=user, title='통계', content='본문')
+        analytics = PostAnalytics(flush_interval=3600, enabled=True)
+        self.addCleanup(analytics.shutdown)
+
+        analytics.record_view(post.pk, 'a')
+        analytics.record_view(post.pk, 'a', counted=False)
+        analytics.record_view(post.pk, 'b')
+        analytics.record_like(post.pk, 1)
+        self.assertEqual(analytics.flush(), 1)
+
+        analytics.record_view(post.pk, 'b')
+        analytics.record_view(post.pk, 'c')
+        analytics.flush()
+
+        row = PostDailyStats.objects.get(post=post)
+        self.assertEqual((row.views, row.likes, row.uniques), (4, 1, 3))
+
+        # 다른 날짜의 스케치와 합쳐도 같은 방문자는 한 번만 셈
+        yesterday = timezone.localdate() - timedelta(days=1)
+        day = HyperLogLog()
+        for visitor in ('a', 'z'):
+            day.add(visitor)
+        PostDailyStats.objects.create(post=post, date=yesterday, views=2, uniques=2, sketch=day.to_bytes())
+        self.assertEqual(unique_readers([post.pk], yesterday, timezone.localdate()), 4)
+
+
+# 백그라운드 AI 작업 큐 (요약 작업 등록, 선점, 재시도)
+class AIJobQueueTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='jobs', password='pw')
+        self.post = Post.objects.create(author=self.user, title='요약 대상', content='요약할 본문입니다. ' * 30)
+        self.service = mock.Mock(dummy_mode=False)
+        self.service.summarize.return_value = AIResult(value='요약', total_tokens=10)
+        patcher = mock.patch('blog.ai_service.ai_service', self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.recorder = mock.patch('blog.ai_jobs.usage_recorder')
+        self.recorder.start()
+        self.addCleanup(self.recorder.stop)
+
+    def job(self):
+        return AIJob.objects.get(post=self.post, job_type='summary')
+
+    # 조건부 UPDATE 로 선점하므로 같은 작업을 두 워커가 가져가지 않음
+    def test_claim_is_exclusive(self):
+        job = enqueue_summary_job(self.post)
+        first, second = AIJobWorker('worker-a'), AIJobWorker('worker-b')
+
+        self.assertEqual(first.claim(1), [job.pk])
+        self.assertEqual(second.claim(1), [])
+        # 선점 전에 후보 목록을 읽은 워커도 상태 조건 UPDATE 에서 밀려 선점하지 못함
+        real_filter = AIJob.objects.filter
+        stale = mock.MagicMock()
+        stale.order_by.return_value.values_list.return_value.__getitem__.return_value = [job.pk]
+        calls = iter([stale])
+        with mock.patch.object(AIJob.objects, 'filter', side_effect=lambda **kw: next(calls, None) or real_filter(**kw)):
+            self.assertEqual(second.claim(1), [])
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), ('running', 'worker-a', 1))
+
+    # 실패하면 지수 백오프 후 재시도, max_attempts 에 도달하면 failed
+    @override_settings(AI_JOB_BACKOFF_BASE=30)
+    def test_retry_backoff_then_failed(self):
+        self.service.summarize.side_effect = RuntimeError('timeout')
+        job = enqueue_summary_job(self.post)
+        AIJob.objects.filter(pk=job.pk).update(max_attempts=2)
+        worker = AIJobWorker('worker-a')
+
+        worker.claim(1)
+        before = timezone.now()
+        self.assertFalse(worker.run(job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.last_error), ('pending', 1, 'timeout'))
+        delay = (job.run_after - before).total_seconds()
+        self.assertTrue(24 <= delay <= 36.5, delay)
+
+        AIJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        worker.claim(1)
+        self.assertFalse(worker.run(job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertEqual(worker.claim(1), [])
+
+    # 임대 시간이 지난 작업은 대기열로 돌아가 다른 워커가 다시 선점
+    def test_lease_expiry_reclaims(self):
+        job = enqueue_summary_job(self.post)
+        crashed, other = AIJobWorker('crashed'), AIJobWorker('other')
+        crashed.claim(1)
+        self.assertEqual(other.release_stale(), 0)
+
+        AIJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=other.lease_timeout + 1))
+        self.assertEqual(other.release_stale(), 1)
+        self.assertEqual(other.claim(1), [job.pk])
+        job.refresh_from_db()
+        self.assertEqual((job.locked_by, job.attempts), ('other', 2))
+
+    # 본문이 그대로이고 요약이 이미 있으면 작업을 만들지 않음
+    def test_unchanged_content_skips_enqueue(self):
+        job = enqueue_summary_job(self.post)
+        worker = AIJobWorker('worker-a')
+        worker.claim(1)
+        self.assertTrue(worker.run(job.pk))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.summary, '요약')
+
+        self.assertIsNone(enqueue_summary_job(self.post))
+        self.post.content += ' 추가 문단'
+        self.assertNotEqual(enqueue_summary_job(self.post).pk, job.pk)
+
+    # 처리 중인 작업이 있으면 새 작업 대신 해시를 갱신하고, 워커는 끝난 뒤 다시 대기열에 넣음
+    def test_running_job_is_reused_and_requeued(self):
+        job = enqueue_summary_job(self.post)
+        worker = AIJobWorker('worker-a')
+        worker.claim(1)
+
+        def edit_during_summary(content, max_length):
+            self.post.content = content + ' 수정된 문단'
+            self.post.save()
+            self.assertEqual(enqueue_summary_job(self.post).pk, job.pk)
+            return AIResult(value='이전 본문 요약')
+
+        self.service.summarize.side_effect = edit_during_summary
+        self.assertFalse(worker.run(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 0))
+        self.assertEqual(job.content_hash, content_hash(self.post.content))
+        self.assertEqual(AIJob.objects.filter(post=self.post).count(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.summary, '')
+
+    # AI 서비스를 쓸 수 없으면 작업을 만들지 않음
+    def test_no_provider_skips_enqueue(self):
+        self.service.dummy_mode = True
+        self.assertIsNone(enqueue_summary_job(self.post))
+        with mock.patch('blog.ai_service.ai_service', None):
+            self.assertIsNone(enqueue_summary_job(self.post))
+        self.assertFalse(AIJob.objects.exists())
+
+
+# 제목/태그/요약 일괄 추천 (JSON 응답 파싱, 기능별 사용량 배분, 개별 요청 대체)
+class AssistBundleTests(SimpleTestCase):
+    BUNDLE = {
+        'titles': ['장고 캐시 완벽 정리', '캐시로 빨라지는 장고'],
+        'tags': ['#장고', '캐시', '성능'],
+        'summary': '장고 캐시 사용법을 정리한 글입니다.',
+    }
+
+    def setUp(self):
+        self.service = OpenAIService()
+        self.service.dummy_mode = False
+        self.service.cache = None
+        self.client = self.service.client = mock.Mock()
+        self.bundle_reply = json.dumps(self.BUNDLE, ensure_ascii=False)
+        self.client.chat.completions.create.side_effect = self.reply
+
+    def response(self, content, prompt_tokens, completion_tokens):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens),
+            model='gpt-4o-mini',
+        )
+
+    # 일괄 요청은 JSON 형식 응답, 대체 요청은 기능별 프롬프트 (max_tokens 로 구분)
+    def reply(self, **params):
+        if 'response_format' in params:
+            return self.response(self.bundle_reply, 91, 60)
+        return {
+            200: self.response('개별 요청 제목 하나\n개별 요청 제목 둘', 40, 10),
+            150: self.response('개별태그\n파이썬', 30, 5),
+            300: self.response('개별 요청 요약입니다.', 50, 20),
+        }[params['max_tokens']]
+
+    # JSON 응답을 개별 기능과 같은 규칙으로 정제하고, API 호출은 한 번
+    def test_parses_json_response(self):
+        bundle = self.service.generate_assist_bundle('장고 캐시', '본문 ' * 100, title_count=4)
+
+        self.assertTrue(bundle['bundled'])
+        self.assertEqual(bundle['titles'], self.BUNDLE['titles'])
+        self.assertEqual(bundle['tags'], ['장고', '캐시', '성능'])
+        self.assertEqual(bundle['summary'], self.BUNDLE['summary'])
+        self.client.chat.completions.create.assert_called_once()
+        self.assertEqual(self.client.chat.completions.create.call_args.kwargs['response_format'],
+                         {'type': 'json_object'})
+
+    # 입력 토큰은 균등, 출력 토큰은 결과 길이 비율로 나누고 합은 실제 사용량과 같음
+    def test_splits_usage_per_feature(self):
+        bundle = self.service.generate_assist_bundle('장고 캐시', '본문 ' * 100)
+        entries = ai_views.bundle_usage_entries(bundle)
+
+        self.assertEqual([feature for feature, _ in entries], ['title_suggest', 'tag_suggest', 'summary'])
+        results = [result for _, result in entries]
+        self.assertEqual([result.prompt_tokens for result in results], [30, 30, 31])
+        self.assertEqual(sum(result.completion_tokens for result in results), 60)
+        self.assertEqual(sum(result.total_tokens for result in results), 151)
+        self.assertEqual([result.value for result in results], [bundle['titles'], bundle['tags'], bundle['summary']])
+        # 출력 토큰은 결과 길이에 비례 (제목이 태그보다 김)
+        self.assertGreater(results[0].completion_tokens, results[1].completion_tokens)
+
+    # 형식이 잘못된 JSON 이면 기능별 개별 요청으로 대체
+    def test_malformed_json_falls_back_to_individual_requests(self):
+        for reply in ('{"titles": ["잘린 응답', json.dumps({'titles': '문자열', 'tags': [], 'summary': ''})):
+            self.bundle_reply = reply
+            self.client.chat.completions.create.reset_mock()
+
+            bundle = self.service.generate_assist_bundle('장고 캐시', '본문 ' * 100)
+
+            self.assertFalse(bundle['bundled'])
+            self.assertEqual(bundle['titles'], ['개별 요청 제목 하나', '개별 요청 제목 둘'])
+            self.assertEqual(bundle['tags'], ['개별태그', '파이썬'])
+            self.assertEqual(bundle['summary'], '개별 요청 요약입니다.')
+            self.assertEqual(self.client.chat.completions.create.call_count, 4)
+            self.assertEqual(bundle['results']['summary'].total_tokens, 70)
@@ -0,0 +1,143 @@
+import logging
+import math
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 점수 기준 시각 (점수는 이 시각부터의 경과 시간으로 가중치를 키워 저장)
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+# 점수 합산 시 exp 지수의 하한 (double 범위 안, 그 이하는 0 과 차이 없음)
+MIN_EXPONENT = -700.0
+# 한 번의 UPDATE 로 갱신할 최대 게시글 수
+UPDATE_CHUNK_SIZE = 500
+
+DEFAULT_WEIGHTS = {'post': 10.0, 'view': 1.0, 'like': 5.0, 'comment': 8.0}
+
+
+def weight(event: str) -> float:
+    return getattr(settings, 'TRENDING_WEIGHTS', DEFAULT_WEIGHTS).get(event, 0.0)
+
+
+# 감쇠 시간 상수 (초) - 반감기 TRENDING_HALF_LIFE_HOURS
+def tau() -> float:
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600 / math.log(2)
+
+
+# 이벤트 하나의 점수 (log 공간): log(w) + (t - EPOCH) / tau
+# 감쇠된 점수 sum(w * exp(-(now - t) / tau)) 는 모든 게시글에 같은 exp(-now / tau) 를 곱한 값이므로
+# 저장된 log 점수의 순서가 곧 현재 감쇠 점수의 순서 - 감쇠 때문에 행을 다시 쓸 필요가 없음
+def event_score(event_weight: float, at=None) -> float:
+    at = at or timezone.now()
+    return math.log(event_weight) + (at - EPOCH).total_seconds() / tau()
+
+
+# 저장된 log 점수를 현재 시각 기준 감쇠 점수로 변환 (표시용)
+def decayed(score: float, at=None) -> float:
+    at = at or timezone.now()
+    return math.exp(score - (at - EPOCH).total_seconds() / tau())
+
+
+def _logaddexp(a: float, b: float) -> float:
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+# 게시글별 이벤트 가중치를 점수에 더함 ({게시글 id: 가중치 합})
+# 점수가 없던 게시글은 이벤트 점수로 바로 만들고, 있던 게시글은 log(exp(a) + exp(b)) 를 DB 에서 원자적으로 계산
+# (동시에 같은 게시글의 첫 점수를 만들면 한쪽 이벤트가 빠질 수 있음 - 주기적 재계산으로 보정)
+def record_many(weights: dict, at=None):
+    from .models import Post, TrendingScore
+
+    weights = {post_id: value for post_id, value in weights.items() if value > 0}
+    if not weights:
+        return
+
+    now = timezone.now()
+    scores = {post_id: event_score(value, at) for post_id, value in sorted(weights.items())}
+    with transaction.atomic():
+        existing = set(Post.objects.filter(pk__in=list(scores)).values_list('pk', flat=True))
+        scores = {post_id: score for post_id, score in scores.items() if post_id in existing}
+        scored = set(TrendingScore.objects.filter(post_id__in=list(scores)).values_list('post_id', flat=True))
+        TrendingScore.objects.bulk_create(
+            [TrendingScore(post_id=post_id, score=score, updated_at=now)
+             for post_id, score in scores.items() if post_id not in scored],
+            ignore_conflicts=True,
+        )
+
+        items = [(post_id, score) for post_id, score in scores.items() if post_id in scored]
+        for start in range(0, len(items), UPDATE_CHUNK_SIZE):
+            chunk = items[start:start + UPDATE_CHUNK_SIZE]
+            added = Case(
+                *[When(post_id=post_id, then=Value(score)) for post_id, score in chunk],
+                output_field=FloatField(),
+            )
+            # 지수가 너무 작으면 PostgreSQL 의 exp 가 underflow 오류를 내므로 하한 적용 (exp(-700) ≈ 0)
+            exponent = Greatest(-Abs(F('score') - added), Value(MIN_EXPONENT))
+            TrendingScore.objects.filter(post_id__in=[post_id for post_id, _ in chunk]).update(
+                score=Greatest(F('score'), added) + Ln(Value(1.0) + Exp(exponent)),
+                updated_at=now,
+            )
+
+
+def record(post_id, event: str, count: int = 1, at=None):
+    record_many({post_id: weight(event) * count}, at)
+
+
+# 실패해도 요청 처리는 계속 (인기 점수는 주기적 재계산으로 보정됨)
+def safe_record(post_id, event: str, count: int = 1):
+    try:
+        record(post_id, event, count)
+    except Exception as e:
+        logger.error(f"인기 점수 갱신 실패 (#{post_id}, {event}): {e}")
+
+
+# 원본 이벤트(게시글 작성, 좋아요, 댓글, 일별 조회수)로 점수를 다시 계산
+# - 좋아요 취소, 댓글 삭제처럼 증분으로 뺄 수 없는 변경을 반영
+# - 감쇠 점수가 TRENDING_MIN_SCORE 보다 작아진 게시글은 테이블에서 제외 (목록 조회 범위를 작게 유지)
+def rebuild(log=None) -> dict:
+    from .models import Comment, Like, Post, PostDailyStats, TrendingScore
+
+    now = timezone.now()
+    since = now - timedelta(days=getattr(settings, 'TRENDING_WINDOW_DAYS', 14))
+    min_score = getattr(settings, 'TRENDING_MIN_SCORE', 0.5)
+    scores = {}
+
+    def add(post_id, event_weight, at):
+        value = event_score(event_weight, at)
+        scores[post_id] = _logaddexp(scores[post_id], value) if post_id in scores else value
+
+    for post_id, created_at in Post.objects.filter(created_at__gte=since).values_list('pk', 'created_at').iterator():
+        add(post_id, weight('post'), created_at)
+    for post_id, created_at in Like.objects.filter(created_at__gte=since).values_list('post_id', 'created_at').iterator():
+        add(post_id, weight('like'), created_at)
+    for post_id, created_at in Comment.objects.filter(created_at__gte=since).values_list('post_id', 'created_at').iterator():
+        add(post_id, weight('comment'), created_at)
+    # 일별 조회수는 그날 정오(현지 시각)의 이벤트로 계산 (미래 시각은 현재로)
+    current_tz = timezone.get_current_timezone()
+    for post_id, date, views in PostDailyStats.objects.filter(
+        date__gte=timezone.localdate(since), views__gt=0
+    ).values_list('post_id', 'date', 'views').iterator():
+        at = min(datetime.combine(date, time(12), tzinfo=current_tz), now)
+        add(post_id, weight('view') * views, at)
+
+    kept = {post_id: score for post_id, score in scores.items() if decayed(score, now) >= min_score}
+    with transaction.atomic():
+        removed, _ = TrendingScore.objects.exclude(post_id__in=list(kept)).delete()
+        TrendingScore.objects.bulk_create(
+            [TrendingScore(post_id=post_id, score=score, updated_at=now) for post_id, score in kept.items()],
+            update_conflicts=True,
+            unique_fields=['post'],
+            update_fields=['score', 'updated_at'],
+        )
+
+    result = {'posts': len(kept), 'removed': removed, 'dropped_cold': len(scores) - len(kept)}
+    if log:
+        log(f"인기 점수 재계산 - {result}")
+    logger.info(f"인기 점수 재계산 - {result}")
+    return result
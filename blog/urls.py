@@ -1,9 +1,28 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from . import ai_views
+from . import ai_async_views
+
+# ASGI 로 구동할 때는 비동기 AI 뷰, 그 외(WSGI)에는 동기 뷰 사용
+if settings.AI_ASYNC_VIEWS:
+    title_view = ai_async_views.AsyncTitleSuggestionView
+    completion_view = ai_async_views.AsyncContentCompletionView
+    completion_stream_view = ai_async_views.AsyncContentCompletionStreamView
+    tag_view = ai_async_views.AsyncTagSuggestionView
+    summary_view = ai_async_views.AsyncSummaryGenerationView
+    bundle_view = ai_async_views.AsyncAssistBundleView
+else:
+    title_view = ai_views.TitleSuggestionView
+    completion_view = ai_views.ContentCompletionView
+    completion_stream_view = ai_views.ContentCompletionStreamView
+    tag_view = ai_views.TagSuggestionView
+    summary_view = ai_views.SummaryGenerationView
+    bundle_view = ai_views.AssistBundleView
 
 urlpatterns = [
     path("", views.PostListView.as_view(), name="post_list"),
+    path("feed/", views.PostFeedView.as_view(), name="post_feed"),
     path("write/", views.PostCreateView.as_view(), name="post_create"),
     path('<int:pk>/', views.PostDetailView.as_view(), name='post_detail'),
     path("<int:pk>/edit/", views.PostUpdateView.as_view(), name="post_update"),
@@ -14,14 +33,21 @@ urlpatterns = [
     path('comment/<int:comment_id>/delete/', views.CommentDeleteView.as_view(), name='comment_delete'),
     path('comment/<int:comment_id>/update/', views.CommentUpdateView.as_view(), name='comment_update'),
     path('comments/<int:post_id>/', views.CommentListView.as_view(), name='comment_list'),
+    path('comments/<int:post_id>/replies/<int:comment_id>/', views.CommentRepliesView.as_view(), name='comment_replies'),
 
     # 좋아요 관련 URL
     path('like/<int:post_id>/', views.LikeToggleView.as_view(), name='like_toggle'),
 
+    # 캐시된 화면의 사용자별 상태 (좋아요, 팔로우)
+    path('viewer-state/', views.ViewerStateView.as_view(), name='viewer_state'),
+
     # AI 관련 URL
-    path('ai/suggest-title/', ai_views.TitleSuggestionView.as_view(), name='ai_suggest_title'),
-    path('ai/complete-content/', ai_views.ContentCompletionView.as_view(), name='ai_complete_content'),
-    path('ai/suggest-tags/', ai_views.TagSuggestionView.as_view(), name='ai_suggest_tags'),
-    path('ai/generate-summary/', ai_views.SummaryGenerationView.as_view(), name='ai_generate_summary'),
+    path('ai/suggest-title/', title_view.as_view(), name='ai_suggest_title'),
+    path('ai/complete-content/', completion_view.as_view(), name='ai_complete_content'),
+    path('ai/complete-content/stream/', completion_stream_view.as_view(), name='ai_complete_content_stream'),
+    path('ai/suggest-tags/', tag_view.as_view(), name='ai_suggest_tags'),
+    path('ai/generate-summary/', summary_view.as_view(), name='ai_generate_summary'),
+    path('ai/assist-bundle/', bundle_view.as_view(), name='ai_assist_bundle'),
     path('ai/usage-stats/', ai_views.ai_usage_stats, name='ai_usage_stats'),
+    path('ai/metrics/', ai_views.ai_metrics_view, name='ai_metrics'),
 ]
\ No newline at end of file
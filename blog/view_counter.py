@@ -0,0 +1,158 @@
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, When
+
+from . import ai_metrics
+from .analytics import post_analytics
+from . import trending
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 UPDATE 로 증가시킬 최대 게시글 수
+FLUSH_CHUNK_SIZE = 500
+
+
+# 방문자 식별값 (로그인 사용자 id, 세션 키, 없으면 IP + User-Agent 해시) - 세션을 새로 만들지 않음
+def visitor_key(request) -> str:
+    if request.user.is_authenticated:
+        return f'u{request.user.pk}'
+    session_key = getattr(request, 'session', None) and request.session.session_key
+    if session_key:
+        return f's{session_key}'
+    raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return 'a' + hashlib.blake2b(raw.encode('utf-8'), digest_size=12).hexdigest()
+
+
+# 게시글 조회수 집계기 (중복 제거 후 메모리 버퍼, 주기적으로 일괄 UPDATE)
+# - record() 는 DB 에 쓰지 않음 (중복 확인은 Django 캐시 - 공유 캐시면 워커 간에도 중복 제거)
+# - 같은 방문자가 VIEW_COUNT_DEDUPE_WINDOW 초 안에 다시 본 경우는 세지 않음
+# - 프로세스가 비정상 종료되면 마지막 flush 이후 최대 flush_interval 초 분량이 유실될 수 있음
+class ViewCounter:
+    def __init__(self, flush_interval=None, max_pending=None, buffered=None):
+        self.flush_interval = flush_interval or getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10)
+        self.max_pending = max_pending or getattr(settings, 'VIEW_COUNT_FLUSH_SIZE', 1000)
+        self.buffered = getattr(settings, 'VIEW_COUNT_BUFFERED', True) if buffered is None else buffered
+        self.dedupe_window = getattr(settings, 'VIEW_COUNT_DEDUPE_WINDOW', 30 * 60)
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        ai_metrics.register_gauge('view_count.pending', lambda: sum(self._pending.values()))
+
+    # 조회 기록 (처음 본 경우에만 True) - 일별 통계(순방문자 포함)에도 함께 기록
+    def record(self, request, post_id) -> bool:
+        visitor = visitor_key(request)
+        counted = not self.dedupe_window or cache.add(f'views:seen:{post_id}:{visitor}', 1, self.dedupe_window)
+        post_analytics.record_view(post_id, visitor, counted)
+        if not counted:
+            ai_metrics.incr('view_count.duplicate')
+            return False
+
+        if not self.buffered:
+            self._write(Counter({post_id: 1}))
+            return True
+
+        with self._lock:
+            self._pending[post_id] += 1
+            full = sum(self._pending.values()) >= self.max_pending
+        ai_metrics.incr('view_count.recorded')
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+        return True
+
+    # 아직 저장되지 않은 조회수 (화면 표시 보정용)
+    def pending(self, post_id) -> int:
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    # 버퍼의 조회수를 DB 에 저장하고 저장한 조회 수 반환
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                counts, self._pending = self._pending, Counter()
+            if not counts:
+                return 0
+
+            try:
+                self._write(counts)
+            except Exception as e:
+                # 실패한 조회수는 버퍼로 되돌려 다음 flush 에서 다시 저장
+                with self._lock:
+                    self._pending.update(counts)
+                ai_metrics.incr('view_count.flush_error')
+                logger.error(f"조회수 저장 실패 - 게시글 {len(counts)}개 재시도 예정: {e}")
+                return 0
+
+            total = sum(counts.values())
+            ai_metrics.incr('view_count.flushed', total)
+            return total
+
+    # 게시글 묶음마다 UPDATE 한 번 (views = views + CASE id WHEN ... END)
+    def _write(self, counts: Counter):
+        from .models import Post
+
+        items = sorted(counts.items())
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                chunk = items[start:start + FLUSH_CHUNK_SIZE]
+                Post.objects.filter(pk__in=[post_id for post_id, _ in chunk]).update(
+                    views=F('views') + Case(
+                        *[When(pk=post_id, then=count) for post_id, count in chunk],
+                        default=0,
+                        output_field=IntegerField(),
+                    )
+                )
+
+        # 인기 점수에도 조회수 반영 (실패해도 저장한 조회수는 유지 - 주기적 재계산으로 보정됨)
+        try:
+            trending.record_many({post_id: trending.weight('view') * count for post_id, count in items})
+        except Exception as e:
+            logger.error(f"인기 점수 갱신 실패 (조회수, 게시글 {len(items)}개): {e}")
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            started = time.monotonic()
+            try:
+                flushed = self.flush()
+                if flushed:
+                    logger.debug(f"조회수 {flushed}건 저장 - {time.monotonic() - started:.3f}초")
+            finally:
+                close_old_connections()
+
+    # 종료 시 남은 조회수 저장
+    def shutdown(self):
+        self._stopped = True
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"종료 시 조회수 저장 실패: {e}")
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.shutdown)
@@ -1,15 +1,53 @@
-from .models import Post, Comment, Tag
+from .models import Post, Comment, Tag, Like, RelatedPost
+from accounts.models import Follow
+from .ai_jobs import enqueue_summary_job, enqueue_embedding_job
+from .ai_tags import tag_suggester
+from .related import related_index
+from .pagination import SORT_ORDERINGS, CappedPaginator, InvalidCursor, encode_cursor, paginate_keyset
+from .page_cache import PageCacheMixin, page_cache
+from .view_counter import view_counter
+from .analytics import post_analytics
+from . import trending
+from . import search
+from . import comment_threads
+from .semantic import semantic_index
 from django.urls import reverse_lazy
 from django.http import JsonResponse
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
-from django.db.models import F, Q, Count
+from django.template.loader import render_to_string
+from django.db import transaction
+from django.db.models import F, Q, Case, When, IntegerField
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 관련 게시글 갱신 (실패해도 게시글 저장은 유지)
+def update_related_posts(post):
+    try:
+        related_index.upsert(post)
+    except Exception as e:
+        logger.error(f"관련 게시글 갱신 실패 (#{post.pk}): {e}")
+
+
+# 의미 검색 임베딩 갱신 (외부 API 공급자는 백그라운드 작업으로 처리)
+def update_semantic_index(post):
+    try:
+        if semantic_index.provider.remote:
+            enqueue_embedding_job(post)
+        else:
+            semantic_index.upsert(post)
+    except Exception as e:
+        logger.error(f"임베딩 갱신 실패 (#{post.pk}): {e}")
 
 
 # 메인 페이지
@@ -17,98 +55,220 @@ def main_view(request):
     return render(request, "main.html")
 
 
-# 목록 페이지
-class PostListView(ListView):
+# 목록 페이지 (화면 캐시 - 로그인 사용자의 좋아요 여부는 viewer-state API 로 채움)
+class PostListView(PageCacheMixin, ListView):
     model = Post
     template_name = "blog/post_list.html"
     context_object_name = "posts"
     paginate_by = 10
 
     def get_queryset(self):
-        queryset = Post.objects.select_related("author").prefetch_related("tags", "likes").annotate(likes_count = Count('likes'))
+        queryset = Post.objects.select_related("author").prefetch_related("tags")
 
-        # 검색 기능
+        # 검색 기능 (전문 검색 색인 또는 의미 검색)
         search_query = self.request.GET.get("search")
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query)
-                | Q(content__icontains=search_query)
-                | Q(tags__name__icontains=search_query)
-            ).distinct()
+        self.search_ranked = False
+        if search_query and self.request.GET.get("mode") == "semantic":
+            queryset = self.semantic_queryset(queryset, search_query)
+        elif search_query:
+            queryset = self.keyword_queryset(queryset, search_query)
 
         # 카테고리 필터
         category = self.request.GET.get("category")
         if category:
             queryset = queryset.filter(category=category)
 
-        sort_by = self.request.GET.get("sort", "latest")  # 최신순
-        
-        if sort_by == "likes":
-            # 좋아요 많은 순
-            queryset = queryset.order_by("-likes_count", "-created_at")
-        elif sort_by == "views":
-            # 조회수 많은 순
-            queryset = queryset.order_by("-views", "-created_at")
-        elif sort_by == "oldest":
-            # 오래된 순
-            queryset = queryset.order_by("created_at")
-        else:  # latest (기본값)
-            # 최신순
-            queryset = queryset.order_by("-created_at")
-
-        return queryset
+        # 인기순: 점수 테이블에 있는 (최근 활동이 있는) 게시글만, 점수 인덱스 순으로
+        if self.get_sort_key() == "trending":
+            queryset = queryset.filter(trending__isnull=False).annotate(
+                trending_score=F("trending__score"), trending_id=F("trending__post_id")
+            )
+
+        # 정렬 (관련도, 최신, 인기, 좋아요, 조회수, 오래된 순 - id 로 동순위 고정, 커서 페이지네이션과 같은 키)
+        return queryset.order_by(*SORT_ORDERINGS[self.get_sort_key()])
+
+    def get_page_cache_scope(self):
+        return "list"
+
+    # 실제 정렬 키 (검색 순위가 없으면 관련도순 대신 최신순)
+    def get_sort_key(self):
+        sort_by = self.get_sort()
+        if sort_by == "relevance" and not self.search_ranked:
+            return "latest"
+        return sort_by if sort_by in SORT_ORDERINGS else "latest"
+
+    # 번호 페이지는 앞쪽 몇 페이지만 (그 이후는 커서 기반 "더 보기")
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return CappedPaginator(
+            queryset, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page,
+            max_pages=getattr(settings, "POST_LIST_MAX_PAGES", 5), **kwargs
+        )
+
+    # 검색어 강조, 좋아요 여부 (좋아요 수는 카운터 컬럼, 좋아요 여부는 한 번에 조회 - 캐시 셸에서는 생략)
+    def decorate_posts(self, posts):
+        search_query = self.request.GET.get("search", "")
+        if search_query:
+            for post in posts:
+                post.search_snippet = search.highlight(post.content, search_query)
+
+        liked = set()
+        if self.request.user.is_authenticated and not self.viewer_shell:
+            liked = set(Like.objects.filter(
+                user=self.request.user, post__in=[post.pk for post in posts]
+            ).values_list('post_id', flat=True))
+        for post in posts:
+            post.user_liked = post.pk in liked
+
+    # 정렬 기준 (검색 중에는 기본이 관련도순, 그 외에는 최신순)
+    def get_sort(self):
+        default = "relevance" if self.request.GET.get("search") else "latest"
+        return self.request.GET.get("sort") or default
+
+    # 키워드 검색: 전문 검색 색인(BM25)으로 찾고, 색인을 쓸 수 없는 DB 에서는 부분 문자열 검색
+    def keyword_queryset(self, queryset, search_query):
+        ranked = self.get_sort() == "relevance"
+        results = search.search(queryset, search_query, ranked=ranked)
+        if results is not None:
+            self.search_ranked = ranked
+            return results
+        return queryset.filter(
+            Q(title__icontains=search_query)
+            | Q(content__icontains=search_query)
+            | Q(tags__name__icontains=search_query)
+        ).distinct()
+
+    # 의미 검색: 임베딩 최근접 게시글을 유사도 순으로 (인덱스/공급자를 쓸 수 없으면 키워드 검색)
+    def semantic_queryset(self, queryset, search_query):
+        try:
+            results = semantic_index.search(search_query)
+        except Exception as e:
+            logger.error(f"의미 검색 실패: {e}")
+            results = None
+
+        if not results:
+            self.semantic_fallback = True
+            return self.keyword_queryset(queryset, search_query)
+
+        self.search_ranked = True
+        ids = [post_id for post_id, _ in results]
+        return queryset.filter(pk__in=ids).annotate(
+            search_rank=Case(
+                *[When(pk=post_id, then=rank) for rank, post_id in enumerate(ids)],
+                output_field=IntegerField(),
+            )
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["search_query"] = self.request.GET.get("search", "")
+        context["search_mode"] = self.request.GET.get("mode", "keyword")
+        context["semantic_fallback"] = getattr(self, "semantic_fallback", False)
         context["selected_category"] = self.request.GET.get("category", "")
-        context["selected_sort"] = self.request.GET.get("sort", "latest")
+        context["selected_sort"] = self.get_sort()
         context["categories"] = Post.CATEGORY_CHOICES
         context["sort_options"] = [
+            ("relevance", "관련도순 (검색)"),
             ("latest", "최신순"),
+            ("trending", "인기순"),
             ("likes", "좋아요순"),
             ("views", "조회수순"),
             ("oldest", "오래된순"),
         ]
         
-        # 각 포스트에 좋아요 정보 추가
-        if self.request.user.is_authenticated:
-            for post in context['posts']:
-                post.user_liked = post.is_liked_by(self.request.user)
-                post.like_count = post.get_like_count()
-        else:
-            for post in context['posts']:
-                post.user_liked = False
-                post.like_count = post.get_like_count()
+        self.decorate_posts(context['posts'])
+
+        # 마지막 번호 페이지 이후 게시글은 커서로 이어서 조회
+        page = context.get("page_obj")
+        context["next_cursor"] = None
+        if page and not page.has_next() and page.paginator.truncated and context['posts']:
+            context["next_cursor"] = encode_cursor(self.get_sort_key(), list(context['posts'])[-1])
         
         return context
 
 
-# 게시물 상세 뷰
-class PostDetailView(DetailView):
+# 무한 스크롤용 게시글 목록 API (커서 기반, 전체 개수를 세지 않음)
+class PostFeedView(PostListView):
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        try:
+            limit = min(max(int(request.GET.get("limit", self.paginate_by)), 1), 50)
+        except ValueError:
+            limit = self.paginate_by
+
+        try:
+            posts, next_cursor = paginate_keyset(queryset, self.get_sort_key(), request.GET.get("cursor"), limit)
+        except InvalidCursor as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        self.decorate_posts(posts)
+        return JsonResponse({
+            'success': True,
+            'posts': [{
+                'id': post.pk,
+                'title': post.title,
+                'url': post.get_absolute_url(),
+                'author': post.author.username,
+                'category': post.category,
+                'tags': [tag.name for tag in post.tags.all()],
+                'like_count': post.like_count,
+                'comment_count': post.comment_count,
+                'views': post.views,
+                'user_liked': post.user_liked,
+                'created_at': post.created_at.isoformat(),
+            } for post in posts],
+            # 목록 화면에 그대로 붙일 카드 HTML
+            'html': render_to_string("blog/_post_cards.html", {'posts': posts}, request=request),
+            'next_cursor': next_cursor,
+        })
+
+
+# 게시물 상세 뷰 (화면 캐시 - 로그인 사용자의 좋아요/팔로우 상태, 작성자 메뉴는 viewer-state API 로 채움)
+class PostDetailView(PageCacheMixin, DetailView):
     model = Post
     template_name = "blog/post_detail.html"
     context_object_name = "post"
 
+    def get_page_cache_scope(self):
+        return f"post:{self.kwargs['pk']}"
+
+    # 캐시된 화면으로 응답해도 조회수는 증가
+    def page_cache_hit(self):
+        view_counter.record(self.request, self.kwargs["pk"])
+
     def get_object(self):
         post = get_object_or_404(Post, pk=self.kwargs["pk"])
-        # 조회수 증가
-        Post.objects.filter(pk=post.pk).update(views=F("views") + 1)
-        post.refresh_from_db()
+        # 조회수 증가 (중복 제거 후 버퍼에 모았다가 주기적으로 일괄 저장 - 읽기 경로에서는 DB 에 쓰지 않음)
+        view_counter.record(self.request, post.pk)
+        post.views += view_counter.pending(post.pk)
         return post
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         post = self.object
         
-        # 좋아요 관련 정보 추가
-        if self.request.user.is_authenticated:
+        # 좋아요, 팔로우 관련 정보 추가 (캐시 셸은 사용자와 무관하게 렌더링)
+        if self.request.user.is_authenticated and not self.viewer_shell:
             context['is_liked'] = post.is_liked_by(self.request.user)
+            context['is_following'] = self.request.user.is_following(post.author)
         else:
             context['is_liked'] = False
+            context['is_following'] = False
         
         context['like_count'] = post.get_like_count()
         
+        # 첫 댓글 페이지를 화면에 JSON 으로 포함 (별도 요청 없이 표시)
+        # 캐시 셸도 같은 화면을 쓰므로 사용자별 값(수정/삭제 가능 여부)은 화면에서 author_id 로 계산
+        viewer = AnonymousUser() if self.viewer_shell else self.request.user
+        context['comments_page'] = {
+            **comment_threads.thread_page(post, viewer),
+            'total_count': post.comment_count,
+        }
+        
+        # 미리 계산된 관련 게시글
+        context['related_posts'] = [
+            entry.related for entry in RelatedPost.objects.filter(post=post).select_related('related__author')
+        ]
+        
         return context
 
 
@@ -132,11 +292,18 @@ class PostCreateView(LoginRequiredMixin, CreateView):
                 for tag_info in tag_list:
                     tag_name = tag_info.get('name', '').strip()
                     if tag_name:
-                        tag = Tag.objects.get_or_create(name=tag_name)
+                        tag, _ = Tag.objects.get_or_create(name=tag_name)
                         self.object.tags.add(tag)
             except (json.JSONDecodeError, TypeError):
                 pass  # 태그 데이터가 잘못된 경우 무시
         
+        # 요약은 백그라운드 워커가 생성 (run_ai_worker)
+        enqueue_summary_job(self.object)
+        # 로컬 태그 추천 인덱스, 관련 게시글 갱신
+        tag_suggester.update_post(self.object)
+        update_related_posts(self.object)
+        update_semantic_index(self.object)
+        
         return response
 
     def get_context_data(self, **kwargs):
@@ -171,11 +338,18 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
                 for tag_info in tag_list:
                     tag_name = tag_info.get('name', '').strip()
                     if tag_name:
-                        tag = Tag.objects.get_or_create(name=tag_name)
+                        tag, _ = Tag.objects.get_or_create(name=tag_name)
                         self.object.tags.add(tag)
             except (json.JSONDecodeError, TypeError):
                 pass  # 태그 데이터가 잘못된 경우 무시
         
+        # 요약은 백그라운드 워커가 생성 (run_ai_worker)
+        enqueue_summary_job(self.object)
+        # 로컬 태그 추천 인덱스, 관련 게시글 갱신
+        tag_suggester.update_post(self.object)
+        update_related_posts(self.object)
+        update_semantic_index(self.object)
+        
         return response
 
     def get_context_data(self, **kwargs):
@@ -193,6 +367,21 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         post = self.get_object()
         return self.request.user == post.author
 
+    def form_valid(self, form):
+        post_id = self.object.pk
+        # 이 게시글을 관련 게시글로 가진 목록은 삭제 전에 다시 계산
+        try:
+            related_index.remove(post_id)
+        except Exception as e:
+            logger.error(f"관련 게시글 갱신 실패 (#{post_id}): {e}")
+        response = super().form_valid(form)
+        tag_suggester.remove_post(post_id)
+        try:
+            semantic_index.remove(post_id)
+        except Exception as e:
+            logger.error(f"임베딩 삭제 실패 (#{post_id}): {e}")
+        return response
+
     def get_success_url(self):
         # URL 파라미터로 이전 페이지 확인
         from_page = self.request.GET.get('from')
@@ -225,32 +414,33 @@ class CommentCreateView(View):
             parent_comment = None
             if parent_id:
                 try:
-                    parent_comment = Comment.objects.get(id=parent_id, post=post)
+                    parent_comment = Comment.objects.select_related('parent').get(id=parent_id, post=post)
                 except Comment.DoesNotExist:
                     return JsonResponse({
                         'success': False,
                         'error': '부모 댓글을 찾을 수 없습니다.'
                     })
+                # 최대 깊이를 넘는 답글은 부모 댓글의 형제로 붙임
+                if parent_comment.depth >= Comment.MAX_DEPTH - 1:
+                    parent_comment = parent_comment.parent
             
-            # 댓글 생성
-            comment = Comment.objects.create(
-                post=post,
-                author=request.user,
-                content=content,
-                parent=parent_comment
-            )
+            # 댓글 생성 (댓글 수와 같은 트랜잭션)
+            with transaction.atomic():
+                comment = Comment.objects.create(
+                    post=post,
+                    author=request.user,
+                    content=content,
+                    parent=parent_comment
+                )
+                post.adjust_counter('comment_count', 1)
+                page_cache.invalidate_post(post.pk)
+            trending.safe_record(post.pk, 'comment')
             
+            # 화면은 새 댓글과 댓글 수만 반영 (목록을 다시 불러오지 않음)
             return JsonResponse({
                 'success': True,
-                'comment': {
-                    'id': comment.id,
-                    'content': comment.content,
-                    'author': comment.author.username,
-                    'created_at': comment.created_at.strftime('%Y년 %m월 %d일 %H:%M'),
-                    'parent_id': comment.parent.id if comment.parent else None,
-                    'is_author': True,  # 작성자이므로 삭제 버튼 표시
-                    'can_delete': True
-                },
+                'comment': comment_threads.serialize(comment, request.user, post.author_id),
+                'total_count': Post.objects.values_list('comment_count', flat=True).get(pk=post.pk),
                 'message': '댓글이 작성되었습니다!'
             })
             
@@ -271,7 +461,7 @@ class CommentCreateView(View):
 class CommentDeleteView(View):
     def post(self, request, comment_id):
         try:
-            comment = get_object_or_404(Comment, pk=comment_id)
+            comment = get_object_or_404(Comment.objects.select_related('post'), pk=comment_id)
             
             # 작성자 또는 게시글 작성자만 삭제 가능
             if request.user != comment.author and request.user != comment.post.author:
@@ -281,11 +471,19 @@ class CommentDeleteView(View):
                 })
             
             comment_id = comment.id
-            comment.delete()
+            # 답글도 함께 삭제되므로 삭제된 댓글 수만큼 감소
+            with transaction.atomic():
+                deleted_ids = comment_threads.subtree_ids(comment)
+                _, deleted = comment.delete()
+                comment.post.adjust_counter('comment_count', -deleted.get(Comment._meta.label, 0))
+                page_cache.invalidate_post(comment.post_id)
             
+            # 화면은 삭제된 댓글(답글 포함)만 지움
             return JsonResponse({
                 'success': True,
                 'comment_id': comment_id,
+                'deleted_ids': deleted_ids,
+                'total_count': Post.objects.values_list('comment_count', flat=True).get(pk=comment.post_id),
                 'message': '댓글이 삭제되었습니다.'
             })
             
@@ -296,32 +494,26 @@ class CommentDeleteView(View):
             })
 
 
-# 댓글 목록 조회 뷰
+# 댓글 목록 조회 뷰 (최상위 댓글 단위 커서 페이지, 스레드별 앞쪽 답글은 트리로 포함)
 class CommentListView(View):
     def get(self, request, post_id):
         try:
             post = get_object_or_404(Post, pk=post_id)
-            comments = Comment.objects.filter(post=post).select_related('author', 'parent').order_by('created_at')
-            
-            comments_data = []
-            for comment in comments:
-                comments_data.append({
-                    'id': comment.id,
-                    'content': comment.content,
-                    'author': comment.author.username,
-                    'created_at': comment.created_at.strftime('%Y년 %m월 %d일 %H:%M'),
-                    'parent_id': comment.parent.id if comment.parent else None,
-                    'is_author': request.user == comment.author if request.user.is_authenticated else False,
-                    'can_delete': (
-                        request.user == comment.author or 
-                        request.user == comment.post.author
-                    ) if request.user.is_authenticated else False
-                })
-            
+            try:
+                limit = min(max(int(request.GET.get('limit', settings.COMMENT_THREADS_PER_PAGE)), 1), 50)
+            except ValueError:
+                limit = settings.COMMENT_THREADS_PER_PAGE
+
+            try:
+                page = comment_threads.thread_page(post, request.user, request.GET.get('cursor'), limit)
+            except InvalidCursor as e:
+                return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
             return JsonResponse({
                 'success': True,
-                'comments': comments_data,
-                'total_count': len(comments_data)
+                'comments': page['comments'],
+                'next_cursor': page['next_cursor'],
+                'total_count': post.comment_count
             })
             
         except Exception as e:
@@ -331,12 +523,35 @@ class CommentListView(View):
             })
 
 
+# 답글 더 보기 뷰 (댓글 하나의 하위 답글을 경로 순 커서 페이지로 조회)
+class CommentRepliesView(View):
+    def get(self, request, post_id, comment_id):
+        try:
+            comment = get_object_or_404(Comment.objects.select_related('post'), pk=comment_id, post_id=post_id)
+            try:
+                page = comment_threads.reply_page(comment, request.user, request.GET.get('cursor'))
+            except InvalidCursor as e:
+                return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+            return JsonResponse({
+                'success': True,
+                'replies': page['replies'],
+                'next_cursor': page['next_cursor']
+            })
+            
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'답글을 불러오는 중 오류가 발생했습니다: {str(e)}'
+            })
+
+
 # 댓글 수정 뷰
 @method_decorator([login_required, csrf_exempt], name='dispatch')
 class CommentUpdateView(View):
     def post(self, request, comment_id):
         try:
-            comment = get_object_or_404(Comment, pk=comment_id)
+            comment = get_object_or_404(Comment.objects.select_related('post'), pk=comment_id)
             
             # 작성자만 수정 가능
             if request.user != comment.author:
@@ -356,16 +571,11 @@ class CommentUpdateView(View):
             
             comment.content = content
             comment.save()
+            page_cache.invalidate_post(comment.post_id)
             
             return JsonResponse({
                 'success': True,
-                'comment': {
-                    'id': comment.id,
-                    'content': comment.content,
-                    'author': comment.author.username,
-                    'created_at': comment.created_at.strftime('%Y년 %m월 %d일 %H:%M'),
-                    'parent_id': comment.parent.id if comment.parent else None,
-                },
+                'comment': comment_threads.serialize(comment, request.user, comment.post.author_id),
                 'message': '댓글이 수정되었습니다!'
             })
             
@@ -390,6 +600,9 @@ class LikeToggleView(View):
             
             # 좋아요 토글
             is_liked, like_count = post.toggle_like(request.user)
+            post_analytics.record_like(post.pk, 1 if is_liked else -1)
+            if is_liked:
+                trending.safe_record(post.pk, 'like')
             
             return JsonResponse({
                 'success': True,
@@ -402,4 +615,44 @@ class LikeToggleView(View):
             return JsonResponse({
                 'success': False,
                 'error': f'오류가 발생했습니다: {str(e)}'
-            })
\ No newline at end of file
+            })
+
+
+# 캐시된 화면에 채울 로그인 사용자별 상태 (좋아요 여부, 최신 좋아요 수, 팔로우 여부)
+# ?posts=1,2,3&users=4,5 - 한 번의 요청으로 화면에 있는 게시글/사용자를 모아 조회
+class ViewerStateView(View):
+    MAX_IDS = 100
+
+    def parse_ids(self, value):
+        ids = []
+        for part in (value or '').split(','):
+            if part.strip().isdigit():
+                ids.append(int(part))
+        return ids[:self.MAX_IDS]
+
+    def get(self, request):
+        post_ids = self.parse_ids(request.GET.get('posts'))
+        user_ids = self.parse_ids(request.GET.get('users'))
+
+        like_counts = dict(Post.objects.filter(pk__in=post_ids).values_list('pk', 'like_count')) if post_ids else {}
+        if not request.user.is_authenticated:
+            return JsonResponse({
+                'success': True,
+                'viewer': None,
+                'liked': [],
+                'like_counts': like_counts,
+                'following': [],
+            })
+
+        liked = list(Like.objects.filter(user=request.user, post_id__in=post_ids).values_list('post_id', flat=True)) if post_ids else []
+        following = list(Follow.objects.filter(
+            follower=request.user, following_id__in=user_ids
+        ).values_list('following_id', flat=True)) if user_ids else []
+
+        return JsonResponse({
+            'success': True,
+            'viewer': {'id': request.user.pk, 'username': request.user.username},
+            'liked': liked,
+            'like_counts': like_counts,
+            'following': following,
+        })
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'smartblog.settings')
+# ASGI 서버에서는 AI 뷰를 비동기 경로로 처리 (워커 스레드 점유 방지)
+os.environ.setdefault('AI_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
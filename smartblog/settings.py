@@ -93,9 +93,187 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 WSGI_APPLICATION = 'smartblog.wsgi.application'
+ASGI_APPLICATION = 'smartblog.asgi.application'
 
 OPENAI_API_KEY = env.str("OPENAI_API_KEY", default=None)
 UPSTAGE_API_KEY = env.str("UPSTAGE_API_KEY", default=None)
+# OpenAI 호환 API 주소 (부하 테스트 시 로컬 대역 서버: python manage.py openai_standin)
+OPENAI_BASE_URL = env.str("OPENAI_BASE_URL", default=None)
+
+# 비동기 AI 뷰 사용 여부 (smartblog/asgi.py 에서 기본 활성화)
+AI_ASYNC_VIEWS = env.bool("AI_ASYNC_VIEWS", default=False)
+# 비동기 경로에서 프로세스당 동시에 진행할 수 있는 OpenAI API 호출 수
+AI_MAX_CONCURRENT_REQUESTS = env.int("AI_MAX_CONCURRENT_REQUESTS", default=8)
+
+# 동일 AI 요청 병합 - 워커 프로세스 간 병합은 DB 잠금 테이블(AIInflightLock) 사용
+AI_COALESCE_SHARED = env.bool("AI_COALESCE_SHARED", default=False)
+AI_COALESCE_LOCK_TTL = 30
+AI_COALESCE_WAIT_TIMEOUT = 30
+
+# OpenAI 요청 기한(초, 재시도 포함) / 재시도 / 서킷 브레이커
+AI_REQUEST_TIMEOUTS = {
+    'title_suggest': 15,
+    'tag_suggest': 10,
+    'summary': 30,
+    'autocomplete': 30,
+    'assist_bundle': 30,
+    'summary_chunk': 30,
+}
+AI_RETRY_MAX_ATTEMPTS = 3
+AI_RETRY_BASE_DELAY = 0.5
+AI_RETRY_MAX_DELAY = 4.0
+# 최근 AI_BREAKER_WINDOW 건 중 실패 비율이 기준 이상이면 AI_BREAKER_RESET_TIMEOUT 초 동안 즉시 실패 처리
+AI_BREAKER_FAILURE_THRESHOLD = 0.5
+AI_BREAKER_WINDOW = 20
+AI_BREAKER_MIN_REQUESTS = 5
+AI_BREAKER_RESET_TIMEOUT = 30
+
+# 기능별 글 내용 입력 예산(토큰) - 넘으면 도입부/소제목/핵심 문단 위주로 골라 보냄
+AI_PROMPT_BUDGETS = {
+    'title_suggest': 600,
+    'tag_suggest': 500,
+    'summary': 3000,
+    'autocomplete': 1500,
+    'assist_bundle': 3000,
+}
+AI_TOKEN_COUNT_CACHE_SIZE = 4096
+
+# 요약 입력 예산을 넘는 긴 글은 청크별 요약 후 결합 (map-reduce)
+AI_SUMMARY_MAP_REDUCE = env.bool("AI_SUMMARY_MAP_REDUCE", default=True)
+AI_SUMMARY_CHUNK_TOKENS = 1500
+AI_SUMMARY_MAP_CONCURRENCY = 4
+
+# 로컬 태그 추천 (기존 게시글 TF-IDF + 태그 동시 출현) - 확신이 낮을 때만 OpenAI 사용
+AI_TAG_LOCAL_ENABLED = env.bool("AI_TAG_LOCAL_ENABLED", default=True)
+# 태그가 있는 게시글이 AI_TAG_LOCAL_MIN_POSTS 개 이상이고, 점수 AI_TAG_LOCAL_MIN_SCORE 이상인 태그가
+# AI_TAG_LOCAL_MIN_TAGS 개 이상이면 로컬 추천을 사용
+AI_TAG_LOCAL_MIN_POSTS = 20
+AI_TAG_LOCAL_MIN_SCORE = 0.25
+AI_TAG_LOCAL_MIN_TAGS = 3
+# 다른 프로세스의 게시글 변경 반영 주기 / 전체 재구축 주기 (초)
+AI_TAG_INDEX_REFRESH = 60
+AI_TAG_INDEX_MAX_AGE = 60 * 60
+
+# 관련 게시글 (문자 n-gram TF-IDF 상위 k개를 RelatedPost 에 미리 계산)
+RELATED_POSTS_K = 5
+RELATED_POSTS_MIN_SCORE = 0.05
+# 게시글 저장 시 이웃 목록을 함께 갱신할 유사 게시글 후보 수
+RELATED_POSTS_UPDATE_CANDIDATES = 50
+
+# 게시글 목록: 번호 페이지로 보여줄 최대 페이지 수 (이후는 커서 기반 "더 보기" - /blog/feed/)
+POST_LIST_MAX_PAGES = 5
+
+# 캐시 (기본: 프로세스 메모리, 여러 워커가 공유하려면 CACHE_URL=redis://... 등)
+CACHES = {
+    'default': env.cache("CACHE_URL", default='locmemcache://'),
+}
+
+# 게시글 목록/상세 화면 캐시 (비로그인 화면 + 로그인 사용자용 셸, 사용자별 상태는 /blog/viewer-state/)
+PAGE_CACHE_ENABLED = env.bool("PAGE_CACHE_ENABLED", default=True)
+# 로그인 사용자에게도 캐시된 셸을 보낼지 여부
+PAGE_CACHE_MEMBERS = env.bool("PAGE_CACHE_MEMBERS", default=True)
+# 신선 기간 (초) - 이후 PAGE_CACHE_STALE 초 동안은 한 요청만 다시 렌더링하고 나머지는 이전 화면으로 응답
+PAGE_CACHE_TTL = 60
+PAGE_CACHE_STALE = 5 * 60
+# 캐시가 없을 때 다른 요청의 렌더링 결과를 한 번 기다리는 시간 (초, 그래도 없으면 직접 렌더링)
+PAGE_CACHE_WAIT = 0.1
+PAGE_CACHE_LOCK_TIMEOUT = 10
+
+# 게시글 조회수 집계 (방문자별 중복 제거 후 메모리에 모았다가 주기적으로 일괄 UPDATE)
+# 프로세스가 강제 종료되면 마지막 저장 이후 최대 VIEW_COUNT_FLUSH_INTERVAL 초 분량이 유실될 수 있음
+VIEW_COUNT_BUFFERED = env.bool("VIEW_COUNT_BUFFERED", default=True)
+VIEW_COUNT_FLUSH_INTERVAL = 10
+# 대기 중인 조회 수가 이 값에 도달하면 바로 저장
+VIEW_COUNT_FLUSH_SIZE = 1000
+# 같은 방문자(로그인 사용자, 세션, IP + User-Agent)의 재조회를 세지 않는 시간 (초)
+VIEW_COUNT_DEDUPE_WINDOW = 30 * 60
+
+# 게시글 일별 통계 (조회수, 좋아요, 순방문자 HyperLogLog) - 메모리에 모았다가 주기적으로 PostDailyStats 에 저장
+ANALYTICS_ENABLED = env.bool("ANALYTICS_ENABLED", default=True)
+ANALYTICS_FLUSH_INTERVAL = 30
+# 프로필 화면 통계 기간 (일)
+ANALYTICS_PROFILE_DAYS = 30
+
+# 인기순 정렬 (시간 감쇠 점수 - 반감기마다 이벤트 가중치가 절반이 됨)
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WEIGHTS = {'post': 10.0, 'view': 1.0, 'like': 5.0, 'comment': 8.0}
+# 재계산(refresh_trending) 시 읽을 이벤트 기간과, 이보다 점수가 낮아진 게시글은 인기순 목록에서 제외
+TRENDING_WINDOW_DAYS = 14
+TRENDING_MIN_SCORE = 0.5
+
+# 댓글 목록 (최상위 댓글 단위 커서 페이지) - 스레드마다 함께 보여줄 답글 수, "답글 더 보기" 한 번에 불러올 답글 수
+COMMENT_THREADS_PER_PAGE = 10
+COMMENT_REPLIES_PER_THREAD = 5
+COMMENT_REPLIES_PAGE_SIZE = 20
+
+# 전문 검색 (SQLite FTS5 / PostgreSQL tsvector) - 관련도순 정렬 시 상위 결과 수
+SEARCH_MAX_RANKED_RESULTS = 200
+
+# 의미 검색 (게시글 임베딩 + 메모리 맵 벡터 인덱스, ?search=...&mode=semantic)
+# 공급자: OpenAI 임베딩 API 또는 로컬 결정적 임베딩 (API 키가 없는 개발/테스트 환경)
+AI_EMBEDDING_PROVIDER = env.str(
+    "AI_EMBEDDING_PROVIDER",
+    default='blog.embeddings.OpenAIEmbeddingProvider' if OPENAI_API_KEY else 'blog.embeddings.LocalEmbeddingProvider',
+)
+AI_EMBEDDING_MODEL = env.str("AI_EMBEDDING_MODEL", default='text-embedding-3-small')
+AI_EMBEDDING_DIM = env.int("AI_EMBEDDING_DIM", default=512)
+AI_EMBEDDING_BATCH_SIZE = 64
+AI_EMBEDDING_DIR = BASE_DIR / 'var' / 'embeddings'
+# 게시글 수가 이 값 이하면 전체 내적, 초과하면 IVF 근사 검색 (탐색할 군집 수: NPROBE)
+AI_SEMANTIC_EXACT_LIMIT = 20000
+AI_SEMANTIC_NPROBE = 8
+AI_SEMANTIC_MIN_SCORE = 0.2
+AI_SEMANTIC_QUERY_CACHE_SIZE = 256
+
+# AI 응답 캐시 (프로세스 LRU + DB 영속 계층)
+AI_CACHE_ENABLED = env.bool("AI_CACHE_ENABLED", default=True)
+AI_CACHE_LRU_SIZE = env.int("AI_CACHE_LRU_SIZE", default=512)
+AI_CACHE_BACKENDS = [
+    'blog.ai_cache.LRUCacheBackend',
+    'blog.ai_cache.DatabaseCacheBackend',
+]
+AI_CACHE_DEFAULT_TTL = 60 * 60
+# 기능별 TTL (초)
+AI_CACHE_TTLS = {
+    'title_suggest': 60 * 60,
+    'tag_suggest': 6 * 60 * 60,
+    'summary': 24 * 60 * 60,
+    'autocomplete': 10 * 60,
+    'assist_bundle': 60 * 60,
+    # 긴 글 map-reduce 요약의 청크 요약 (청크 내용이 같으면 재사용)
+    'summary_chunk': 7 * 24 * 60 * 60,
+}
+
+# AI 사용량 기록 버퍼링 (AIUsageLog + ai_usage_count 를 주기적으로 일괄 저장)
+# 프로세스가 강제 종료되면 마지막 저장 이후 최대 AI_USAGE_FLUSH_INTERVAL 초 분량이 유실될 수 있음
+AI_USAGE_BUFFERED = env.bool("AI_USAGE_BUFFERED", default=True)
+AI_USAGE_FLUSH_INTERVAL = 5
+AI_USAGE_FLUSH_SIZE = 200
+
+# AI 요청 한도 (사용자별/기능별 토큰 버킷) - 초과 시 429 + Retry-After
+AI_RATE_LIMIT_ENABLED = env.bool("AI_RATE_LIMIT_ENABLED", default=True)
+# 워커 프로세스 간 공유하려면 'blog.ai_ratelimit.CacheBucketStore' (CACHES 의 AI_RATE_LIMIT_CACHE 별칭 사용)
+AI_RATE_LIMIT_STORE = env.str("AI_RATE_LIMIT_STORE", default='blog.ai_ratelimit.LocalBucketStore')
+AI_RATE_LIMIT_CACHE = 'default'
+AI_RATE_LIMITS = {
+    'default': {'capacity': 10, 'per_minute': 6},
+    'autocomplete': {'capacity': 20, 'per_minute': 20},
+    'assist_bundle': {'capacity': 5, 'per_minute': 3},
+}
+# 사용자별 토큰 예산 (캐시 결과 제외, 환경 변수가 빈 값이거나 0 이면 None = 제한 없음)
+AI_TOKEN_BUDGET_DAILY = int(env.str("AI_TOKEN_BUDGET_DAILY", default="50000") or 0) or None
+AI_TOKEN_BUDGET_MONTHLY = int(env.str("AI_TOKEN_BUDGET_MONTHLY", default="1000000") or 0) or None
+AI_TOKEN_BUDGET_CACHE_TTL = 30
+
+# 게시글 저장 시 요약을 백그라운드 작업 큐(AIJob)에 등록 - run_ai_worker 로 처리
+AI_SUMMARY_ON_SAVE = env.bool("AI_SUMMARY_ON_SAVE", default=True)
+AI_JOB_CONCURRENCY = env.int("AI_JOB_CONCURRENCY", default=2)
+AI_JOB_MAX_ATTEMPTS = 5
+# 재시도 대기 시간 (초, 지수 증가 + 지터)
+AI_JOB_BACKOFF_BASE = 30
+AI_JOB_BACKOFF_MAX = 60 * 60
+# 실행 중 상태로 이 시간(초)이 지나면 워커 비정상 종료로 보고 재등록
+AI_JOB_LEASE_TIMEOUT = 5 * 60
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases